@@ -176,7 +176,7 @@ def setup_initial_data():
     """Reset dan buat data awal untuk latihan."""
     conn = Database.get_connection()
     cursor = conn.cursor()
-    cursor.execute("DROP TABLE IF EXISTS product_product, product_category")
+    cursor.execute("DROP TABLE IF EXISTS product_product, product_category CASCADE")
     conn.commit()
     cursor.close()
     
@@ -6,6 +6,7 @@ import psycopg2.extras
 # SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
 # ==================================================================================================
 # Framework diperbarui untuk mendukung field One2many.
+# Field kini berupa descriptor di class model, sehingga hanya akses ke field yang menjalankan logika field.
 
 class Database:
     _connection = None
@@ -29,8 +30,27 @@ class Registry(dict):
 registry = Registry()
 
 class Field:
+    """
+    Field adalah data descriptor yang dipasang di class model. Nilai field disimpan di `__dict__`
+    record, sedangkan atribut lain (id, env, method) dibaca Python langsung tanpa melewati kode field.
+    """
     def __init__(self, string=""):
         self.string = string
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self # Diakses dari class (misalnya Product.name): kembalikan objek field-nya
+        try:
+            return record.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, record, value):
+        record.__dict__[self.name] = value
 
 class Char(Field): pass
 class Float(Field): pass
@@ -47,6 +67,16 @@ class One2many(Field):
         self.comodel_name = comodel_name
         self.inverse_name = inverse_name # Nama field Many2one di model lain
 
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        # Lakukan search di comodel menggunakan inverse_name
+        comodel = registry[self.comodel_name]
+        return comodel.search([(self.inverse_name, '=', record.id)])
+
+    def __set__(self, record, value):
+        raise AttributeError(f"Field One2many '{self.name}' tidak bisa di-assign langsung.")
+
 class Model:
     _name = None
     _table = None
@@ -61,27 +91,6 @@ class Model:
                 if not isinstance(self._fields.get(key), One2many):
                     setattr(self, key, value)
 
-    def __getattribute__(self, name):
-        """Override untuk menangani pemanggilan field One2many."""
-        # Dapatkan _fields dari class. Gunakan super() untuk menghindari rekursi.
-        # Cek juga apakah _fields sudah diinisialisasi untuk menghindari error awal.
-        try:
-            _fields = super().__getattribute__('_fields')
-        except AttributeError:
-            _fields = None
-
-        # Cek apakah 'name' adalah field One2many
-        if _fields and name in _fields and isinstance(_fields[name], One2many):
-            field = _fields[name]
-            comodel = registry[field.comodel_name]
-            record_id = super().__getattribute__('id')
-            
-            # Lakukan search di comodel menggunakan inverse_name
-            return comodel.search([(field.inverse_name, '=', record_id)])
-        
-        # Jika bukan field One2many, lanjutkan dengan perilaku default.
-        return super().__getattribute__(name)
-
     @classmethod
     def _init_model(cls):
         cls._table = cls._name.replace('.', '_')
@@ -183,7 +192,7 @@ def setup_initial_data():
     """Reset dan buat data awal untuk latihan."""
     conn = Database.get_connection()
     cursor = conn.cursor()
-    cursor.execute("DROP TABLE IF EXISTS product_product, product_category")
+    cursor.execute("DROP TABLE IF EXISTS product_product, product_category CASCADE")
     conn.commit()
     cursor.close()
     
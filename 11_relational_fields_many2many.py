@@ -6,6 +6,7 @@ import psycopg2.extras
 # SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
 # =================================================================================================
 # Framework diperbarui untuk mendukung field Many2many.
+# Field kini berupa descriptor di class model, sehingga hanya akses ke field yang menjalankan logika field.
 
 class Database:
     _connection = None
@@ -29,8 +30,27 @@ class Registry(dict):
 registry = Registry()
 
 class Field:
+    """
+    Field adalah data descriptor yang dipasang di class model. Nilai field disimpan di `__dict__`
+    record, sedangkan atribut lain (id, env, method) dibaca Python langsung tanpa melewati kode field.
+    """
     def __init__(self, string=""):
         self.string = string
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self # Diakses dari class (misalnya Product.name): kembalikan objek field-nya
+        try:
+            return record.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, record, value):
+        record.__dict__[self.name] = value
 
 class Char(Field): pass
 class Integer(Field): pass
@@ -46,6 +66,14 @@ class One2many(Field):
         self.comodel_name = comodel_name
         self.inverse_name = inverse_name
 
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        return record.env[self.comodel_name].search([(self.inverse_name, '=', record.id)])
+
+    def __set__(self, record, value):
+        raise AttributeError(f"Field One2many '{self.name}' tidak bisa di-assign langsung.")
+
 class Many2many(Field):
     """Field untuk relasi Many2many."""
     def __init__(self, comodel_name, relation=None, column1=None, column2=None, string=""):
@@ -56,6 +84,18 @@ class Many2many(Field):
         self.column1 = column1 if column1 else f"{Model._table}_id"
         self.column2 = column2 if column2 else f"{comodel_name.replace('.', '_')}_id"
 
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        # Query ke tabel relasi untuk mendapatkan ID dari comodel
+        query = f"SELECT {self.column2} FROM {self.relation} WHERE {self.column1} = %s"
+        record.env.cr.execute(query, (record.id,))
+        comodel_ids = [row[0] for row in record.env.cr.fetchall()]
+        return record.env[self.comodel_name].browse(comodel_ids)
+
+    def __set__(self, record, value):
+        raise AttributeError(f"Field Many2many '{self.name}' tidak bisa di-assign langsung.")
+
 class Model:
     _name = None
     _table = None
@@ -69,24 +109,12 @@ class Model:
                 if not isinstance(self._fields.get(key), (One2many, Many2many)):
                     setattr(self, key, value)
 
-    def __getattribute__(self, name):
-        try:
-            _fields = super().__getattribute__('_fields')
-        except AttributeError:
-            _fields = None
-
-        if _fields and name in _fields and isinstance(_fields[name], (One2many, Many2many)):
-            field = _fields[name]
-            Comodel = self.env[field.comodel_name]
-            if isinstance(field, One2many):
-                return Comodel.search([(field.inverse_name, '=', self.id)])
-            elif isinstance(field, Many2many):
-                # Query ke tabel relasi untuk mendapatkan ID dari comodel
-                query = f"SELECT {field.column2} FROM {field.relation} WHERE {field.column1} = %s"
-                self.env.cr.execute(query, (self.id,))
-                comodel_ids = [row[0] for row in self.env.cr.fetchall()]
-                return Comodel.browse(comodel_ids)
-        return super().__getattribute__(name)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Field dideklarasikan di dict `_fields`; pasang masing-masing sebagai descriptor di class.
+        for name, field in (cls.__dict__.get('_fields') or {}).items():
+            setattr(cls, name, field)
+            field.__set_name__(cls, name)
 
     @classmethod
     def create(cls, values):
@@ -203,15 +231,19 @@ class Environment:
     def __init__(self, cursor):
         self.cr = cursor
         self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
 
     def __getitem__(self, model_name):
         ModelClass = self.registry.get(model_name)
         if not ModelClass:
             raise KeyError(f"Model '{model_name}' not found in registry.")
-        
-        # Simulasikan cara Odoo memberikan env ke setiap model
-        ModelClass.env = self
-        return ModelClass
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
 
 # =================================================================================================
 # CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
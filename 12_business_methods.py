@@ -155,14 +155,19 @@ class Environment:
     def __init__(self, cursor):
         self.cr = cursor
         self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
 
     def __getitem__(self, model_name):
         ModelClass = self.registry.get(model_name)
         if not ModelClass:
             raise KeyError(f"Model '{model_name}' not found in registry.")
-        
-        ModelClass.env = self
-        return ModelClass
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
 
 # =================================================================================================
 # CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
@@ -9,6 +9,8 @@ import psycopg2.extras
 # 1. Computed Fields: Field yang nilainya dihitung oleh method Python.
 # 2. Simulasi decorator @api.depends melalui parameter 'compute'.
 # 3. Penambahan field Float untuk kalkulasi.
+# 4. Field sebagai descriptor di class model: hanya akses ke field yang menjalankan logika field
+#    (termasuk compute), atribut lain seperti `id`, `env`, dan method dibaca langsung oleh Python.
 
 class Database:
     _connection = None
@@ -35,6 +37,30 @@ class Field:
     def __init__(self, string="", compute=None):
         self.string = string
         self.compute = compute # Nama method compute, misal: '_compute_total'
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self # Diakses dari class: kembalikan objek field-nya
+        if self.compute:
+            # Jika nilai belum ada di cache, maka hitung. Method compute akan mengisi cache.
+            if self.name not in record._cache:
+                print(f"COMPUTE: Menghitung nilai untuk field '{self.name}' menggunakan method '{self.compute}'...")
+                getattr(record, self.compute)()
+            return record._cache[self.name]
+        try:
+            return record.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, record, value):
+        if self.compute:
+            record._cache[self.name] = value
+        else:
+            record.__dict__[self.name] = value
 
 class Char(Field): pass
 class Float(Field): pass
@@ -53,28 +79,12 @@ class Model:
             for key, value in values.items():
                 setattr(self, key, value)
 
-    def __getattribute__(self, name):
-        """
-        Override untuk menangani pemanggilan computed field.
-        """
-        # Gunakan super() untuk mengakses atribut instance secara langsung dan menghindari rekursi.
-        _fields = super().__getattribute__('_fields')
-        _cache = super().__getattribute__('_cache')
-
-        # Cek apakah field yang diakses adalah computed field.
-        if _fields and name in _fields and _fields[name].compute:
-            # Jika nilai belum ada di cache, maka hitung.
-            if name not in _cache:
-                print(f"COMPUTE: Menghitung nilai untuk field '{name}' menggunakan method '{_fields[name].compute}'...")
-                compute_method = getattr(self, _fields[name].compute)
-                # Panggil method compute, yang akan mengisi cache.
-                compute_method()
-            
-            # Kembalikan nilai langsung dari cache untuk menghentikan rekursi.
-            return _cache[name]
-
-        # Untuk field biasa, gunakan perilaku default.
-        return super().__getattribute__(name)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Field dideklarasikan di dict `_fields`; pasang masing-masing sebagai descriptor di class.
+        for name, field in (cls.__dict__.get('_fields') or {}).items():
+            setattr(cls, name, field)
+            field.__set_name__(cls, name)
 
     @classmethod
     def create(cls, values):
@@ -144,13 +154,19 @@ class Environment:
     def __init__(self, cursor):
         self.cr = cursor
         self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
 
     def __getitem__(self, model_name):
         ModelClass = self.registry.get(model_name)
         if not ModelClass:
             raise KeyError(f"Model '{model_name}' not found in registry.")
-        ModelClass.env = self
-        return ModelClass
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
 
 # =================================================================================================
 # CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
@@ -210,7 +226,7 @@ def run_computed_fields_example():
 
     # 2. Akses computed field. Ini akan memicu method compute-nya.
     print("\n--- 2. Mengakses Computed Field ---")
-    # Saat kita mencoba mengakses 'line.price_subtotal', method __getattribute__ akan
+    # Saat kita mencoba mengakses 'line.price_subtotal', descriptor field `price_subtotal` akan
     # mendeteksi bahwa ini adalah computed field dan memanggil '_compute_price_subtotal'.
     subtotal = line.price_subtotal
     print(f"HASIL: Subtotal yang dihitung adalah: {subtotal}")
@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Schema Migration: skema di database dibandingkan dengan `_fields` lewat information_schema.
+# 2. Hanya perubahan yang kurang yang dijalankan (CREATE TABLE, ADD COLUMN, ALTER COLUMN TYPE,
+#    CREATE INDEX), bukan lagi `DROP TABLE` + `CREATE TABLE IF NOT EXISTS`.
+# 3. Semua DDL dijalankan dalam SATU transaksi. Jika skema sudah sesuai, tidak ada DDL sama sekali.
+# 4. Parameter `index=True` pada Field untuk membuat index di kolom tersebut.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+    def init_models(self, cr):
+        """Menyelaraskan skema database dengan SEMUA model yang terdaftar."""
+        return SchemaMigrator(cr, self).migrate()
+
+registry = Registry()
+
+class Field:
+    # Pasangan (tipe SQL untuk DDL, tipe yang dilaporkan oleh information_schema).
+    # Field tanpa column_type (One2many, Many2many) tidak punya kolom di tabel model.
+    column_type = None
+
+    def __init__(self, string="", index=False):
+        self.string = string
+        self.index = index # True = buat index di kolom ini
+
+class Char(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+class Integer(Field):
+    column_type = ('INTEGER', 'integer')
+
+class Float(Field):
+    column_type = ('DOUBLE PRECISION', 'double precision')
+
+class Selection(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+    def __init__(self, selection, string="", index=False):
+        super().__init__(string, index)
+        self.selection = selection
+
+class Many2one(Field):
+    column_type = ('INTEGER', 'integer')
+
+    def __init__(self, comodel_name, string="", index=False, ondelete='SET NULL'):
+        super().__init__(string, index)
+        self.comodel_name = comodel_name
+        self.ondelete = ondelete
+
+class One2many(Field):
+    def __init__(self, comodel_name, inverse_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.inverse_name = inverse_name
+
+class Many2many(Field):
+    def __init__(self, comodel_name, relation, column1, column2, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.relation = relation
+        self.column1 = column1
+        self.column2 = column2
+
+class SchemaMigrator:
+    """
+    Mesin migrasi skema sederhana.
+    Membaca skema yang ada dari information_schema dan pg_indexes, membandingkannya
+    dengan `_fields` setiap model, lalu menjalankan hanya DDL yang diperlukan.
+    Kolom yang sudah tidak ada di model TIDAK dihapus (sama seperti Odoo), agar data aman.
+    """
+
+    def __init__(self, cr, registry):
+        self.cr = cr
+        self.registry = registry
+
+    def _read_schema(self):
+        """Membaca kolom dan index yang sudah ada. Hanya query SELECT, tanpa DDL."""
+        self.cr.execute("""
+            SELECT table_name, column_name, data_type, character_maximum_length
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+        """)
+        columns = {}
+        for table, column, data_type, length in self.cr.fetchall():
+            columns.setdefault(table, {})[column] = f"{data_type}({length})" if length else data_type
+
+        self.cr.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        indexes = {row[0] for row in self.cr.fetchall()}
+        return columns, indexes
+
+    def _column_definition(self, field):
+        sql_type = field.column_type[0]
+        if isinstance(field, Many2one):
+            comodel_table = self.registry[field.comodel_name]._table
+            return f"{sql_type} REFERENCES {comodel_table}(id) ON DELETE {field.ondelete}"
+        return sql_type
+
+    def plan(self):
+        """Menghasilkan daftar DDL yang dibutuhkan, diurutkan agar foreign key selalu valid."""
+        columns, indexes = self._read_schema()
+        create_tables, add_columns, alter_columns, relations, create_indexes = [], [], [], [], []
+
+        for model in self.registry.values():
+            table = model._table
+            existing = columns.get(table)
+            if existing is None:
+                # Tabel baru: kolom biasa langsung ikut CREATE TABLE, kolom Many2one ditambahkan
+                # setelah semua tabel ada (karena butuh tabel tujuan untuk REFERENCES).
+                inline = ["id SERIAL PRIMARY KEY"] + [
+                    f"{name} {self._column_definition(field)}"
+                    for name, field in model._fields.items()
+                    if field.column_type and not isinstance(field, Many2one)
+                ]
+                create_tables.append(f"CREATE TABLE {table} ({', '.join(inline)})")
+                existing = {name: field.column_type[1] for name, field in model._fields.items()
+                            if field.column_type and not isinstance(field, Many2one)}
+
+            for name, field in model._fields.items():
+                if isinstance(field, Many2many):
+                    if field.relation not in columns and field.relation not in [r[0] for r in relations]:
+                        relations.append((field.relation, f"""CREATE TABLE {field.relation} (
+                    {field.column1} INTEGER REFERENCES {table}(id) ON DELETE CASCADE,
+                    {field.column2} INTEGER REFERENCES {self.registry[field.comodel_name]._table}(id) ON DELETE CASCADE,
+                    PRIMARY KEY ({field.column1}, {field.column2})
+                )"""))
+                    continue
+                if not field.column_type:
+                    continue
+
+                sql_type, db_type = field.column_type
+                if name not in existing:
+                    add_columns.append(f"ALTER TABLE {table} ADD COLUMN {name} {self._column_definition(field)}")
+                elif existing[name] != db_type:
+                    alter_columns.append(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {sql_type} USING {name}::{sql_type}")
+
+                index_name = f"{table}_{name}_index"
+                if field.index and index_name not in indexes:
+                    create_indexes.append(f"CREATE INDEX {index_name} ON {table} ({name})")
+
+        return create_tables + add_columns + alter_columns + [ddl for _, ddl in relations] + create_indexes
+
+    def migrate(self):
+        """Menjalankan semua DDL hasil `plan()` dalam satu transaksi."""
+        statements = self.plan()
+        if not statements:
+            print("SCHEMA: Skema database sudah sesuai dengan model. Tidak ada DDL yang dijalankan.")
+            return []
+
+        conn = self.cr.connection
+        try:
+            for statement in statements:
+                print(f"SCHEMA: {' '.join(statement.split())}")
+                self.cr.execute(statement)
+            conn.commit()
+        except Exception as e:
+            # PostgreSQL mendukung DDL transaksional, jadi kegagalan di tengah jalan
+            # tidak meninggalkan skema setengah jadi.
+            print(f"ERROR: Migrasi skema gagal, semua perubahan dibatalkan: {e}")
+            conn.rollback()
+            raise
+        print(f"SCHEMA: {len(statements)} perubahan skema berhasil diterapkan.")
+        return statements
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _stored_fields(cls):
+        return [name for name, field in cls._fields.items() if field.column_type]
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._stored_fields() if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+
+        print(f"SUCCESS: Record '{cls._name}' baru dibuat dengan ID: {new_id}")
+        return cls.browse(new_id)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        columns = ', '.join(['id'] + cls._stored_fields())
+        query = f"SELECT {columns} FROM {cls._table} WHERE id IN %s"
+        cls.env.cr.execute(query, (tuple(record_ids),))
+        records_data = cls.env.cr.fetchall()
+
+        colnames = [desc[0] for desc in cls.env.cr.description]
+        results = []
+        for data in records_data:
+            values = dict(zip(colnames, data))
+            record_id = values.pop('id')
+            results.append(cls(cls.env, record_id, values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+# Coba tambahkan field baru di salah satu model di bawah ini, lalu jalankan ulang file ini.
+# Kolomnya akan ditambahkan otomatis tanpa menghapus data yang sudah ada.
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+        'product_ids': One2many('product.product', 'category_id', string='Produk'),
+    }
+
+@registry.register
+class ProductTag(Model):
+    _name = 'product.tag'
+    _table = 'product_tag'
+    _fields = {
+        'name': Char(string='Nama Tag'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        # Field BARU dibanding latihan 06-10: kolom ini akan ditambahkan ke tabel lama.
+        'default_code': Char(string='Kode Internal', index=True),
+        'category_id': Many2one('product.category', string='Kategori Produk'),
+        'tag_ids': Many2many('product.tag', 'product_product_tag_rel', 'product_id', 'tag_id', string='Tags'),
+    }
+
+
+def run_schema_migration_example():
+    """
+    Fungsi untuk menjalankan contoh Schema Migration.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    env = Environment(cr)
+
+    # Tabel 'product_product' mungkin sudah ada dari latihan 06-10 (dengan data di dalamnya).
+    # Kita TIDAK menghapusnya. Jika belum ada, kita buat versi "lama" untuk simulasi.
+    cr.execute("CREATE TABLE IF NOT EXISTS product_product (id SERIAL PRIMARY KEY, name VARCHAR(255), price REAL)")
+    conn.commit()
+
+    # 1. Migrasi pertama: menambahkan tabel/kolom/index yang belum ada.
+    print("\n--- 1. Menyelaraskan Skema (Migrasi Pertama) ---")
+    registry.init_models(cr)
+
+    cr.execute("SELECT COUNT(*) FROM product_product")
+    print(f"INFO: Data lama tetap aman, tabel 'product_product' berisi {cr.fetchone()[0]} record.")
+
+    # 2. Gunakan kolom baru seperti biasa.
+    print("\n--- 2. Menggunakan Kolom Baru ---")
+    Category = env['product.category']
+    Product = env['product.product']
+    category = Category.create({'name': 'Migrated'})
+    Product.create({'name': 'Produk Skema Baru', 'price': 99.5, 'default_code': 'MIG-001', 'category_id': category.id})
+    for product in Product.search([('default_code', '=', 'MIG-001')]):
+        print(f"  - Nama: {product.name}, Kode: {product.default_code}, Kategori ID: {product.category_id}")
+
+    # 3. Migrasi kedua: skema sudah sesuai, jadi tidak ada DDL yang dijalankan.
+    print("\n--- 3. Menyelaraskan Skema Lagi (Tidak Ada Perubahan) ---")
+    statements = registry.init_models(cr)
+    assert statements == [], "Migrasi kedua seharusnya tidak menjalankan DDL apa pun!"
+
+    cr.close()
+
+if __name__ == "__main__":
+    run_schema_migration_example()
@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Schema Fingerprint: setiap model punya "sidik jari" (hash) dari `_name`, `_table`, `_fields`
+#    dan relasinya. Sidik jari disimpan di tabel metadata `ir_model_fingerprint`.
+# 2. Saat startup, registry cukup membaca tabel metadata (didahului cek `to_regclass` apakah tabelnya
+#    sudah ada, agar tidak ada error yang me-rollback pekerjaan pemanggil). Jika semua sidik jari
+#    sama, inisialisasi tabel dan relasi dilewati seluruhnya (tidak ada introspeksi, DDL, commit).
+# 3. Hanya model yang sidik jarinya berubah yang dimigrasi (memakai SchemaMigrator dari latihan 15),
+#    dan sidik jari baru disimpan dalam transaksi yang SAMA dengan DDL-nya.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    _fingerprint_table = 'ir_model_fingerprint'
+
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+    def _read_fingerprints(self, cr):
+        """Satu-satunya bacaan saat startup jika skema tidak berubah."""
+        # Database baru: tabel metadata belum ada, semua model dianggap berubah. Dicek lewat
+        # to_regclass agar tidak ada error yang memaksa rollback pekerjaan pemanggil.
+        cr.execute("SELECT to_regclass(%s)", (self._fingerprint_table,))
+        if cr.fetchone()[0] is None:
+            return {}
+        cr.execute(f"SELECT model, fingerprint FROM {self._fingerprint_table}")
+        return dict(cr.fetchall())
+
+    def init_models(self, cr, force=False):
+        """
+        Menyelaraskan skema database dengan model yang terdaftar.
+        Gunakan `force=True` jika skema diubah manual di luar ORM, agar semua model
+        diperiksa ulang lewat information_schema.
+        """
+        stored = {} if force else self._read_fingerprints(cr)
+        fingerprints = {name: model._fingerprint() for name, model in self.items()}
+        changed = [model for name, model in self.items() if stored.get(name) != fingerprints[name]]
+        if not changed:
+            print(f"SCHEMA: Sidik jari {len(self)} model cocok. Inisialisasi tabel dilewati.")
+            return []
+
+        print(f"SCHEMA: {len(changed)} dari {len(self)} model berubah, menjalankan migrasi...")
+        migrator = SchemaMigrator(cr, self)
+        statements = migrator.plan(changed)
+        statements.insert(0, f"""CREATE TABLE IF NOT EXISTS {self._fingerprint_table} (
+                    model VARCHAR(255) PRIMARY KEY,
+                    fingerprint VARCHAR(64) NOT NULL
+                )""")
+        rows = [(model._name, fingerprints[model._name]) for model in changed]
+        return migrator.migrate(statements, fingerprint_rows=rows)
+
+registry = Registry()
+
+class Field:
+    # Pasangan (tipe SQL untuk DDL, tipe yang dilaporkan oleh information_schema).
+    # Field tanpa column_type (One2many, Many2many) tidak punya kolom di tabel model.
+    column_type = None
+
+    def __init__(self, string="", index=False):
+        self.string = string
+        self.index = index
+
+    def _schema_description(self):
+        """Atribut yang mempengaruhi skema. Label (`string`) sengaja tidak ikut dihitung."""
+        attrs = sorted((key, value) for key, value in vars(self).items() if key != 'string')
+        return (type(self).__name__, self.column_type, attrs)
+
+class Char(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+class Integer(Field):
+    column_type = ('INTEGER', 'integer')
+
+class Float(Field):
+    column_type = ('DOUBLE PRECISION', 'double precision')
+
+class Selection(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+    def __init__(self, selection, string="", index=False):
+        super().__init__(string, index)
+        self.selection = selection
+
+class Many2one(Field):
+    column_type = ('INTEGER', 'integer')
+
+    def __init__(self, comodel_name, string="", index=False, ondelete='SET NULL'):
+        super().__init__(string, index)
+        self.comodel_name = comodel_name
+        self.ondelete = ondelete
+
+class One2many(Field):
+    def __init__(self, comodel_name, inverse_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.inverse_name = inverse_name
+
+class Many2many(Field):
+    def __init__(self, comodel_name, relation, column1, column2, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.relation = relation
+        self.column1 = column1
+        self.column2 = column2
+
+class SchemaMigrator:
+    """
+    Mesin migrasi skema dari latihan 15.
+    Perbedaannya: `plan()` bisa dibatasi ke sebagian model saja, dan `migrate()` ikut menyimpan
+    sidik jari model dalam transaksi yang sama dengan DDL.
+    """
+
+    def __init__(self, cr, registry):
+        self.cr = cr
+        self.registry = registry
+
+    def _read_schema(self, tables):
+        """Membaca kolom dan index dari tabel yang relevan saja. Hanya query SELECT, tanpa DDL."""
+        self.cr.execute("""
+            SELECT table_name, column_name, data_type, character_maximum_length
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name IN %s
+        """, (tuple(tables),))
+        columns = {}
+        for table, column, data_type, length in self.cr.fetchall():
+            columns.setdefault(table, {})[column] = f"{data_type}({length})" if length else data_type
+
+        self.cr.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename IN %s",
+                        (tuple(tables),))
+        indexes = {row[0] for row in self.cr.fetchall()}
+        return columns, indexes
+
+    def _column_definition(self, field):
+        sql_type = field.column_type[0]
+        if isinstance(field, Many2one):
+            comodel_table = self.registry[field.comodel_name]._table
+            return f"{sql_type} REFERENCES {comodel_table}(id) ON DELETE {field.ondelete}"
+        return sql_type
+
+    def plan(self, models=None):
+        """Menghasilkan daftar DDL yang dibutuhkan, diurutkan agar foreign key selalu valid."""
+        models = list(self.registry.values()) if models is None else models
+        tables = {model._table for model in models}
+        tables |= {field.relation for model in models for field in model._fields.values()
+                   if isinstance(field, Many2many)}
+        columns, indexes = self._read_schema(tables)
+        create_tables, add_columns, alter_columns, relations, create_indexes = [], [], [], [], []
+
+        for model in models:
+            table = model._table
+            existing = columns.get(table)
+            if existing is None:
+                inline = ["id SERIAL PRIMARY KEY"] + [
+                    f"{name} {self._column_definition(field)}"
+                    for name, field in model._fields.items()
+                    if field.column_type and not isinstance(field, Many2one)
+                ]
+                create_tables.append(f"CREATE TABLE {table} ({', '.join(inline)})")
+                existing = {name: field.column_type[1] for name, field in model._fields.items()
+                            if field.column_type and not isinstance(field, Many2one)}
+
+            for name, field in model._fields.items():
+                if isinstance(field, Many2many):
+                    if field.relation not in columns and field.relation not in [r[0] for r in relations]:
+                        relations.append((field.relation, f"""CREATE TABLE {field.relation} (
+                    {field.column1} INTEGER REFERENCES {table}(id) ON DELETE CASCADE,
+                    {field.column2} INTEGER REFERENCES {self.registry[field.comodel_name]._table}(id) ON DELETE CASCADE,
+                    PRIMARY KEY ({field.column1}, {field.column2})
+                )"""))
+                    continue
+                if not field.column_type:
+                    continue
+
+                sql_type, db_type = field.column_type
+                if name not in existing:
+                    add_columns.append(f"ALTER TABLE {table} ADD COLUMN {name} {self._column_definition(field)}")
+                elif existing[name] != db_type:
+                    alter_columns.append(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {sql_type} USING {name}::{sql_type}")
+
+                index_name = f"{table}_{name}_index"
+                if field.index and index_name not in indexes:
+                    create_indexes.append(f"CREATE INDEX {index_name} ON {table} ({name})")
+
+        return create_tables + add_columns + alter_columns + [ddl for _, ddl in relations] + create_indexes
+
+    def migrate(self, statements=None, fingerprint_rows=()):
+        """Menjalankan DDL dan menyimpan sidik jari model dalam satu transaksi."""
+        statements = self.plan() if statements is None else statements
+        conn = self.cr.connection
+        try:
+            for statement in statements:
+                if len(statements) <= 20:
+                    print(f"SCHEMA: {' '.join(statement.split())}")
+                self.cr.execute(statement)
+            if fingerprint_rows:
+                psycopg2.extras.execute_values(self.cr, f"""
+                    INSERT INTO {self.registry._fingerprint_table} (model, fingerprint) VALUES %s
+                    ON CONFLICT (model) DO UPDATE SET fingerprint = EXCLUDED.fingerprint
+                """, fingerprint_rows)
+            conn.commit()
+        except Exception as e:
+            print(f"ERROR: Migrasi skema gagal, semua perubahan dibatalkan: {e}")
+            conn.rollback()
+            raise
+        print(f"SCHEMA: {len(statements)} perintah DDL dijalankan, {len(fingerprint_rows)} sidik jari disimpan.")
+        return statements
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _fingerprint(cls):
+        """Hash SHA-256 dari semua hal yang menentukan bentuk tabel model ini."""
+        description = (cls._name, cls._table, sorted(
+            (name, field._schema_description()) for name, field in cls._fields.items()
+        ))
+        return hashlib.sha256(repr(description).encode()).hexdigest()
+
+    @classmethod
+    def _stored_fields(cls):
+        return [name for name, field in cls._fields.items() if field.column_type]
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._stored_fields() if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+
+        print(f"SUCCESS: Record '{cls._name}' baru dibuat dengan ID: {new_id}")
+        return cls.browse(new_id)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        columns = ', '.join(['id'] + cls._stored_fields())
+        query = f"SELECT {columns} FROM {cls._table} WHERE id IN %s"
+        cls.env.cr.execute(query, (tuple(record_ids),))
+        records_data = cls.env.cr.fetchall()
+
+        colnames = [desc[0] for desc in cls.env.cr.description]
+        results = []
+        for data in records_data:
+            values = dict(zip(colnames, data))
+            record_id = values.pop('id')
+            results.append(cls(cls.env, record_id, values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+        'product_ids': One2many('product.product', 'category_id', string='Produk'),
+    }
+
+@registry.register
+class ProductTag(Model):
+    _name = 'product.tag'
+    _table = 'product_tag'
+    _fields = {
+        'name': Char(string='Nama Tag'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        'default_code': Char(string='Kode Internal', index=True),
+        'category_id': Many2one('product.category', string='Kategori Produk'),
+        'tag_ids': Many2many('product.tag', 'product_product_tag_rel', 'product_id', 'tag_id', string='Tags'),
+    }
+
+
+def build_benchmark_registry(model_count):
+    """Membuat registry terpisah berisi banyak model buatan untuk mengukur waktu startup."""
+    bench_registry = Registry()
+    for i in range(model_count):
+        fields = {
+            'name': Char(string='Name'),
+            'amount': Float(string='Amount'),
+            'sequence': Integer(string='Sequence'),
+        }
+        if i:
+            fields['parent_id'] = Many2one(f'bench.model{i - 1}', string='Parent')
+        bench_registry.register(type(f'BenchModel{i}', (Model,), {
+            '_name': f'bench.model{i}', '_table': f'bench_model{i}', '_fields': fields,
+        }))
+    return bench_registry
+
+def run_startup_benchmark(cr, model_count=300):
+    """Membandingkan waktu startup cara lama, migrasi penuh, dan sidik jari untuk banyak model."""
+    conn = cr.connection
+    # Gunakan schema terpisah agar ratusan tabel benchmark tidak mengotori schema latihan.
+    cr.execute("DROP SCHEMA IF EXISTS bench_fingerprint CASCADE")
+    cr.execute("CREATE SCHEMA bench_fingerprint")
+    cr.execute("SET search_path TO bench_fingerprint")
+    conn.commit()
+
+    bench_registry = build_benchmark_registry(model_count)
+    bench_registry.init_models(cr) # Startup pertama: semua tabel dibuat.
+
+    # Cara lama (latihan 06-14): CREATE TABLE IF NOT EXISTS + commit untuk setiap model.
+    start = time.perf_counter()
+    for model in bench_registry.values():
+        cr.execute(f"CREATE TABLE IF NOT EXISTS {model._table} (id SERIAL PRIMARY KEY, name VARCHAR(255))")
+        conn.commit()
+    old_way = time.perf_counter() - start
+
+    start = time.perf_counter()
+    SchemaMigrator(cr, bench_registry).plan()
+    full_introspection = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bench_registry.init_models(cr)
+    with_fingerprint = time.perf_counter() - start
+
+    print(f"\nHASIL STARTUP untuk {model_count} model:")
+    print(f"  - DDL + commit per model (cara lama) : {old_way * 1000:8.1f} ms")
+    print(f"  - Introspeksi information_schema     : {full_introspection * 1000:8.1f} ms")
+    print(f"  - Sidik jari (2 query metadata)      : {with_fingerprint * 1000:8.1f} ms")
+
+    cr.execute("SET search_path TO public")
+    cr.execute("DROP SCHEMA bench_fingerprint CASCADE")
+    conn.commit()
+
+
+def run_schema_fingerprint_example():
+    """
+    Fungsi untuk menjalankan contoh Schema Fingerprint.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    env = Environment(cr)
+
+    # 1. Startup pertama: sidik jari belum tersimpan, jadi semua model diperiksa.
+    print("\n--- 1. Startup Pertama ---")
+    registry.init_models(cr)
+
+    # 2. Startup kedua: semua sidik jari cocok, inisialisasi dilewati.
+    print("\n--- 2. Startup Kedua (Skema Tidak Berubah) ---")
+    statements = registry.init_models(cr)
+    assert statements == [], "Startup kedua seharusnya tidak menjalankan DDL apa pun!"
+
+    # 3. Ubah definisi satu model: hanya model itu yang dimigrasi.
+    print("\n--- 3. Menambahkan Field Baru ke 'product.tag' ---")
+    ProductTag._fields['color'] = Integer(string='Warna')
+    registry.init_models(cr)
+    env['product.tag'].create({'name': 'Promo', 'color': 3})
+
+    # 4. Benchmark startup dengan 300 model.
+    print("\n--- 4. Benchmark Startup 300 Model ---")
+    run_startup_benchmark(cr)
+
+    cr.close()
+
+if __name__ == "__main__":
+    run_schema_fingerprint_example()
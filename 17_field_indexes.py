@@ -0,0 +1,532 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Deklarasi index pada Field: `index=True` (sama dengan 'btree'), 'btree', 'hash', atau 'trigram'
+#    (GIN + pg_trgm, untuk pencarian `ilike '%teks%'`).
+# 2. Kolom Many2one otomatis diberi index (bisa dimatikan dengan `index=False`), karena kolom inilah
+#    yang dipakai oleh search relasi dan oleh akses One2many.
+# 3. Index untuk tabel yang SUDAH ada dibuat dengan `CREATE INDEX CONCURRENTLY` di luar transaksi,
+#    sehingga tabel tetap bisa dibaca dan ditulis selama index dibangun. Tabel yang baru dibuat
+#    (masih kosong) cukup memakai `CREATE INDEX` biasa di dalam transaksi migrasi.
+# 4. Index yang INVALID (misalnya CONCURRENTLY gagal di tengah jalan) dibuat ulang, dan index yang
+#    tidak lagi dideklarasikan dihapus.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    _fingerprint_table = 'ir_model_fingerprint'
+
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+    def _read_fingerprints(self, cr):
+        cr.execute("SELECT to_regclass(%s)", (self._fingerprint_table,))
+        if cr.fetchone()[0] is None:
+            return {} # Tanpa error, jadi pekerjaan pemanggil di transaksi ini tidak ikut di-rollback
+        cr.execute(f"SELECT model, fingerprint FROM {self._fingerprint_table}")
+        return dict(cr.fetchall())
+
+    def init_models(self, cr, force=False):
+        """Menyelaraskan skema database (termasuk index) dengan model yang terdaftar."""
+        stored = {} if force else self._read_fingerprints(cr)
+        fingerprints = {name: model._fingerprint() for name, model in self.items()}
+        changed = [model for name, model in self.items() if stored.get(name) != fingerprints[name]]
+        if not changed:
+            print(f"SCHEMA: Sidik jari {len(self)} model cocok. Inisialisasi tabel dilewati.")
+            return []
+
+        print(f"SCHEMA: {len(changed)} dari {len(self)} model berubah, menjalankan migrasi...")
+        migrator = SchemaMigrator(cr, self)
+        statements, concurrent_statements = migrator.plan(changed)
+        statements.insert(0, f"""CREATE TABLE IF NOT EXISTS {self._fingerprint_table} (
+                    model VARCHAR(255) PRIMARY KEY,
+                    fingerprint VARCHAR(64) NOT NULL
+                )""")
+        rows = [(model._name, fingerprints[model._name]) for model in changed]
+        return migrator.migrate(statements, concurrent_statements, fingerprint_rows=rows)
+
+registry = Registry()
+
+# Metode index yang didukung dan klausa `USING` yang dipakai PostgreSQL untuknya.
+INDEX_METHODS = {
+    'btree': 'btree',
+    'hash': 'hash',
+    'trigram': 'gin',
+}
+
+class Field:
+    column_type = None
+
+    def __init__(self, string="", index=False):
+        if index not in (False, None, True) and index not in INDEX_METHODS:
+            raise ValueError(f"Tipe index '{index}' tidak dikenal. Gunakan True atau salah satu dari {list(INDEX_METHODS)}.")
+        self.string = string
+        self.index = index
+
+    @property
+    def index_method(self):
+        """Metode index yang diminta, atau None jika field ini tidak perlu diindex."""
+        if not self.index:
+            return None
+        return 'btree' if self.index is True else self.index
+
+    def _schema_description(self):
+        attrs = sorted((key, value) for key, value in vars(self).items() if key != 'string')
+        return (type(self).__name__, self.column_type, attrs)
+
+class Char(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+class Integer(Field):
+    column_type = ('INTEGER', 'integer')
+
+class Float(Field):
+    column_type = ('DOUBLE PRECISION', 'double precision')
+
+class Selection(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+    def __init__(self, selection, string="", index=False):
+        super().__init__(string, index)
+        self.selection = selection
+
+class Many2one(Field):
+    column_type = ('INTEGER', 'integer')
+
+    def __init__(self, comodel_name, string="", index=True, ondelete='SET NULL'):
+        super().__init__(string, index)
+        self.comodel_name = comodel_name
+        self.ondelete = ondelete
+
+class One2many(Field):
+    def __init__(self, comodel_name, inverse_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.inverse_name = inverse_name
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self # Diakses dari class: kembalikan objek field-nya
+        Comodel = record.env[self.comodel_name]
+        # Query inilah yang sangat terbantu oleh index otomatis pada kolom Many2one.
+        return Comodel.search([(self.inverse_name, '=', record.id)])
+
+class Many2many(Field):
+    def __init__(self, comodel_name, relation, column1, column2, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.relation = relation
+        self.column1 = column1
+        self.column2 = column2
+
+class SchemaMigrator:
+    """
+    Mesin migrasi skema dari latihan 15 dan 16, sekarang juga mengelola index per field.
+    `plan()` mengembalikan dua daftar: DDL untuk satu transaksi, dan index CONCURRENTLY
+    yang harus dijalankan di luar transaksi.
+    """
+
+    def __init__(self, cr, registry):
+        self.cr = cr
+        self.registry = registry
+
+    def _read_schema(self, tables):
+        """Membaca kolom dan index (beserta status valid-nya). Hanya query SELECT, tanpa DDL."""
+        self.cr.execute("""
+            SELECT table_name, column_name, data_type, character_maximum_length
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name IN %s
+        """, (tuple(tables),))
+        columns = {}
+        for table, column, data_type, length in self.cr.fetchall():
+            columns.setdefault(table, {})[column] = f"{data_type}({length})" if length else data_type
+
+        self.cr.execute("""
+            SELECT i.relname, pg_get_indexdef(i.oid), x.indisvalid
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            WHERE t.relnamespace = current_schema()::regnamespace AND t.relname IN %s
+        """, (tuple(tables),))
+        indexes = {name: (indexdef, valid) for name, indexdef, valid in self.cr.fetchall()}
+        return columns, indexes
+
+    def _column_definition(self, field):
+        sql_type = field.column_type[0]
+        if isinstance(field, Many2one):
+            comodel_table = self.registry[field.comodel_name]._table
+            return f"{sql_type} REFERENCES {comodel_table}(id) ON DELETE {field.ondelete}"
+        return sql_type
+
+    def _trigram_available(self):
+        self.cr.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return self.cr.fetchone() is not None
+
+    def _plan_index(self, table, name, field, existing_index, new_table):
+        """Mengembalikan daftar DDL untuk menyelaraskan satu index dengan deklarasi field-nya."""
+        index_name = f"{table}_{name}_index"
+        concurrently = '' if new_table else 'CONCURRENTLY '
+        method = field.index_method
+        if method is None:
+            return [f"DROP INDEX {concurrently}{index_name}"] if existing_index else []
+
+        using = INDEX_METHODS[method]
+        if existing_index:
+            indexdef, valid = existing_index
+            if valid and f" USING {using} (" in indexdef:
+                return []
+            statements = [f"DROP INDEX {concurrently}{index_name}"]
+        else:
+            statements = []
+
+        expression = f"{name} gin_trgm_ops" if method == 'trigram' else name
+        statements.append(f"CREATE INDEX {concurrently}{index_name} ON {table} USING {using} ({expression})")
+        return statements
+
+    def plan(self, models=None):
+        """Menghasilkan (DDL transaksional, DDL CONCURRENTLY), diurutkan agar foreign key selalu valid."""
+        models = list(self.registry.values()) if models is None else models
+        tables = {model._table for model in models}
+        tables |= {field.relation for model in models for field in model._fields.values()
+                   if isinstance(field, Many2many)}
+        columns, indexes = self._read_schema(tables)
+        create_tables, add_columns, alter_columns, relations, create_indexes = [], [], [], [], []
+        concurrent_indexes = []
+        trigram_checked = None
+
+        for model in models:
+            table = model._table
+            existing = columns.get(table)
+            new_table = existing is None
+            if new_table:
+                inline = ["id SERIAL PRIMARY KEY"] + [
+                    f"{name} {self._column_definition(field)}"
+                    for name, field in model._fields.items()
+                    if field.column_type and not isinstance(field, Many2one)
+                ]
+                create_tables.append(f"CREATE TABLE {table} ({', '.join(inline)})")
+                existing = {name: field.column_type[1] for name, field in model._fields.items()
+                            if field.column_type and not isinstance(field, Many2one)}
+
+            for name, field in model._fields.items():
+                if isinstance(field, Many2many):
+                    if field.relation not in columns and field.relation not in [r[0] for r in relations]:
+                        relations.append((field.relation, f"""CREATE TABLE {field.relation} (
+                    {field.column1} INTEGER REFERENCES {table}(id) ON DELETE CASCADE,
+                    {field.column2} INTEGER REFERENCES {self.registry[field.comodel_name]._table}(id) ON DELETE CASCADE,
+                    PRIMARY KEY ({field.column1}, {field.column2})
+                )"""))
+                    continue
+                if not field.column_type:
+                    continue
+
+                sql_type, db_type = field.column_type
+                if name not in existing:
+                    add_columns.append(f"ALTER TABLE {table} ADD COLUMN {name} {self._column_definition(field)}")
+                elif existing[name] != db_type:
+                    alter_columns.append(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {sql_type} USING {name}::{sql_type}")
+
+                index_statements = self._plan_index(table, name, field, indexes.get(f"{table}_{name}_index"), new_table)
+                if index_statements and field.index_method == 'trigram':
+                    if trigram_checked is None:
+                        trigram_checked = self._trigram_available()
+                        if trigram_checked:
+                            create_tables.insert(0, "CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                    if not trigram_checked:
+                        print(f"WARNING: Ekstensi pg_trgm tidak tersedia, index trigram untuk '{table}.{name}' dilewati.")
+                        continue
+                (create_indexes if new_table else concurrent_indexes).extend(index_statements)
+
+        statements = create_tables + add_columns + alter_columns + [ddl for _, ddl in relations] + create_indexes
+        return statements, concurrent_indexes
+
+    def _save_fingerprints(self, fingerprint_rows):
+        psycopg2.extras.execute_values(self.cr, f"""
+            INSERT INTO {self.registry._fingerprint_table} (model, fingerprint) VALUES %s
+            ON CONFLICT (model) DO UPDATE SET fingerprint = EXCLUDED.fingerprint
+        """, fingerprint_rows)
+
+    def migrate(self, statements=None, concurrent_statements=None, fingerprint_rows=()):
+        """
+        Menjalankan DDL dalam satu transaksi, lalu index CONCURRENTLY dalam mode autocommit
+        (PostgreSQL melarang CONCURRENTLY di dalam transaksi). Sidik jari baru disimpan paling
+        akhir, sehingga jika index CONCURRENTLY gagal, migrasi akan dicoba lagi saat startup berikutnya.
+        """
+        if statements is None:
+            statements, concurrent_statements = self.plan()
+        concurrent_statements = concurrent_statements or []
+        conn = self.cr.connection
+        try:
+            for statement in statements:
+                print(f"SCHEMA: {' '.join(statement.split())}")
+                self.cr.execute(statement)
+            if fingerprint_rows and not concurrent_statements:
+                self._save_fingerprints(fingerprint_rows)
+            conn.commit()
+        except Exception as e:
+            print(f"ERROR: Migrasi skema gagal, semua perubahan dibatalkan: {e}")
+            conn.rollback()
+            raise
+
+        if concurrent_statements:
+            conn.autocommit = True
+            try:
+                for statement in concurrent_statements:
+                    print(f"SCHEMA: {statement}")
+                    self.cr.execute(statement)
+            except Exception as e:
+                print(f"ERROR: Pembuatan index gagal (akan dicoba lagi saat startup berikutnya): {e}")
+                raise
+            finally:
+                conn.autocommit = False
+            if fingerprint_rows:
+                self._save_fingerprints(fingerprint_rows)
+                conn.commit()
+
+        print(f"SCHEMA: {len(statements) + len(concurrent_statements)} perintah DDL dijalankan.")
+        return statements + concurrent_statements
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # One2many adalah descriptor (seperti latihan 10): pasang di class agar `record.product_ids`
+        # menjalankan search, tanpa hook di setiap akses atribut lain.
+        for name, field in (cls.__dict__.get('_fields') or {}).items():
+            if isinstance(field, One2many):
+                setattr(cls, name, field)
+
+    @classmethod
+    def _fingerprint(cls):
+        description = (cls._name, cls._table, sorted(
+            (name, field._schema_description()) for name, field in cls._fields.items()
+        ))
+        return hashlib.sha256(repr(description).encode()).hexdigest()
+
+    @classmethod
+    def _stored_fields(cls):
+        return [name for name, field in cls._fields.items() if field.column_type]
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._stored_fields() if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+
+        print(f"SUCCESS: Record '{cls._name}' baru dibuat dengan ID: {new_id}")
+        return cls.browse(new_id)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        columns = ', '.join(['id'] + cls._stored_fields())
+        query = f"SELECT {columns} FROM {cls._table} WHERE id IN %s"
+        cls.env.cr.execute(query, (tuple(record_ids),))
+        records_data = cls.env.cr.fetchall()
+
+        colnames = [desc[0] for desc in cls.env.cr.description]
+        results = []
+        for data in records_data:
+            values = dict(zip(colnames, data))
+            record_id = values.pop('id')
+            results.append(cls(cls.env, record_id, values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+class Environment:
+    def __init__(self, cursor, registry=registry):
+        self.cr = cursor
+        self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+        'product_ids': One2many('product.product', 'category_id', string='Produk'),
+    }
+
+@registry.register
+class ProductTag(Model):
+    _name = 'product.tag'
+    _table = 'product_tag'
+    _fields = {
+        'name': Char(string='Nama Tag'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk', index='trigram'), # Untuk pencarian ilike '%laptop%'
+        'price': Float(string='Harga'),
+        'default_code': Char(string='Kode Internal', index='hash'), # Hanya dicari dengan '='
+        'category_id': Many2one('product.category', string='Kategori Produk'), # Otomatis btree
+        'tag_ids': Many2many('product.tag', 'product_product_tag_rel', 'product_id', 'tag_id', string='Tags'),
+    }
+
+
+def run_one2many_benchmark(cr, product_count=1_000_000, category_count=1_000, accesses=50):
+    """Mengukur akses One2many `category.product_ids` tanpa dan dengan index pada category_id."""
+    conn = cr.connection
+    # Gunakan schema terpisah agar satu juta produk tidak mengotori tabel latihan.
+    cr.execute("DROP SCHEMA IF EXISTS bench_index CASCADE")
+    cr.execute("CREATE SCHEMA bench_index")
+    cr.execute("SET search_path TO bench_index")
+    conn.commit()
+
+    bench_registry = Registry()
+    bench_registry.register(type('BenchCategory', (Model,), {
+        '_name': 'product.category', '_table': 'product_category', '_fields': {
+            'name': Char(string='Nama Kategori'),
+            'product_ids': One2many('product.product', 'category_id', string='Produk'),
+        },
+    }))
+    category_field = Many2one('product.category', string='Kategori Produk', index=False)
+    bench_registry.register(type('BenchProduct', (Model,), {
+        '_name': 'product.product', '_table': 'product_product', '_fields': {
+            'name': Char(string='Nama Produk'),
+            'price': Float(string='Harga'),
+            'category_id': category_field,
+        },
+    }))
+    bench_registry.init_models(cr)
+
+    print(f"INFO: Mengisi {category_count} kategori dan {product_count} produk...")
+    cr.execute("INSERT INTO product_category (name) SELECT 'Kategori ' || i FROM generate_series(1, %s) i",
+               (category_count,))
+    cr.execute("""
+        INSERT INTO product_product (name, price, category_id)
+        SELECT 'Produk ' || i, (i %% 1000) + 0.5, (i %% %s) + 1 FROM generate_series(1, %s) i
+    """, (category_count, product_count))
+    cr.execute("ANALYZE product_product")
+    conn.commit()
+
+    env = Environment(cr, bench_registry)
+    categories = env['product.category'].browse(list(range(1, accesses + 1)))
+
+    def measure():
+        start = time.perf_counter()
+        total = sum(len(category.product_ids) for category in categories)
+        return time.perf_counter() - start, total
+
+    without_index, total = measure()
+
+    # Aktifkan index default Many2one, lalu biarkan migrator membuatnya secara CONCURRENTLY.
+    category_field.index = True
+    bench_registry.init_models(cr)
+    with_index, _ = measure()
+
+    print(f"\nHASIL One2many ({accesses} kategori, {total} produk terbaca dari {product_count} baris):")
+    print(f"  - Tanpa index : {without_index * 1000:8.1f} ms ({without_index / accesses * 1000:.2f} ms per akses)")
+    print(f"  - Dengan index: {with_index * 1000:8.1f} ms ({with_index / accesses * 1000:.2f} ms per akses)")
+
+    cr.execute("SET search_path TO public")
+    cr.execute("DROP SCHEMA bench_index CASCADE")
+    conn.commit()
+
+
+def run_field_indexes_example():
+    """
+    Fungsi untuk menjalankan contoh deklarasi index pada field.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    env = Environment(cr)
+
+    # 1. Migrasi: index dideklarasikan di field dan dibuat otomatis.
+    print("\n--- 1. Menyelaraskan Skema dan Index ---")
+    registry.init_models(cr)
+
+    cr.execute("SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'product_product' ORDER BY indexname")
+    print("\nIndex pada tabel 'product_product':")
+    for name, indexdef in cr.fetchall():
+        print(f"  - {name}: {indexdef}")
+
+    # 2. Akses One2many sekarang memakai index pada category_id.
+    print("\n--- 2. Akses One2many ---")
+    category = env['product.category'].create({'name': 'Indexed'})
+    env['product.product'].create({'name': 'Laptop Index', 'price': 10.0, 'category_id': category.id})
+    for product in category.product_ids:
+        print(f"  - Nama: {product.name}")
+
+    # 3. Benchmark One2many pada 1 juta produk.
+    print("\n--- 3. Benchmark One2many pada 1.000.000 Produk ---")
+    run_one2many_benchmark(cr)
+
+    cr.close()
+
+if __name__ == "__main__":
+    run_field_indexes_example()
@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+import re
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Statistik Search: setiap domain yang dikompilasi oleh `Model.search` dicatat "bentuknya"
+#    (pasangan field + operator, tanpa nilai) beserta waktu eksekusinya.
+# 2. Index Advisor: `env.index_advice()` menyarankan index tunggal maupun komposit yang belum ada
+#    (dicek ke pg_indexes), diurutkan berdasarkan total waktu query yang bisa dihemat.
+# 3. Operator domain yang lebih lengkap: '=', '!=', '<', '>', '<=', '>=', 'in', 'like', 'ilike'.
+# Skema tetap diselaraskan oleh SchemaMigrator dari latihan 15.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class SearchStats:
+    """Mencatat bentuk domain setiap search beserta jumlah eksekusi dan total waktunya."""
+
+    def __init__(self):
+        self._shapes = {} # (tabel, bentuk domain) -> [jumlah query, total detik]
+
+    def record(self, table, shape, duration):
+        entry = self._shapes.setdefault((table, shape), [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+
+    def items(self):
+        return self._shapes.items()
+
+    def reset(self):
+        self._shapes.clear()
+
+class Registry(dict):
+    def __init__(self):
+        super().__init__()
+        self.search_stats = SearchStats()
+
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+    def init_models(self, cr):
+        """Menyelaraskan skema database dengan SEMUA model yang terdaftar."""
+        return SchemaMigrator(cr, self).migrate()
+
+registry = Registry()
+
+class Field:
+    column_type = None
+
+    def __init__(self, string="", index=False):
+        self.string = string
+        self.index = index
+
+class Char(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+class Integer(Field):
+    column_type = ('INTEGER', 'integer')
+
+class Float(Field):
+    column_type = ('DOUBLE PRECISION', 'double precision')
+
+class Selection(Field):
+    column_type = ('VARCHAR(255)', 'character varying(255)')
+
+    def __init__(self, selection, string="", index=False):
+        super().__init__(string, index)
+        self.selection = selection
+
+class Many2one(Field):
+    column_type = ('INTEGER', 'integer')
+
+    def __init__(self, comodel_name, string="", index=False, ondelete='SET NULL'):
+        super().__init__(string, index)
+        self.comodel_name = comodel_name
+        self.ondelete = ondelete
+
+class SchemaMigrator:
+    """Mesin migrasi skema dari latihan 15 (versi ringkas tanpa relasi Many2many)."""
+
+    def __init__(self, cr, registry):
+        self.cr = cr
+        self.registry = registry
+
+    def _read_schema(self):
+        self.cr.execute("""
+            SELECT table_name, column_name, data_type, character_maximum_length
+            FROM information_schema.columns
+            WHERE table_schema = current_schema()
+        """)
+        columns = {}
+        for table, column, data_type, length in self.cr.fetchall():
+            columns.setdefault(table, {})[column] = f"{data_type}({length})" if length else data_type
+
+        self.cr.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        indexes = {row[0] for row in self.cr.fetchall()}
+        return columns, indexes
+
+    def _column_definition(self, field):
+        sql_type = field.column_type[0]
+        if isinstance(field, Many2one):
+            comodel_table = self.registry[field.comodel_name]._table
+            return f"{sql_type} REFERENCES {comodel_table}(id) ON DELETE {field.ondelete}"
+        return sql_type
+
+    def plan(self):
+        columns, indexes = self._read_schema()
+        create_tables, add_columns, alter_columns, create_indexes = [], [], [], []
+
+        for model in self.registry.values():
+            table = model._table
+            existing = columns.get(table)
+            if existing is None:
+                inline = ["id SERIAL PRIMARY KEY"] + [
+                    f"{name} {self._column_definition(field)}"
+                    for name, field in model._fields.items()
+                    if field.column_type and not isinstance(field, Many2one)
+                ]
+                create_tables.append(f"CREATE TABLE {table} ({', '.join(inline)})")
+                existing = {name: field.column_type[1] for name, field in model._fields.items()
+                            if field.column_type and not isinstance(field, Many2one)}
+
+            for name, field in model._fields.items():
+                if not field.column_type:
+                    continue
+                sql_type, db_type = field.column_type
+                if name not in existing:
+                    add_columns.append(f"ALTER TABLE {table} ADD COLUMN {name} {self._column_definition(field)}")
+                elif existing[name] != db_type:
+                    alter_columns.append(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE {sql_type} USING {name}::{sql_type}")
+
+                index_name = f"{table}_{name}_index"
+                if field.index and index_name not in indexes:
+                    create_indexes.append(f"CREATE INDEX {index_name} ON {table} ({name})")
+
+        return create_tables + add_columns + alter_columns + create_indexes
+
+    def migrate(self):
+        statements = self.plan()
+        if not statements:
+            print("SCHEMA: Skema database sudah sesuai dengan model. Tidak ada DDL yang dijalankan.")
+            return []
+
+        conn = self.cr.connection
+        try:
+            for statement in statements:
+                print(f"SCHEMA: {statement}")
+                self.cr.execute(statement)
+            conn.commit()
+        except Exception as e:
+            print(f"ERROR: Migrasi skema gagal, semua perubahan dibatalkan: {e}")
+            conn.rollback()
+            raise
+        return statements
+
+# Pengelompokan operator domain berdasarkan jenis index yang bisa membantunya.
+EQUALITY_OPERATORS = {'=', 'in'}
+RANGE_OPERATORS = {'<', '>', '<=', '>='}
+PATTERN_OPERATORS = {'like', 'ilike'}
+
+class IndexAdvisor:
+    """
+    Mengubah statistik search menjadi saran index.
+    Untuk setiap bentuk domain, kandidat index btree disusun dari kolom kesamaan ('=', 'in')
+    lalu SATU kolom rentang ('<', '>', ...), karena btree hanya bisa memakai satu kolom rentang
+    secara efisien. Domain yang hanya berisi 'like'/'ilike' menghasilkan kandidat trigram.
+    """
+
+    def __init__(self, cr, stats):
+        self.cr = cr
+        self.stats = stats
+
+    @staticmethod
+    def _candidate(shape):
+        equality = sorted({field for field, op in shape if op in EQUALITY_OPERATORS})
+        ranges = [field for field, op in shape if op in RANGE_OPERATORS and field not in equality]
+        patterns = [field for field, op in shape if op in PATTERN_OPERATORS]
+        if equality or ranges:
+            return 'btree', tuple(equality + ranges[:1]), len(equality)
+        if patterns:
+            return 'trigram', (patterns[0],), 0
+        return None # Misalnya domain kosong atau hanya '!=': index tidak membantu.
+
+    def _existing_indexes(self, tables):
+        """Membaca index yang ada dari pg_indexes: {tabel: [(metode, [kolom, ...]), ...]}."""
+        self.cr.execute("""
+            SELECT tablename, indexdef FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename IN %s
+        """, (tuple(tables),))
+        existing = {}
+        for table, indexdef in self.cr.fetchall():
+            match = re.search(r"USING (\w+) \((.*)\)", indexdef)
+            if match:
+                # Ambil nama kolomnya saja, buang operator class seperti 'gin_trgm_ops'.
+                columns = [part.split()[0] for part in match.group(2).split(',')]
+                existing.setdefault(table, []).append((match.group(1), columns))
+        return existing
+
+    @staticmethod
+    def _is_covered(method, columns, equality_count, indexes):
+        for index_method, index_columns in indexes:
+            if method == 'trigram':
+                if index_method == 'gin' and index_columns[0] == columns[0]:
+                    return True
+                continue
+            # Hash hanya melayani kesamaan; kandidat rentang (`price < x`) tetap butuh btree.
+            if index_method == 'hash' and len(columns) == 1 and equality_count == 1 and index_columns == list(columns):
+                return True
+            if index_method != 'btree' or len(index_columns) < len(columns):
+                continue
+            # Urutan kolom kesamaan bebas, tetapi kolom rentang harus tepat di belakangnya.
+            if (set(index_columns[:equality_count]) == set(columns[:equality_count])
+                    and index_columns[equality_count:len(columns)] == list(columns[equality_count:])):
+                return True
+        return False
+
+    def advise(self):
+        candidates = {}
+        for (table, shape), (count, seconds) in self.stats.items():
+            candidate = self._candidate(shape)
+            if candidate is None:
+                continue
+            info = candidates.setdefault((table,) + candidate, {'queries': 0, 'seconds': 0.0, 'shapes': set()})
+            info['queries'] += count
+            info['seconds'] += seconds
+            info['shapes'].add(shape)
+        if not candidates:
+            return []
+
+        existing = self._existing_indexes({key[0] for key in candidates})
+        advice = []
+        for (table, method, columns, equality_count), info in candidates.items():
+            if self._is_covered(method, columns, equality_count, existing.get(table, [])):
+                continue
+            index_name = f"{table}_{'_'.join(columns)}_index"
+            if method == 'trigram':
+                ddl = f"CREATE INDEX CONCURRENTLY {index_name} ON {table} USING gin ({columns[0]} gin_trgm_ops)"
+            else:
+                ddl = f"CREATE INDEX CONCURRENTLY {index_name} ON {table} ({', '.join(columns)})"
+            advice.append({
+                'table': table,
+                'columns': columns,
+                'method': method,
+                'kind': 'single' if len(columns) == 1 else 'composite',
+                'queries': info['queries'],
+                # Batas atas penghematan: seluruh waktu query yang bisa dibantu oleh index ini.
+                'estimated_saving_ms': info['seconds'] * 1000,
+                'shapes': sorted(info['shapes']),
+                'ddl': ddl,
+            })
+        advice.sort(key=lambda item: item['estimated_saving_ms'], reverse=True)
+        return advice
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _stored_fields(cls):
+        return [name for name, field in cls._fields.items() if field.column_type]
+
+    @classmethod
+    def _where_clause(cls, domain):
+        """Mengompilasi domain menjadi (klausa WHERE, parameter, bentuk domain)."""
+        clauses, params, shape = [], [], []
+        for field, op, value in domain:
+            if field != 'id' and field not in cls._fields:
+                raise ValueError(f"Field '{field}' tidak ada di model '{cls._name}'.")
+            op = op.lower()
+            if op == 'in' and not value:
+                clauses.append("FALSE") # `IN ()` bukan SQL yang valid
+            elif op == 'in':
+                clauses.append(f"{field} IN %s")
+                params.append(tuple(value))
+            elif op in EQUALITY_OPERATORS | RANGE_OPERATORS | PATTERN_OPERATORS | {'!='}:
+                clauses.append(f"{field} {op} %s")
+                params.append(value)
+            else:
+                raise ValueError(f"Operator '{op}' tidak didukung.")
+            shape.append((field, op))
+        return " AND ".join(clauses), params, tuple(sorted(shape))
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._stored_fields() if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+        return cls.browse(new_id)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        where, params, shape = cls._where_clause(domain or [])
+        if where:
+            query += " WHERE " + where
+
+        start = time.perf_counter()
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        cls.env.registry.search_stats.record(cls._table, shape, time.perf_counter() - start)
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        columns = ', '.join(['id'] + cls._stored_fields())
+        query = f"SELECT {columns} FROM {cls._table} WHERE id IN %s"
+        cls.env.cr.execute(query, (tuple(record_ids),))
+        records_data = cls.env.cr.fetchall()
+
+        colnames = [desc[0] for desc in cls.env.cr.description]
+        results = []
+        for data in records_data:
+            values = dict(zip(colnames, data))
+            record_id = values.pop('id')
+            results.append(cls(cls.env, record_id, values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def index_advice(self):
+        """Laporan saran index berdasarkan semua search yang sudah dijalankan di registry ini."""
+        return IndexAdvisor(self.cr, self.registry.search_stats).advise()
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        'default_code': Char(string='Kode Internal', index=True), # Sudah diindex, tidak akan disarankan
+        'category_id': Many2one('product.category', string='Kategori Produk'),
+    }
+
+@registry.register
+class SaleOrder(Model):
+    _name = 'sale.order'
+    _table = 'sale_order'
+    _fields = {
+        'name': Char(string='Order Reference'),
+        'state': Selection([('draft', 'Quotation'), ('sale', 'Sales Order'), ('cancel', 'Cancelled')], string='Status'),
+        'amount_total': Float(string='Total'),
+    }
+
+
+def print_advice(advice):
+    if not advice:
+        print("Tidak ada saran index: semua pola search sudah terlayani oleh index yang ada.")
+        return
+    for rank, item in enumerate(advice, 1):
+        print(f"{rank}. [{item['kind']}/{item['method']}] {item['table']} ({', '.join(item['columns'])})")
+        print(f"   {item['queries']} query, perkiraan hemat hingga {item['estimated_saving_ms']:.1f} ms")
+        print(f"   Pola domain: {item['shapes']}")
+        print(f"   DDL: {item['ddl']}")
+
+
+def run_index_advisor_example():
+    """
+    Fungsi untuk menjalankan contoh Index Advisor.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    env = Environment(cr)
+
+    # Gunakan schema terpisah agar data uji tidak mengotori tabel latihan lain.
+    cr.execute("DROP SCHEMA IF EXISTS bench_advisor CASCADE")
+    cr.execute("CREATE SCHEMA bench_advisor")
+    cr.execute("SET search_path TO bench_advisor")
+    conn.commit()
+    registry.init_models(cr)
+
+    print("\n--- 1. Mengisi Data Uji ---")
+    cr.execute("INSERT INTO product_category (name) SELECT 'Kategori ' || i FROM generate_series(1, 500) i")
+    cr.execute("""
+        INSERT INTO product_product (name, price, default_code, category_id)
+        SELECT 'Produk ' || i, (i % 5000) + 0.5, 'P' || i, (i % 500) + 1 FROM generate_series(1, 300000) i
+    """)
+    cr.execute("""
+        INSERT INTO sale_order (name, state, amount_total)
+        SELECT 'SO' || i, (ARRAY['draft', 'sale', 'cancel'])[(i % 3) + 1], i % 10000 FROM generate_series(1, 300000) i
+    """)
+    cr.execute("ANALYZE")
+    conn.commit()
+    print("INFO: 300.000 produk dan 300.000 sales order siap.")
+
+    # 2. Jalankan beban kerja yang mirip aplikasi sungguhan.
+    print("\n--- 2. Menjalankan Beban Kerja Search ---")
+    Product = env['product.product']
+    SaleOrderModel = env['sale.order']
+    for category_id in range(1, 41):
+        Product.search([('category_id', '=', category_id)])
+    for category_id in range(1, 11):
+        Product.search([('category_id', '=', category_id), ('price', '<', 10)])
+    for i in range(20):
+        Product.search([('default_code', '=', f'P{i}')])
+    for amount in range(9990, 10000):
+        SaleOrderModel.search([('state', '=', 'draft'), ('amount_total', '>', amount)])
+
+    # 3. Minta saran index.
+    print("\n--- 3. Laporan Saran Index ---")
+    advice = env.index_advice()
+    print_advice(advice)
+    assert all(item['columns'] != ('default_code',) for item in advice), "Kolom yang sudah diindex tidak boleh disarankan!"
+
+    # 4. Terapkan saran teratas, lalu ulangi beban kerja.
+    print("\n--- 4. Menerapkan Saran Teratas dan Mengukur Ulang ---")
+    conn.commit()
+    conn.autocommit = True # CREATE INDEX CONCURRENTLY tidak boleh di dalam transaksi
+    cr.execute(advice[0]['ddl'])
+    conn.autocommit = False
+    print(f"SCHEMA: {advice[0]['ddl']}")
+    registry.search_stats.reset()
+    for category_id in range(1, 41):
+        Product.search([('category_id', '=', category_id)])
+    print_advice(env.index_advice())
+
+    cr.execute("SET search_path TO public")
+    cr.execute("DROP SCHEMA bench_advisor CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_index_advisor_example()
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Model terikat (bound model) per Environment: `env['model']` mengembalikan subclass ringan yang
+#    membawa `env` miliknya sendiri, bukan lagi mengubah atribut `env` di class model bersama.
+# 2. Cache record per Environment: nilai yang sudah dibaca disimpan di `env.cache`, sehingga
+#    setiap request (thread) punya cache sendiri dan tidak bisa tercampur dengan request lain.
+# 3. Connection pool: setiap thread mengambil koneksi sendiri dari `Database.get_pool()`.
+
+class Database:
+    _connection = None
+    _pool = None
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+    @classmethod
+    def get_pool(cls, maxconn=32):
+        """Pool koneksi yang aman dipakai bersama oleh banyak thread."""
+        if cls._pool is None:
+            try:
+                cls._pool = psycopg2.pool.ThreadedConnectionPool(
+                    1, maxconn, dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._pool
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Integer(Field): pass
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING *"
+
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        row = dict(cls.env.cr.fetchone())
+        conn.commit()
+
+        new_id = row.pop('id')
+        cls.env.cache[(cls._name, new_id)] = row
+        return cls(cls.env, new_id, row)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = %s"
+
+        conn = self.env.cr.connection
+        self.env.cr.execute(query, [values[name] for name in field_names] + [self.id])
+        conn.commit()
+
+        cached = self.env.cache.setdefault((self._name, self.id), {})
+        for name in field_names:
+            cached[name] = values[name]
+            setattr(self, name, values[name])
+        return True
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        # Hanya ID yang belum ada di cache environment ini yang diambil dari database.
+        cache = cls.env.cache
+        missing = [record_id for record_id in record_ids if (cls._name, record_id) not in cache]
+        if missing:
+            cls.env.cr.execute(f"SELECT * FROM {cls._table} WHERE id IN %s", (tuple(missing),))
+            for row in cls.env.cr.fetchall():
+                values = dict(row)
+                cache[(cls._name, values.pop('id'))] = values
+
+        results = [cls(cls.env, record_id, cache[(cls._name, record_id)])
+                   for record_id in record_ids if (cls._name, record_id) in cache]
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Integer):
+                field_definitions.append(f"{name} INTEGER")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        cls.env.cr.execute(query)
+        cls.env.cr.connection.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self.cache = {} # (nama model, id) -> dict nilai field, khusus untuk environment ini
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+
+        # Setiap environment mendapat subclass ringan miliknya sendiri yang membawa `env`,
+        # sehingga dua environment (misalnya dua request di thread berbeda) tidak saling
+        # menimpa cursor di class model yang sama.
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+class LegacyEnvironment(Environment):
+    """Cara lama (latihan 11-14 sebelum diperbaiki), hanya untuk perbandingan."""
+    def __getitem__(self, model_name):
+        ModelClass = self.registry[model_name]
+        ModelClass.env = self
+        return ModelClass
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class Partner(Model):
+    _name = 'res.partner'
+    _table = 'res_partner'
+    _fields = {
+        'name': Char(string='Name'),
+        'worker_id': Integer(string='Worker'), # Thread yang membuat record ini
+        'score': Integer(string='Score'),
+    }
+
+
+def stress_worker(pool, worker_id, iterations, barrier, errors):
+    """Satu "request": environment sendiri, cursor sendiri, cache sendiri."""
+    conn = pool.getconn()
+    try:
+        env = Environment(conn.cursor(cursor_factory=psycopg2.extras.DictCursor))
+        PartnerModel = env['res.partner']
+        barrier.wait() # Mulai bersamaan agar semua thread benar-benar saling tumpang tindih
+        for i in range(iterations):
+            partner = PartnerModel.create({'name': f'W{worker_id}-{i}', 'worker_id': worker_id, 'score': 0})
+            partner.write({'score': i})
+            found = PartnerModel.search([('worker_id', '=', worker_id)])
+
+            if PartnerModel.env is not env or partner.env is not env:
+                errors.append(f"Worker {worker_id}: model atau record memakai environment lain!")
+            if len(found) != i + 1 or any(p.worker_id != worker_id for p in found):
+                errors.append(f"Worker {worker_id}: hasil search tercampur dengan data worker lain!")
+            if {p.id: p.score for p in found}.get(partner.id) != i:
+                errors.append(f"Worker {worker_id}: nilai hasil write tidak terbaca kembali!")
+        env.cr.close()
+    except Exception as e:
+        errors.append(f"Worker {worker_id}: {type(e).__name__}: {e}")
+    finally:
+        pool.putconn(conn)
+
+
+def run_stress_test(threads=32, iterations=25):
+    """32 thread menjalankan create/search/write secara bersamaan, tanpa boleh ada cross-talk."""
+    pool = Database.get_pool(maxconn=threads)
+    barrier = threading.Barrier(threads)
+    errors = []
+    workers = [
+        threading.Thread(target=stress_worker, args=(pool, worker_id, iterations, barrier, errors))
+        for worker_id in range(1, threads + 1)
+    ]
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration = time.perf_counter() - start
+
+    operations = threads * iterations * 3
+    print(f"HASIL: {threads} thread x {iterations} iterasi = {operations} operasi dalam {duration:.2f} detik.")
+    for error in errors[:10]:
+        print(f"ERROR: {error}")
+    assert not errors, f"Terjadi {len(errors)} cross-talk antar environment!"
+    print("SUCCESS: Tidak ada cross-talk. Setiap thread hanya melihat environment, cursor, dan cache miliknya.")
+    pool.closeall()
+
+
+def run_environment_per_thread_example():
+    """
+    Fungsi untuk menjalankan contoh model terikat per Environment.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    env = Environment(cr)
+    env['res.partner']._init_table()
+    cr.execute("DELETE FROM res_partner")
+    conn.commit()
+
+    # 1. Masalah cara lama: environment kedua menimpa `env` milik environment pertama.
+    print("\n--- 1. Cara Lama: Atribut Class `env` Ditimpa ---")
+    legacy_a = LegacyEnvironment(conn.cursor())
+    legacy_b = LegacyEnvironment(conn.cursor())
+    PartnerA = legacy_a['res.partner']
+    legacy_b['res.partner']
+    print(f"PartnerA.env masih milik environment A? {PartnerA.env is legacy_a}")
+    del Partner.env # Bersihkan kembali class model bersama
+
+    # 2. Cara baru: setiap environment punya model terikatnya sendiri.
+    print("\n--- 2. Cara Baru: Model Terikat per Environment ---")
+    env_a = Environment(conn.cursor())
+    env_b = Environment(conn.cursor())
+    PartnerA = env_a['res.partner']
+    PartnerB = env_b['res.partner']
+    print(f"PartnerA.env milik environment A? {PartnerA.env is env_a}")
+    print(f"PartnerB.env milik environment B? {PartnerB.env is env_b}")
+    print(f"Keduanya tetap turunan model yang sama? {issubclass(PartnerA, Partner) and issubclass(PartnerB, Partner)}")
+    assert PartnerA.env is env_a and PartnerB.env is env_b
+
+    # 3. Stress test dengan 32 thread.
+    print("\n--- 3. Stress Test 32 Thread (create/search/write) ---")
+    run_stress_test()
+
+    cr.close()
+
+if __name__ == "__main__":
+    run_environment_per_thread_example()
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncpg
+import psycopg2
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. ORM asinkron: `await Model.search(...)`, `await Model.create(...)`, `await record.write(...)`,
+#    dibangun di atas driver PostgreSQL asinkron `asyncpg` (lihat Dockerfile).
+# 2. Connection pool asinkron: ribuan request bisa menunggu database bersamaan di SATU thread,
+#    karena saat menunggu jawaban database, event loop mengerjakan request lain.
+# 3. Definisi Field, Registry, dan `_fields` tetap sama seperti latihan 06-14; yang berubah hanya
+#    cara method ORM berbicara dengan database.
+
+DB_SETTINGS = {
+    'database': 'postgres', 'user': 'odoo', 'password': 'odoo', 'host': 'odoo-db', 'port': 5432,
+}
+
+class Database:
+    _pool = None
+
+    @classmethod
+    async def get_pool(cls, max_size=20, **kwargs):
+        if cls._pool is None:
+            try:
+                cls._pool = await asyncpg.create_pool(min_size=1, max_size=max_size, **DB_SETTINGS, **kwargs)
+            except (OSError, asyncpg.PostgresError) as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._pool
+
+    @classmethod
+    async def close_pool(cls):
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def environment(cls):
+        """Meminjam satu koneksi dari pool selama satu "request", lalu mengembalikannya."""
+        pool = await cls.get_pool()
+        async with pool.acquire() as connection:
+            yield Environment(connection)
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Float(Field): pass
+
+class Many2one(Field):
+    def __init__(self, comodel_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+
+# Placeholder parameter berbeda antar driver: asyncpg memakai $1, $2, ... sedangkan psycopg2 memakai %s.
+ASYNCPG_PLACEHOLDER = lambda position: f"${position}"
+PSYCOPG2_PLACEHOLDER = lambda position: "%s"
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+    env = None # Diisi oleh model terikat dari `env['...']`
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _search_query(cls, domain, placeholder=ASYNCPG_PLACEHOLDER):
+        """Mengompilasi domain menjadi (query, parameter). Dipakai bersama oleh jalur async dan thread."""
+        query = f"SELECT id, {', '.join(cls._fields)} FROM {cls._table}"
+        params = []
+        if domain:
+            clauses = []
+            for field, op, value in domain:
+                params.append(value)
+                clauses.append(f"{field} {op} {placeholder(len(params))}")
+            query += " WHERE " + " AND ".join(clauses)
+        return query, params
+
+    @classmethod
+    def _from_row(cls, row):
+        values = dict(row)
+        return cls(cls.env, values.pop('id'), values)
+
+    @classmethod
+    async def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        placeholders = ', '.join(ASYNCPG_PLACEHOLDER(i) for i in range(1, len(field_names) + 1))
+        query = (f"INSERT INTO {cls._table} ({', '.join(field_names)}) VALUES ({placeholders}) "
+                 f"RETURNING id, {', '.join(cls._fields)}")
+        # asyncpg bekerja dalam mode autocommit di luar blok transaksi,
+        # jadi perilakunya sama dengan "commit per operasi" pada latihan sebelumnya.
+        row = await cls.env.cr.fetchrow(query, *[values[name] for name in field_names])
+        return cls._from_row(row)
+
+    @classmethod
+    async def search(cls, domain):
+        query, params = cls._search_query(domain)
+        rows = await cls.env.cr.fetch(query, *params)
+        return [cls._from_row(row) for row in rows]
+
+    @classmethod
+    async def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        query = f"SELECT id, {', '.join(cls._fields)} FROM {cls._table} WHERE id = ANY($1)"
+        results = [cls._from_row(row) for row in await cls.env.cr.fetch(query, record_ids)]
+        if is_single_id: return results[0] if results else None
+        return results
+
+    async def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = {ASYNCPG_PLACEHOLDER(i)}" for i, name in enumerate(field_names, 1))
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = {ASYNCPG_PLACEHOLDER(len(field_names) + 1)}"
+        await self.env.cr.execute(query, *[values[name] for name in field_names], self.id)
+        for name in field_names:
+            setattr(self, name, values[name])
+        return True
+
+    async def unlink(self):
+        await self.env.cr.execute(f"DELETE FROM {self._table} WHERE id = $1", self.id)
+        return True
+
+    @classmethod
+    async def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+            elif isinstance(field, Many2one):
+                comodel_table = field.comodel_name.replace('.', '_')
+                field_definitions.append(f"{name} INTEGER REFERENCES {comodel_table}(id)")
+
+        await cls.env.cr.execute(f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})")
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, connection):
+        # Koneksi asyncpg tidak punya cursor terpisah; koneksi itu sendiri yang berperan sebagai `cr`.
+        self.cr = connection
+        self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+# Definisi model SAMA PERSIS dengan latihan sebelumnya, tidak ada yang perlu diubah untuk async.
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        'category_id': Many2one('product.category', string='Kategori Produk'),
+    }
+
+
+BENCH_SCHEMA = 'bench_async'
+
+async def run_async_benchmark(requests=1000, threads=50):
+    """Membandingkan 1.000 search bersamaan: asyncio (1 thread) vs thread pool (psycopg2)."""
+    domain_for = lambda i: [('category_id', '=', i % 20 + 1), ('price', '>', 100)]
+
+    async def one_request(i):
+        async with Database.environment() as env:
+            return len(await env['product.product'].search(domain_for(i)))
+
+    start = time.perf_counter()
+    async_results = await asyncio.gather(*(one_request(i) for i in range(requests)))
+    async_duration = time.perf_counter() - start
+
+    # Jalur lama: satu thread per request yang sedang berjalan, masing-masing dengan koneksi psycopg2.
+    local = threading.local()
+    connections = []
+    def threaded_request(i):
+        if not hasattr(local, 'cr'):
+            conn = psycopg2.connect(dbname=DB_SETTINGS['database'], user=DB_SETTINGS['user'],
+                                    password=DB_SETTINGS['password'], host=DB_SETTINGS['host'],
+                                    port=DB_SETTINGS['port'], options=f"-c search_path={BENCH_SCHEMA}")
+            conn.autocommit = True
+            connections.append(conn)
+            local.cr = conn.cursor()
+        query, params = Product._search_query(domain_for(i), PSYCOPG2_PLACEHOLDER)
+        local.cr.execute(query, params)
+        colnames = [desc[0] for desc in local.cr.description]
+        return len([Product._from_row(zip(colnames, row)) for row in local.cr.fetchall()])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        threaded_results = list(executor.map(threaded_request, range(requests)))
+    threaded_duration = time.perf_counter() - start
+    for conn in connections:
+        conn.close()
+
+    assert async_results == threaded_results, "Hasil jalur async dan thread harus sama!"
+    pool = await Database.get_pool()
+    print(f"\nHASIL {requests} search bersamaan:")
+    print(f"  - asyncio (1 thread, pool {pool.get_max_size()} koneksi): {async_duration * 1000:8.1f} ms "
+          f"({requests / async_duration:,.0f} request/detik)")
+    print(f"  - Thread pool ({threads} thread, {len(connections)} koneksi): {threaded_duration * 1000:8.1f} ms "
+          f"({requests / threaded_duration:,.0f} request/detik)")
+    print("CATATAN: Di database lokal waktunya bisa mirip, tetapi jalur async hanya memakai 1 thread dan")
+    print("         lebih sedikit koneksi. Semakin besar latensi jaringan, semakin besar keunggulannya.")
+
+
+async def run_async_orm_example():
+    """
+    Fungsi untuk menjalankan contoh ORM asinkron.
+    """
+    # Gunakan schema terpisah agar data uji tidak bercampur dengan tabel latihan lain.
+    setup = await asyncpg.connect(**DB_SETTINGS)
+    await setup.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+    await setup.close()
+    await Database.get_pool(server_settings={'search_path': BENCH_SCHEMA})
+
+    async with Database.environment() as env:
+        await env['product.category']._init_table()
+        await env['product.product']._init_table()
+
+        # 1. CRUD dengan await.
+        print("\n--- 1. CRUD Asinkron ---")
+        electronics = await env['product.category'].create({'name': 'Electronics'})
+        laptop = await env['product.product'].create({'name': 'Laptop Pro 15', 'price': 2500.5, 'category_id': electronics.id})
+        await env['product.product'].create({'name': 'Mouse Wireless', 'price': 150.0, 'category_id': electronics.id})
+        print(f"SUCCESS: Produk '{laptop.name}' dibuat dengan ID: {laptop.id}")
+
+        await laptop.write({'price': 2300.0})
+        products = await env['product.product'].search([('category_id', '=', electronics.id)])
+        for product in products:
+            print(f"  - Nama: {product.name}, Harga: {product.price}")
+
+        # 2. Data untuk benchmark: 20 kategori x 500 produk.
+        print("\n--- 2. Menyiapkan Data Benchmark ---")
+        await env.cr.execute("INSERT INTO product_category (name) SELECT 'Kategori ' || i FROM generate_series(2, 20) i")
+        await env.cr.execute("""
+            INSERT INTO product_product (name, price, category_id)
+            SELECT 'Produk ' || i, i % 1000, (i % 20) + 1 FROM generate_series(1, 10000) i
+        """)
+        await env.cr.execute("CREATE INDEX ON product_product (category_id)")
+        print("INFO: 10.000 produk siap.")
+
+    print("\n--- 3. Benchmark 1.000 Search Bersamaan ---")
+    await run_async_benchmark()
+
+    await Database.close_pool()
+    cleanup = await asyncpg.connect(**DB_SETTINGS)
+    await cleanup.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    await cleanup.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_async_orm_example())
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. `with env.batch():` di dalam blok ini, `search` dan `browse` TIDAK langsung ke database.
+#    Keduanya mengembalikan `BatchResult` (hasil tertunda) dan query-nya dimasukkan ke antrean.
+# 2. Saat blok selesai, semua query di antrean dikirim SEKALIGUS dalam satu round trip. Setiap query
+#    dibungkus `json_agg(...)` menjadi satu kolom dari satu `SELECT`, sehingga sepuluh read cukup
+#    membayar latensi jaringan satu kali. (psycopg2 belum mendukung pipeline mode libpq, dan
+#    multi-statement biasa hanya mengembalikan hasil statement terakhir.)
+# 3. Di luar `env.batch()`, `search` dan `browse` berperilaku seperti biasa.
+# 4. Lewat JSON, DOUBLE 10.0 kembali sebagai int 10 (dan NUMERIC/DATE akan menjadi float/str), jadi
+#    setiap tipe field mengembalikan nilainya lewat `from_json`. Tipe field baru yang tidak punya
+#    `from_json` ditolak di `QueryBatch.add`, agar `env.batch()` tidak diam-diam mengubah nilai.
+
+class Database:
+    _connection = None
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+# `from_json(value)`: nilai dari `json_agg` -> nilai Python yang sama dengan hasil fetch biasa.
+# Hanya tipe field yang mendefinisikannya yang bisa dibaca lewat `env.batch()`.
+
+class Char(Field):
+    def from_json(self, value):
+        return value
+
+class Float(Field):
+    def from_json(self, value):
+        return None if value is None else float(value)
+
+class Many2one(Field):
+    def __init__(self, comodel_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+
+    def from_json(self, value):
+        return value
+
+class BatchResult:
+    """Hasil `search`/`browse` yang masih tertunda sampai blok `env.batch()` selesai."""
+    def __init__(self, model, is_single_id=False):
+        self._model = model
+        self._is_single_id = is_single_id
+        self._records = None
+        self._resolved = False
+
+    def _resolve(self, rows):
+        records = [self._model._from_json_row(row) for row in rows]
+        if self._is_single_id:
+            records = records[0] if records else None
+        self._records = records
+        self._resolved = True
+
+    @property
+    def records(self):
+        if not self._resolved:
+            raise RuntimeError("Hasil batch baru tersedia setelah blok `with env.batch()` selesai.")
+        return self._records
+
+    def __getattr__(self, name):
+        # Untuk `browse(id)` tunggal: `result.name` langsung membaca field record-nya.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.records, name)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+class QueryBatch:
+    """Antrean read milik satu environment, dikirim bersama dalam satu round trip."""
+    def __init__(self, cr):
+        self.cr = cr
+        self._queue = []
+
+    def add(self, model, query, params, order, is_single_id=False):
+        for field in model._fields.values():
+            if not hasattr(type(field), 'from_json'):
+                raise TypeError(f"Field {type(field).__name__} di '{model._name}' tidak bisa dibaca lewat env.batch().")
+        result = BatchResult(model, is_single_id)
+        self._queue.append((query, params, order, result))
+        return result
+
+    def flush(self):
+        if not self._queue:
+            return
+        # Setiap query menjadi satu kolom JSON: (SELECT json_agg(q ORDER BY ...) FROM (<query>) q).
+        # Urutan ditulis di dalam agregat, karena ORDER BY di subquery tidak dijamin bertahan.
+        # Parameter digabung berurutan, sesuai urutan placeholder di query gabungan.
+        columns, params = [], []
+        for query, query_params, order, result in self._queue:
+            columns.append(f"(SELECT COALESCE(json_agg(q ORDER BY q.{order}), '[]'::json) FROM ({query}) q)")
+            params.extend(query_params)
+        self.cr.execute("SELECT " + ", ".join(columns), params)
+        row = self.cr.fetchone()
+        for (query, query_params, order, result), rows in zip(self._queue, row):
+            result._resolve(rows)
+        self._queue = []
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _from_row(cls, row):
+        values = dict(row)
+        return cls(cls.env, values.pop('id'), values)
+
+    @classmethod
+    def _from_json_row(cls, row):
+        values = {name: cls._fields[name].from_json(value) for name, value in row.items() if name != 'id'}
+        return cls(cls.env, row['id'], values)
+
+    @classmethod
+    def _fetch(cls, query, params, is_single_id=False, order='id'):
+        """Menjalankan read sekarang juga, atau menundanya jika sedang di dalam `env.batch()`."""
+        if cls.env.pending_batch is not None:
+            return cls.env.pending_batch.add(cls, query, params, order, is_single_id)
+
+        cls.env.cr.execute(f"{query} ORDER BY {order}", params)
+        results = [cls._from_row(row) for row in cls.env.cr.fetchall()]
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING *"
+
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        record = cls._from_row(cls.env.cr.fetchone())
+        conn.commit()
+        return record
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id, {', '.join(cls._fields)} FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        return cls._fetch(query, params)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        query = f"SELECT id, {', '.join(cls._fields)} FROM {cls._table} WHERE id = ANY(%s)"
+        return cls._fetch(query, [record_ids], is_single_id)
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+            elif isinstance(field, Many2one):
+                comodel_table = field.comodel_name.replace('.', '_')
+                field_definitions.append(f"{name} INTEGER REFERENCES {comodel_table}(id)")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        cls.env.cr.execute(query)
+        cls.env.cr.connection.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self.pending_batch = None # QueryBatch yang sedang aktif, jika berada di dalam `env.batch()`
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Mengumpulkan read di dalam blok, lalu mengirim semuanya dalam satu round trip saat keluar."""
+        if self.pending_batch is not None:
+            # Batch bersarang ikut ke batch terluar.
+            yield self.pending_batch
+            return
+        self.pending_batch = QueryBatch(self.cr)
+        try:
+            yield self.pending_batch
+            batch, self.pending_batch = self.pending_batch, None
+            batch.flush()
+        finally:
+            self.pending_batch = None
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        'category_id': Many2one('product.category', string='Kategori Produk'),
+    }
+
+@registry.register
+class Course(Model):
+    _name = 'res.course'
+    _table = 'res_course'
+    _fields = {
+        'name': Char(string='Course Name'),
+    }
+
+
+BENCH_SCHEMA = 'bench_batch'
+
+class LatencyCursor(psycopg2.extras.DictCursor):
+    """Cursor yang menambahkan jeda per query, untuk mensimulasikan database di server lain."""
+    rtt = 0.002 # 2 ms per round trip
+    round_trips = 0
+
+    def execute(self, query, vars=None):
+        LatencyCursor.round_trips += 1
+        time.sleep(self.rtt)
+        return super().execute(query, vars)
+
+
+def load_page(env):
+    """Sepuluh read independen yang biasa dibutuhkan satu halaman."""
+    return [
+        env['product.category'].search([]),
+        env['res.course'].search([]),
+        env['product.product'].search([('price', '>', 900)]),
+        env['product.product'].search([('category_id', '=', 1)]),
+        env['product.product'].search([('category_id', '=', 2)]),
+        env['product.product'].search([('category_id', '=', 3)]),
+        env['product.product'].search([('name', 'like', 'Produk 1%'), ('price', '<', 50)]),
+        env['product.product'].browse([1, 2, 3, 4, 5]),
+        env['product.category'].browse(1),
+        env['res.course'].browse([1, 2]),
+    ]
+
+
+def run_batch_benchmark(env, repeats=50):
+    """Membandingkan sepuluh read berurutan vs satu batch, pada link dengan RTT 2 ms."""
+    LatencyCursor.round_trips = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        sequential = load_page(env)
+    sequential_duration = (time.perf_counter() - start) / repeats
+    sequential_trips = LatencyCursor.round_trips / repeats
+
+    LatencyCursor.round_trips = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        with env.batch():
+            batched = load_page(env)
+    batched_duration = (time.perf_counter() - start) / repeats
+    batched_trips = LatencyCursor.round_trips / repeats
+
+    # Hasil kedua cara harus identik: urutan, nilai, dan tipe nilainya (mis. harga 10.0 tetap float).
+    unwrap = lambda result: result.records if isinstance(result, BatchResult) else result
+    as_values = lambda record: [(name, value, type(value)) for name, value in vars(record).items() if name != 'env']
+    as_rows = lambda result: [as_values(r) for r in result] if isinstance(result, list) else as_values(result)
+    batched = [unwrap(result) for result in batched]
+    assert [as_rows(r) for r in sequential] == [as_rows(r) for r in batched], "Hasil batch berbeda dengan hasil biasa!"
+
+    print(f"HASIL (RTT simulasi {LatencyCursor.rtt * 1000:.0f} ms, rata-rata {repeats} kali muat halaman):")
+    print(f"  - Berurutan  : {sequential_duration * 1000:6.2f} ms, {sequential_trips:.0f} round trip")
+    print(f"  - env.batch(): {batched_duration * 1000:6.2f} ms, {batched_trips:.0f} round trip")
+    print(f"  - Lebih cepat: {sequential_duration / batched_duration:.1f}x")
+
+
+def run_query_batch_example():
+    """
+    Fungsi untuk menjalankan contoh batch query (satu round trip untuk banyak read).
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+
+    env = Environment(conn.cursor(cursor_factory=psycopg2.extras.DictCursor))
+    env['product.category']._init_table()
+    env['product.product']._init_table()
+    env['res.course']._init_table()
+
+    # 1. Data contoh.
+    print("\n--- 1. Menyiapkan Data ---")
+    env.cr.execute("INSERT INTO product_category (name) SELECT 'Kategori ' || i FROM generate_series(1, 20) i")
+    env.cr.execute("""
+        INSERT INTO product_product (name, price, category_id)
+        SELECT 'Produk ' || i, i % 1000, (i % 20) + 1 FROM generate_series(1, 5000) i
+    """)
+    env.cr.execute("INSERT INTO res_course (name) VALUES ('Odoo Dasar'), ('Odoo ORM'), ('PostgreSQL')")
+    env.cr.execute("CREATE INDEX ON product_product (category_id)")
+    conn.commit()
+    print("INFO: 20 kategori, 5.000 produk, dan 3 course siap.")
+
+    # 2. Pemakaian env.batch(): hasil baru bisa dibaca setelah blok selesai.
+    print("\n--- 2. Pemakaian env.batch() ---")
+    with env.batch():
+        categories = env['product.category'].search([])
+        courses = env['res.course'].search([])
+        first_category = env['product.category'].browse(1)
+        try:
+            len(categories)
+        except RuntimeError as e:
+            print(f"INFO: Di dalam blok -> {e}")
+    print(f"SUCCESS: {len(categories)} kategori, {len(courses)} course, kategori #1 = '{first_category.name}'")
+    for course in courses:
+        print(f"  - Course: {course.name}")
+
+    # 3. Benchmark dengan latensi jaringan simulasi.
+    print("\n--- 3. Benchmark Sepuluh Read: Berurutan vs env.batch() ---")
+    slow_env = Environment(conn.cursor(cursor_factory=LatencyCursor))
+    run_batch_benchmark(slow_env)
+
+    conn.rollback()
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_query_batch_example()
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+import itertools
+import random
+import re
+import time
+from collections import OrderedDict
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Cache prepared statement per koneksi: setiap template SQL (misalnya query `browse`) di-`PREPARE`
+#    sekali di server, lalu panggilan berikutnya cukup `EXECUTE nama (parameter)`. Parsing dan
+#    planning dilakukan sekali per template, bukan sekali per panggilan.
+# 2. Eviction LRU: jumlah statement dibatasi `max_size`; statement yang paling lama tidak dipakai
+#    di-`DEALLOCATE` dari server.
+# 3. Persiapan ulang otomatis: jika koneksi tersambung ulang (PID backend berubah) atau server
+#    kehilangan statement-nya (misalnya `DEALLOCATE ALL`), statement disiapkan ulang tanpa error.
+
+class Database:
+    _connection = None
+    _statement_cache = None
+
+    @classmethod
+    def get_connection(cls):
+        # Koneksi yang sudah ditutup dibuka kembali (reconnect).
+        if cls._connection is None or cls._connection.closed:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+    @classmethod
+    def get_statement_cache(cls, max_size=128):
+        """Cache prepared statement milik koneksi `Database`, tetap dipakai setelah reconnect."""
+        if cls._statement_cache is None:
+            cls._statement_cache = PreparedStatementCache(max_size)
+        return cls._statement_cache
+
+class PreparedStatementCache:
+    """Memetakan template SQL ke nama prepared statement di server, dengan eviction LRU."""
+    _names = itertools.count(1) # Dipakai bersama agar nama statement tidak bentrok antar cache
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self._statements = OrderedDict() # template SQL -> (nama statement, jumlah parameter)
+        self._backend_pid = None
+        self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def _to_server_placeholders(template):
+        # PREPARE memakai placeholder $1, $2, ... bukan %s milik psycopg2.
+        position = iter(range(1, template.count('%s') + 1))
+        return re.sub(r'%s', lambda match: f"${next(position)}", template), template.count('%s')
+
+    def _forget_all(self):
+        self._statements.clear()
+
+    def _prepare(self, cr, template):
+        statement = self._statements.get(template)
+        if statement is not None:
+            self._statements.move_to_end(template)
+            self.hits += 1
+            return statement
+
+        self.misses += 1
+        server_sql, param_count = self._to_server_placeholders(template)
+        statement = (f"orm_stmt_{next(self._names)}", param_count)
+        cr.execute(f"PREPARE {statement[0]} AS {server_sql}")
+        self._statements[template] = statement
+
+        if len(self._statements) > self.max_size:
+            evicted_template, (evicted_name, _) = self._statements.popitem(last=False)
+            cr.execute(f"DEALLOCATE {evicted_name}")
+            self.evictions += 1
+        return statement
+
+    def execute(self, cr, template, params):
+        conn = cr.connection
+        backend_pid = conn.get_backend_pid()
+        if backend_pid != self._backend_pid:
+            # Koneksi baru = sesi server baru; semua statement lama sudah hilang di sana.
+            if self._statements:
+                print(f"INFO: Koneksi baru terdeteksi (PID {backend_pid}), {len(self._statements)} statement akan disiapkan ulang.")
+            self._forget_all()
+            self._backend_pid = backend_pid
+
+        was_idle = conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        name, param_count = self._prepare(cr, template)
+        placeholders = f" ({', '.join(['%s'] * param_count)})" if param_count else ""
+        try:
+            cr.execute(f"EXECUTE {name}{placeholders}", params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            # Server kehilangan statement. Aman diulang hanya jika belum ada pekerjaan lain
+            # di transaksi ini, karena rollback akan membatalkannya.
+            if not was_idle:
+                raise
+            conn.rollback()
+            print("INFO: Prepared statement hilang di server, menyiapkan ulang.")
+            self._forget_all()
+            name, param_count = self._prepare(cr, template)
+            cr.execute(f"EXECUTE {name}{placeholders}", params)
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Float(Field): pass
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _execute(cls, query, params):
+        """Semua query ORM lewat sini: memakai prepared statement jika environment punya cache."""
+        if cls.env.statements is not None:
+            cls.env.statements.execute(cls.env.cr, query, params)
+        else:
+            cls.env.cr.execute(query, params)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+
+        conn = cls.env.cr.connection
+        cls._execute(query, [values[name] for name in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+        return cls(cls.env, new_id, values)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = %s"
+
+        conn = self.env.cr.connection
+        self._execute(query, [values[name] for name in field_names] + [self.id])
+        conn.commit()
+
+        for name in field_names:
+            setattr(self, name, values[name])
+        return True
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls._execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        # Satu ID memakai `id = %s` agar plan generik prepared statement tetap memakai index primary key.
+        # Banyak ID memakai `id = ANY(%s)` dengan list, bukan `id IN %s` dengan tuple: jumlah ID boleh
+        # berbeda-beda tetapi template SQL-nya tetap satu, sehingga cukup satu prepared statement.
+        if is_single_id:
+            cls._execute(f"SELECT * FROM {cls._table} WHERE id = %s", [ids])
+        else:
+            cls._execute(f"SELECT * FROM {cls._table} WHERE id = ANY(%s)", [record_ids])
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        cls.env.cr.execute(query)
+        cls.env.cr.connection.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor, statements=None):
+        self.cr = cursor
+        self.registry = registry
+        self.statements = statements # PreparedStatementCache, atau None untuk SQL teks biasa
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'default_code': Char(string='Kode Internal'),
+        'price': Float(string='Harga'),
+    }
+
+
+BENCH_SCHEMA = 'bench_prepared'
+
+def run_browse_benchmark(conn, calls=100000, product_count=1000):
+    """100.000 `browse(id)`: SQL teks biasa vs prepared statement."""
+    ids = [random.randint(1, product_count) for _ in range(calls)]
+    results = {}
+    for label, statements in (("SQL teks biasa", None), ("Prepared statement", PreparedStatementCache())):
+        env = Environment(conn.cursor(), statements)
+        ProductModel = env['product.product']
+        start = time.perf_counter()
+        for record_id in ids:
+            ProductModel.browse(record_id)
+        results[label] = time.perf_counter() - start
+        conn.rollback()
+        if statements is not None:
+            env.cr.execute("DEALLOCATE ALL")
+        env.cr.close()
+
+    print(f"HASIL {calls:,} kali browse(id):")
+    for label, duration in results.items():
+        print(f"  - {label:<18}: {duration:6.2f} detik ({duration / calls * 1e6:5.1f} us per browse)")
+    baseline, prepared = results.values()
+    print(f"  - Lebih cepat: {baseline / prepared:.2f}x")
+
+
+def run_prepared_statements_example():
+    """
+    Fungsi untuk menjalankan contoh cache prepared statement.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+    conn.commit()
+    setup_options = f"SET search_path TO {BENCH_SCHEMA}"
+    cr.execute(setup_options)
+    conn.commit() # SET di transaksi yang di-rollback ikut dibatalkan, jadi langsung di-commit
+
+    statements = Database.get_statement_cache(max_size=2)
+    env = Environment(conn.cursor(), statements)
+    ProductModel = env['product.product']
+    ProductModel._init_table()
+
+    # 1. Template yang sama hanya di-PREPARE sekali.
+    print("\n--- 1. Cache Prepared Statement ---")
+    laptop = ProductModel.create({'name': 'Laptop Pro 15', 'default_code': 'LAP-15', 'price': 2500.0})
+    mouse = ProductModel.create({'name': 'Mouse Wireless', 'default_code': 'MOU-01', 'price': 150.0})
+    for record_id in (laptop.id, mouse.id, laptop.id):
+        ProductModel.browse(record_id)
+    cr.execute("SELECT name, statement FROM pg_prepared_statements ORDER BY name")
+    for name, statement in cr.fetchall():
+        print(f"  - {name}: {statement}")
+    print(f"INFO: hit={statements.hits}, miss={statements.misses}, eviction={statements.evictions}")
+
+    # 2. max_size=2: template ketiga membuat statement yang paling lama tidak dipakai di-DEALLOCATE.
+    print("\n--- 2. Eviction LRU (max_size=2) ---")
+    laptop.write({'price': 2300.0})
+    cr.execute("SELECT count(*) FROM pg_prepared_statements")
+    print(f"INFO: Statement di server: {cr.fetchone()[0]}, eviction={statements.evictions}")
+
+    # 3. Server kehilangan statement (misalnya connection pooler menjalankan DEALLOCATE ALL).
+    print("\n--- 3. Statement Hilang di Server ---")
+    cr.execute("DEALLOCATE ALL")
+    conn.commit()
+    print(f"SUCCESS: browse tetap berhasil -> '{ProductModel.browse(laptop.id).name}', harga {ProductModel.browse(laptop.id).price}")
+
+    # 4. Reconnect: koneksi ditutup lalu dibuka lagi, cache yang sama menyiapkan ulang statement-nya.
+    print("\n--- 4. Reconnect ---")
+    conn.close()
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(setup_options)
+    conn.commit()
+    env = Environment(conn.cursor(), Database.get_statement_cache())
+    print(f"SUCCESS: browse setelah reconnect -> '{env['product.product'].browse(mouse.id).name}'")
+
+    # 5. Micro-benchmark.
+    print("\n--- 5. Benchmark 100.000 browse(id) ---")
+    cr.execute("""
+        INSERT INTO product_product (name, default_code, price)
+        SELECT 'Produk ' || i, 'P-' || i, i % 1000 FROM generate_series(3, 1000) i
+    """)
+    conn.commit()
+    run_browse_benchmark(conn)
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_prepared_statements_example()
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Unit of work: `with env.transaction():` memegang kendali commit/rollback. Jika blok selesai
+#    normal, semua perubahan di-commit SEKALI; jika terjadi exception, semuanya di-rollback.
+# 2. `create`, `write`, dan `unlink` TIDAK PERNAH commit sendiri lagi. Di luar `env.transaction()`,
+#    perubahan tetap tertunda sampai ada yang melakukan commit.
+# 3. Transaksi bersarang memakai SAVEPOINT: kegagalan di blok dalam hanya membatalkan blok itu,
+#    sementara transaksi luar tetap bisa dilanjutkan.
+# 4. Rollback juga mengembalikan nilai atribut record yang di-`write` di dalam blok yang dibatalkan,
+#    sehingga objek Python tidak menyimpan nilai yang tidak pernah ada di database.
+
+class Database:
+    _connection = None
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Selection(Field):
+    def __init__(self, selection, string=""):
+        super().__init__(string)
+        self.selection = selection
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        return cls(cls.env, cls.env.cr.fetchone()[0], values)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = %s"
+        self.env.cr.execute(query, [values[name] for name in field_names] + [self.id])
+
+        self.env._remember(self, field_names)
+        for name in field_names:
+            setattr(self, name, values[name])
+        return True
+
+    def unlink(self):
+        self.env.cr.execute(f"DELETE FROM {self._table} WHERE id = %s", (self.id,))
+        return True
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        cls.env.cr.execute(f"SELECT * FROM {cls._table} WHERE id IN %s ORDER BY id", (tuple(record_ids),))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, (Char, Selection)):
+                field_definitions.append(f"{name} VARCHAR(255)")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        with cls.env.transaction():
+            cls.env.cr.execute(query)
+        print(f"Table '{cls._table}' is ready.")
+
+_MISSING = object() # Penanda atribut yang belum ada sebelum `write`
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._transaction_depth = 0 # 0 = tidak ada transaksi, 1 = transaksi luar, >1 = savepoint
+        self._undo_logs = [] # Satu daftar (record, field, nilai lama) per blok transaksi yang terbuka
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def _remember(self, record, field_names):
+        """Mencatat nilai atribut sebelum `write`, agar bisa dikembalikan saat rollback."""
+        if self._undo_logs:
+            self._undo_logs[-1].extend((record, name, record.__dict__.get(name, _MISSING)) for name in field_names)
+
+    @staticmethod
+    def _undo(undo_log):
+        for record, name, value in reversed(undo_log):
+            if value is _MISSING:
+                record.__dict__.pop(name, None)
+            else:
+                setattr(record, name, value)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commit sekali di akhir blok terluar; blok bersarang menjadi SAVEPOINT."""
+        conn = self.cr.connection
+        if self._transaction_depth == 0:
+            self._transaction_depth = 1
+            self._undo_logs.append([])
+            try:
+                yield self
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                self._undo(self._undo_logs[-1])
+                raise
+            finally:
+                self._undo_logs.pop()
+                self._transaction_depth = 0
+            return
+
+        savepoint = f"sp_{self._transaction_depth}"
+        self.cr.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        self._undo_logs.append([])
+        try:
+            yield self
+            self.cr.execute(f"RELEASE SAVEPOINT {savepoint}")
+            # Perubahan blok dalam kini milik blok luar: ikut dibatalkan jika blok luar gagal.
+            self._undo_logs[-2].extend(self._undo_logs[-1])
+        except BaseException:
+            self.cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            self._undo(self._undo_logs[-1])
+            raise
+        finally:
+            self._undo_logs.pop()
+            self._transaction_depth -= 1
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class StockPicking(Model):
+    _name = 'stock.picking'
+    _table = 'stock_picking'
+    _fields = {
+        'name': Char(string='Reference'),
+        'origin': Char(string='Source Document'),
+        'partner_name': Char(string='Delivery Address'),
+    }
+
+
+@registry.register
+class SaleOrder(Model):
+    _name = 'sale.order'
+    _table = 'sale_order'
+    _fields = {
+        'name': Char(string='Order Reference'),
+        'partner_name': Char(string='Customer'),
+        'state': Selection([
+            ('draft', 'Quotation'),
+            ('sent', 'Quotation Sent'),
+            ('sale', 'Sales Order'),
+            ('done', 'Locked'),
+            ('cancel', 'Cancelled'),
+        ], string='Status'),
+    }
+
+    # ================== BUSINESS METHODS ==================
+
+    def action_confirm(self):
+        """
+        Mengubah state 'draft' -> 'sale' lalu membuat dokumen pengiriman.
+        Kedua langkah berada dalam satu transaksi: jika pembuatan pengiriman gagal,
+        perubahan state ikut dibatalkan.
+        """
+        if self.state != 'draft':
+            print(f"WARNING: Order '{self.name}' berstatus '{self.state}', bukan 'draft'.")
+            return False
+        with self.env.transaction():
+            self.write({'state': 'sale'})
+            self._create_picking()
+        return True
+
+    def _create_picking(self):
+        if not self.partner_name:
+            raise ValueError(f"Order '{self.name}' tidak punya pelanggan, pengiriman tidak bisa dibuat.")
+        return self.env['stock.picking'].create({
+            'name': f"WH/OUT/{self.id:05d}", 'origin': self.name, 'partner_name': self.partner_name,
+        })
+
+
+BENCH_SCHEMA = 'bench_uow'
+
+def run_transaction_benchmark(env, orders=10000):
+    """10.000 sale order: commit per operasi (cara lama) vs satu transaksi."""
+    SaleOrderModel = env['sale.order']
+
+    start = time.perf_counter()
+    for i in range(orders):
+        with env.transaction():
+            SaleOrderModel.create({'name': f'SO/A/{i:05d}', 'partner_name': 'Azure Interior', 'state': 'draft'})
+    per_operation = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with env.transaction():
+        for i in range(orders):
+            SaleOrderModel.create({'name': f'SO/B/{i:05d}', 'partner_name': 'Azure Interior', 'state': 'draft'})
+    single_transaction = time.perf_counter() - start
+
+    print(f"HASIL membuat {orders:,} sale order:")
+    print(f"  - Commit per operasi: {per_operation:6.2f} detik ({orders / per_operation:8,.0f} order/detik)")
+    print(f"  - Satu transaksi    : {single_transaction:6.2f} detik ({orders / single_transaction:8,.0f} order/detik)")
+    print(f"  - Lebih cepat: {per_operation / single_transaction:.1f}x")
+
+
+def run_unit_of_work_example():
+    """
+    Fungsi untuk menjalankan contoh unit of work (env.transaction()).
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(cr)
+    env['stock.picking']._init_table()
+    env['sale.order']._init_table()
+    SaleOrderModel = env['sale.order']
+
+    # 1. action_confirm yang berhasil: state dan pengiriman di-commit bersama.
+    print("\n--- 1. action_confirm Berhasil ---")
+    with env.transaction():
+        so_ok = SaleOrderModel.create({'name': 'SO/2025/001', 'partner_name': 'Deco Addict', 'state': 'draft'})
+        so_fail = SaleOrderModel.create({'name': 'SO/2025/002', 'partner_name': None, 'state': 'draft'})
+    so_ok.action_confirm()
+    print(f"SUCCESS: '{so_ok.name}' -> {SaleOrderModel.browse(so_ok.id).state}, "
+          f"pengiriman: {len(env['stock.picking'].search([('origin', '=', so_ok.name)]))}")
+
+    # 2. action_confirm yang gagal di tengah jalan: write state ikut di-rollback.
+    print("\n--- 2. action_confirm Gagal (Atomik) ---")
+    try:
+        so_fail.action_confirm()
+    except ValueError as e:
+        print(f"ERROR: {e}")
+    print(f"INFO: State di database tetap '{SaleOrderModel.browse(so_fail.id).state}', "
+          f"pengiriman: {len(env['stock.picking'].search([('origin', '=', so_fail.name)]))}")
+    assert so_fail.state == SaleOrderModel.browse(so_fail.id).state == 'draft', "State di memori tidak ikut di-rollback!"
+    print(f"INFO: State di objek Python juga kembali ke '{so_fail.state}'")
+
+    # 3. Transaksi bersarang: setiap order dikonfirmasi di SAVEPOINT sendiri.
+    print("\n--- 3. Konfirmasi Massal dengan SAVEPOINT ---")
+    with env.transaction():
+        orders = [
+            SaleOrderModel.create({'name': f'SO/2025/1{i:02d}', 'partner_name': None if i == 2 else 'Gemini Furniture', 'state': 'draft'})
+            for i in range(1, 5)
+        ]
+        for order in orders:
+            try:
+                order.action_confirm()
+            except ValueError as e:
+                print(f"WARNING: Dilewati -> {e}")
+    for order, stored in zip(orders, SaleOrderModel.browse([order.id for order in orders])):
+        assert order.state == stored.state, "State di memori berbeda dengan database!"
+        print(f"  - {stored.name}: {stored.state}")
+
+    # 4. Benchmark.
+    print("\n--- 4. Benchmark 10.000 Sale Order ---")
+    run_transaction_benchmark(env)
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_unit_of_work_example()
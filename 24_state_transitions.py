@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. State machine pada field Selection: transisi dideklarasikan di class model, misalnya
+#    `action_confirm = Transition('state', 'draft', 'sale')`, dan divalidasi terhadap pilihan Selection.
+# 2. Transisi berbasis himpunan (set-based): satu transisi untuk 20.000 record adalah SATU statement
+#    `UPDATE ... WHERE id = ANY(%s) AND state = ANY(%s) RETURNING id`. Pengecekan state dilakukan
+#    oleh database (guard di klausa WHERE), bukan dengan membaca `self.state` satu per satu di Python.
+# 3. Hasil transisi melaporkan record mana yang berpindah state dan mana yang dilewati.
+# 4. `env.transaction()` dari latihan sebelumnya tetap memegang commit/rollback.
+
+class Database:
+    _connection = None
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Selection(Field):
+    def __init__(self, selection, string=""):
+        super().__init__(string)
+        self.selection = selection
+
+class TransitionResult:
+    """Laporan satu transisi: ID yang berpindah state dan ID yang dilewati karena state-nya tidak cocok."""
+    def __init__(self, transitioned, skipped):
+        self.transitioned = transitioned
+        self.skipped = skipped
+
+    def __repr__(self):
+        return f"TransitionResult(transitioned={len(self.transitioned)}, skipped={len(self.skipped)})"
+
+class Transition:
+    """
+    Deklarasi transisi state, dipakai sebagai atribut class model:
+
+        action_confirm = Transition('state', ['draft', 'sent'], 'sale')
+
+    Dipanggil dari model (`SaleOrder.action_confirm(ids_atau_records)`) untuk banyak record sekaligus,
+    atau dari record (`order.action_confirm()`) untuk satu record. Keduanya memakai statement yang sama.
+    """
+    def __init__(self, field_name, sources, target):
+        self.field_name = field_name
+        self.sources = [sources] if isinstance(sources, str) else list(sources)
+        self.target = target
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        field = (owner._fields or {}).get(self.field_name)
+        if not isinstance(field, Selection):
+            raise TypeError(f"Transisi '{name}' membutuhkan field Selection '{self.field_name}' di model '{owner._name}'.")
+        allowed = {value for value, label in field.selection}
+        unknown = [state for state in self.sources + [self.target] if state not in allowed]
+        if unknown:
+            raise ValueError(f"Transisi '{name}': state {unknown} tidak ada di pilihan field '{self.field_name}'.")
+
+    def __get__(self, record, model):
+        if record is None:
+            return lambda records: self.apply(model, records)
+        return lambda: self.apply(model, [record])
+
+    def apply(self, model, records):
+        records = [records] if isinstance(records, (int, Model)) else records
+        ids = [record.id if isinstance(record, Model) else record for record in records]
+        if not ids:
+            return TransitionResult([], [])
+
+        query = (f"UPDATE {model._table} SET {self.field_name} = %s "
+                 f"WHERE id = ANY(%s) AND {self.field_name} = ANY(%s) RETURNING id")
+        with model.env.transaction():
+            model.env.cr.execute(query, (self.target, ids, self.sources))
+            moved = {row[0] for row in model.env.cr.fetchall()}
+
+        # Sinkronkan nilai di instance Python yang ikut dikirim.
+        for record in records:
+            if isinstance(record, Model) and record.id in moved:
+                setattr(record, self.field_name, self.target)
+        return TransitionResult([i for i in ids if i in moved], [i for i in ids if i not in moved])
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        return cls(cls.env, cls.env.cr.fetchone()[0], values)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = %s"
+        self.env.cr.execute(query, [values[name] for name in field_names] + [self.id])
+
+        for name in field_names:
+            setattr(self, name, values[name])
+        return True
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query + " ORDER BY id", params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        cls.env.cr.execute(f"SELECT * FROM {cls._table} WHERE id = ANY(%s) ORDER BY id", (record_ids,))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, (Char, Selection)):
+                field_definitions.append(f"{name} VARCHAR(255)")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        with cls.env.transaction():
+            cls.env.cr.execute(query)
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._transaction_depth = 0 # 0 = tidak ada transaksi, 1 = transaksi luar, >1 = savepoint
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commit sekali di akhir blok terluar; blok bersarang menjadi SAVEPOINT."""
+        conn = self.cr.connection
+        if self._transaction_depth == 0:
+            self._transaction_depth = 1
+            try:
+                yield self
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._transaction_depth = 0
+            return
+
+        savepoint = f"sp_{self._transaction_depth}"
+        self.cr.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield self
+            self.cr.execute(f"RELEASE SAVEPOINT {savepoint}")
+        except BaseException:
+            self.cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            raise
+        finally:
+            self._transaction_depth -= 1
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class SaleOrder(Model):
+    _name = 'sale.order'
+    _table = 'sale_order'
+    _fields = {
+        'name': Char(string='Order Reference'),
+        'state': Selection([
+            ('draft', 'Quotation'),
+            ('sent', 'Quotation Sent'),
+            ('sale', 'Sales Order'),
+            ('done', 'Locked'),
+            ('cancel', 'Cancelled'),
+        ], string='Status'),
+    }
+
+    # ================== STATE MACHINE ==================
+    action_quotation_send = Transition('state', 'draft', 'sent')
+    action_confirm = Transition('state', ['draft', 'sent'], 'sale')
+    action_done = Transition('state', 'sale', 'done')
+    action_cancel = Transition('state', ['draft', 'sent', 'sale'], 'cancel')
+
+    def legacy_action_confirm(self):
+        """Cara lama (latihan 12): baca state di Python, lalu write satu per satu. Hanya untuk perbandingan."""
+        if self.state in ('draft', 'sent'):
+            self.write({'state': 'sale'})
+            return True
+        return False
+
+
+BENCH_SCHEMA = 'bench_transition'
+
+def run_transition_benchmark(env, orders=20000):
+    """Mengonfirmasi 20.000 quotation: satu per satu vs satu statement."""
+    SaleOrderModel = env['sale.order']
+    with env.transaction():
+        env.cr.execute("""
+            INSERT INTO sale_order (name, state)
+            SELECT 'SO/BENCH/' || i, CASE WHEN i %% 10 = 0 THEN 'cancel' ELSE 'draft' END
+            FROM generate_series(1, %s) i
+        """, (orders * 2,))
+        env.cr.execute("SELECT id FROM sale_order WHERE name LIKE 'SO/BENCH/%' ORDER BY id")
+        all_ids = [row[0] for row in env.cr.fetchall()]
+    legacy_ids, set_based_ids = all_ids[:orders], all_ids[orders:]
+
+    start = time.perf_counter()
+    with env.transaction():
+        legacy_confirmed = sum(order.legacy_action_confirm() for order in SaleOrderModel.browse(legacy_ids))
+    legacy_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = SaleOrderModel.action_confirm(set_based_ids)
+    set_based_duration = time.perf_counter() - start
+
+    assert legacy_confirmed == len(result.transitioned), "Kedua cara harus mengonfirmasi jumlah order yang sama!"
+    print(f"HASIL mengonfirmasi {orders:,} quotation ({len(result.skipped):,} di antaranya sudah dibatalkan):")
+    print(f"  - browse + write per record: {legacy_duration:6.2f} detik ({legacy_confirmed + 1:,} statement)")
+    print(f"  - Transition (set-based)   : {set_based_duration:6.2f} detik (1 statement)")
+    print(f"  - Lebih cepat: {legacy_duration / set_based_duration:.0f}x")
+
+
+def run_state_transitions_example():
+    """
+    Fungsi untuk menjalankan contoh transisi state berbasis himpunan.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(cr)
+    SaleOrderModel = env['sale.order']
+    SaleOrderModel._init_table()
+
+    # 1. Transisi untuk satu record, dipanggil dari instance.
+    print("\n--- 1. Transisi Satu Record ---")
+    with env.transaction():
+        so = SaleOrderModel.create({'name': 'SO/2025/001', 'state': 'draft'})
+    print(f"INFO: {so.action_confirm()} -> state sekarang '{so.state}'")
+    print(f"INFO: Konfirmasi ulang -> {so.action_confirm()} (dilewati karena state bukan draft/sent)")
+
+    # 2. Transisi untuk banyak record sekaligus, dengan laporan yang berpindah dan yang dilewati.
+    print("\n--- 2. Transisi Banyak Record ---")
+    with env.transaction():
+        orders = [SaleOrderModel.create({'name': f'SO/2025/1{i:02d}', 'state': state})
+                  for i, state in enumerate(['draft', 'sent', 'cancel', 'draft', 'done'], 1)]
+    result = SaleOrderModel.action_confirm(orders)
+    print(f"SUCCESS: Dikonfirmasi: {[o.name for o in orders if o.id in result.transitioned]}")
+    print(f"WARNING: Dilewati    : {[o.name for o in orders if o.id in result.skipped]}")
+
+    # 3. Deklarasi transisi yang salah langsung ditolak saat class dibuat.
+    print("\n--- 3. Validasi Deklarasi Transisi ---")
+    try:
+        class BrokenOrder(SaleOrder):
+            action_ship = Transition('state', 'sale', 'shipped')
+    except (ValueError, TypeError, RuntimeError) as e:
+        print(f"ERROR: {e.__cause__ or e}")
+
+    # 4. Benchmark.
+    print("\n--- 4. Benchmark Konfirmasi 20.000 Quotation ---")
+    run_transition_benchmark(env)
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_state_transitions_example()
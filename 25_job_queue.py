@@ -0,0 +1,480 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import json
+import threading
+import time
+
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Job queue di tabel PostgreSQL `queue_job`: `record.with_delay().action_confirm()` tidak langsung
+#    menjalankan method, tetapi menyimpan job (nama model, ID record, nama method, argumen).
+#    Job ikut transaksi yang sedang berjalan, jadi job hanya ada jika transaksi bisnisnya di-commit.
+# 2. Worker pool (`JobRunner`): beberapa thread mengambil job dengan `SELECT ... FOR UPDATE SKIP LOCKED`,
+#    sehingga dua worker (bahkan dari proses lain) tidak pernah mengambil job yang sama.
+# 3. Prioritas (angka kecil dijalankan lebih dulu), retry dengan jeda, dan batas concurrency per channel.
+# 4. Job dijalankan dengan Environment, registry, dan `env.transaction()` yang sama seperti latihan
+#    sebelumnya: worker cukup memanggil `env[model_name].browse(ids)` lalu method-nya.
+
+class Database:
+    _connection = None
+    _pool = None
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+    @classmethod
+    def get_pool(cls, maxconn=8, **kwargs):
+        if cls._pool is None:
+            try:
+                cls._pool = psycopg2.pool.ThreadedConnectionPool(
+                    1, maxconn, dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432", **kwargs
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._pool
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Selection(Field):
+    def __init__(self, selection, string=""):
+        super().__init__(string)
+        self.selection = selection
+
+class JobQueue:
+    """Tabel `queue_job` beserta operasi enqueue dan dequeue."""
+    _table = 'queue_job'
+
+    @classmethod
+    def init_table(cls, env):
+        with env.transaction():
+            env.cr.execute(f"""
+                CREATE TABLE IF NOT EXISTS {cls._table} (
+                    id SERIAL PRIMARY KEY,
+                    model_name VARCHAR(255) NOT NULL,
+                    record_ids INTEGER[] NOT NULL,
+                    method_name VARCHAR(255) NOT NULL,
+                    args JSONB NOT NULL DEFAULT '[]',
+                    kwargs JSONB NOT NULL DEFAULT '{{}}',
+                    channel VARCHAR(255) NOT NULL DEFAULT 'root',
+                    priority INTEGER NOT NULL DEFAULT 10,
+                    state VARCHAR(16) NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_retries INTEGER NOT NULL DEFAULT 3,
+                    eta TIMESTAMP NOT NULL DEFAULT clock_timestamp(),
+                    exc_info TEXT,
+                    date_done TIMESTAMP
+                )
+            """)
+            # Index parsial: worker hanya mencari job 'pending', diurutkan sesuai prioritas.
+            env.cr.execute(f"CREATE INDEX IF NOT EXISTS {cls._table}_pending_index "
+                           f"ON {cls._table} (priority, id) WHERE state = 'pending'")
+        print(f"Table '{cls._table}' is ready.")
+
+    @classmethod
+    def enqueue(cls, env, model_name, record_ids, method_name, args, kwargs, channel, priority, max_retries):
+        env.cr.execute(f"""
+            INSERT INTO {cls._table} (model_name, record_ids, method_name, args, kwargs, channel, priority, max_retries)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
+        """, (model_name, record_ids, method_name, psycopg2.extras.Json(args), psycopg2.extras.Json(kwargs),
+              channel, priority, max_retries))
+        return env.cr.fetchone()[0]
+
+    @classmethod
+    def dequeue(cls, env, channels):
+        """Mengunci satu job siap jalan dari channel yang diizinkan. Job yang sedang dikunci worker lain dilewati."""
+        env.cr.execute(f"""
+            SELECT id, model_name, record_ids, method_name, args, kwargs, channel, attempts, max_retries
+            FROM {cls._table}
+            WHERE state = 'pending' AND eta <= clock_timestamp() AND channel = ANY(%s)
+            ORDER BY priority, id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        """, (channels,))
+        return env.cr.fetchone()
+
+class DelayedRecord:
+    """Pembungkus hasil `record.with_delay()`: setiap pemanggilan method menjadi job, bukan eksekusi langsung."""
+    def __init__(self, record, priority, channel, max_retries):
+        self._record = record
+        self._options = {'priority': priority, 'channel': channel, 'max_retries': max_retries}
+
+    def __getattr__(self, method_name):
+        if not callable(getattr(self._record, method_name, None)):
+            raise AttributeError(f"Model '{self._record._name}' tidak punya method '{method_name}'.")
+
+        def enqueue(*args, **kwargs):
+            json.dumps([args, kwargs]) # Argumen job harus bisa disimpan sebagai JSON
+            return JobQueue.enqueue(self._record.env, self._record._name, [self._record.id], method_name,
+                                    list(args), kwargs, **self._options)
+        return enqueue
+
+class JobRunner:
+    """
+    Worker pool yang menjalankan job. `channels` memetakan nama channel ke jumlah job maksimum
+    yang boleh berjalan bersamaan di runner ini, misalnya {'root': 4, 'root.mail': 1}.
+    """
+    def __init__(self, pool, channels, workers=4, retry_delay=0.05):
+        self.pool = pool
+        self.channels = channels
+        self.workers = workers
+        self.retry_delay = retry_delay
+        self.running = {channel: 0 for channel in channels}
+        self.max_running = {channel: 0 for channel in channels} # Statistik untuk contoh
+        self.processed = []
+        self._lock = threading.Lock()
+
+    def _run_one(self, env):
+        """Mengambil dan menjalankan satu job. Mengembalikan False jika tidak ada job yang siap."""
+        with env.transaction():
+            # Memilih channel yang masih punya slot, mengambil job, lalu menandai slot terpakai
+            # dilakukan di bawah lock agar batas channel tidak terlampaui oleh worker lain.
+            with self._lock:
+                free_channels = [c for c, limit in self.channels.items() if self.running[c] < limit]
+                job = JobQueue.dequeue(env, free_channels) if free_channels else None
+                if job is None:
+                    return False
+                job_id, model_name, record_ids, method_name, args, kwargs, channel, attempts, max_retries = job
+                self.running[channel] += 1
+                self.max_running[channel] = max(self.max_running[channel], self.running[channel])
+
+            try:
+                # Job berjalan di SAVEPOINT: jika gagal, hanya pekerjaan job yang dibatalkan,
+                # sementara baris job tetap terkunci dan status retry-nya bisa dicatat.
+                with env.transaction():
+                    for record in env[model_name].browse(list(record_ids)):
+                        getattr(record, method_name)(*args, **kwargs)
+                env.cr.execute(f"UPDATE {JobQueue._table} SET state = 'done', attempts = attempts + 1, "
+                               f"date_done = clock_timestamp() WHERE id = %s", (job_id,))
+                self.processed.append(job_id)
+            except Exception as e:
+                attempts += 1
+                if attempts < max_retries:
+                    env.cr.execute(f"""
+                        UPDATE {JobQueue._table} SET attempts = %s, exc_info = %s,
+                            eta = clock_timestamp() + %s * interval '1 second'
+                        WHERE id = %s
+                    """, (attempts, f"{type(e).__name__}: {e}", self.retry_delay * attempts, job_id))
+                else:
+                    env.cr.execute(f"UPDATE {JobQueue._table} SET state = 'failed', attempts = %s, exc_info = %s "
+                                   f"WHERE id = %s", (attempts, f"{type(e).__name__}: {e}", job_id))
+            finally:
+                with self._lock:
+                    self.running[channel] -= 1
+        return True
+
+    def _has_pending_jobs(self, env):
+        with env.transaction():
+            env.cr.execute(f"SELECT count(*) FROM {JobQueue._table} WHERE state = 'pending' AND channel = ANY(%s)",
+                           (list(self.channels),))
+            return env.cr.fetchone()[0] > 0
+
+    def _worker(self, errors):
+        conn = self.pool.getconn()
+        try:
+            env = Environment(conn.cursor())
+            while True:
+                if self._run_one(env):
+                    continue
+                with self._lock:
+                    busy = any(self.running.values())
+                if not busy and not self._has_pending_jobs(env):
+                    return
+                time.sleep(0.005) # Menunggu slot channel kosong atau eta job retry
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            self.pool.putconn(conn)
+
+    def run_until_empty(self):
+        """Menjalankan worker sampai semua job di channel runner ini selesai atau gagal."""
+        errors = []
+        threads = [threading.Thread(target=self._worker, args=(errors,)) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, f"Worker error: {errors}"
+        return self.processed
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    def with_delay(self, priority=10, channel='root', max_retries=3):
+        """`record.with_delay().method(...)` menyimpan pemanggilan method sebagai job di `queue_job`."""
+        return DelayedRecord(self, priority, channel, max_retries)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        return cls(cls.env, cls.env.cr.fetchone()[0], values)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = %s"
+        self.env.cr.execute(query, [values[name] for name in field_names] + [self.id])
+
+        for name in field_names:
+            setattr(self, name, values[name])
+        return True
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query + " ORDER BY id", params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        cls.env.cr.execute(f"SELECT * FROM {cls._table} WHERE id = ANY(%s) ORDER BY id", (record_ids,))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, (Char, Selection)):
+                field_definitions.append(f"{name} VARCHAR(255)")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        with cls.env.transaction():
+            cls.env.cr.execute(query)
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._transaction_depth = 0 # 0 = tidak ada transaksi, 1 = transaksi luar, >1 = savepoint
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commit sekali di akhir blok terluar; blok bersarang menjadi SAVEPOINT."""
+        conn = self.cr.connection
+        if self._transaction_depth == 0:
+            self._transaction_depth = 1
+            try:
+                yield self
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._transaction_depth = 0
+            return
+
+        savepoint = f"sp_{self._transaction_depth}"
+        self.cr.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield self
+            self.cr.execute(f"RELEASE SAVEPOINT {savepoint}")
+        except BaseException:
+            self.cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            raise
+        finally:
+            self._transaction_depth -= 1
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class SaleOrder(Model):
+    _name = 'sale.order'
+    _table = 'sale_order'
+    _fields = {
+        'name': Char(string='Order Reference'),
+        'partner_email': Char(string='Customer Email'),
+        'state': Selection([
+            ('draft', 'Quotation'),
+            ('sent', 'Quotation Sent'),
+            ('sale', 'Sales Order'),
+            ('done', 'Locked'),
+            ('cancel', 'Cancelled'),
+        ], string='Status'),
+    }
+    _mail_gateway_calls = {} # Simulasi server email: order ID -> jumlah percobaan kirim
+
+    # ================== BUSINESS METHODS ==================
+
+    def action_confirm(self):
+        """Sama seperti latihan 12: 'draft' -> 'sale'."""
+        if self.state == 'draft':
+            self.write({'state': 'sale'})
+        return True
+
+    def action_send_confirmation(self, template='sale_confirmation'):
+        """Mengirim email konfirmasi. Server email simulasi selalu gagal pada percobaan pertama."""
+        if not self.partner_email:
+            raise ValueError(f"Order '{self.name}' tidak punya email pelanggan.")
+        calls = self._mail_gateway_calls
+        calls[self.id] = calls.get(self.id, 0) + 1
+        time.sleep(0.01) # Waktu kirim email
+        if calls[self.id] == 1:
+            raise ConnectionError("Server email sedang sibuk, coba lagi nanti.")
+        return True
+
+
+BENCH_SCHEMA = 'bench_job_queue'
+
+def print_job_summary(env):
+    with env.transaction():
+        env.cr.execute(f"""
+            SELECT channel, method_name, state, count(*), max(attempts), max(exc_info)
+            FROM {JobQueue._table} GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        """)
+        for channel, method_name, state, count, attempts, exc_info in env.cr.fetchall():
+            note = f" | terakhir: {exc_info}" if exc_info and state == 'failed' else ""
+            print(f"  - [{channel}] {method_name}: {count} job '{state}', percobaan maks {attempts}{note}")
+
+
+def run_job_queue_example():
+    """
+    Fungsi untuk menjalankan contoh job queue.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(cr)
+    env['sale.order']._init_table()
+    JobQueue.init_table(env)
+    pool = Database.get_pool(options=f"-c search_path={BENCH_SCHEMA}")
+    SaleOrderModel = env['sale.order']
+
+    # 1. Job ikut transaksi: jika transaksi di-rollback, job-nya juga hilang.
+    print("\n--- 1. Enqueue Ikut Transaksi ---")
+    try:
+        with env.transaction():
+            so = SaleOrderModel.create({'name': 'SO/ROLLBACK', 'partner_email': 'a@example.com', 'state': 'draft'})
+            so.with_delay().action_confirm()
+            raise RuntimeError("Request dibatalkan")
+    except RuntimeError:
+        pass
+    cr.execute(f"SELECT count(*) FROM {JobQueue._table}")
+    print(f"INFO: Job setelah rollback: {cr.fetchone()[0]}")
+    conn.rollback()
+
+    # 2. Prioritas: satu worker, job prioritas 1 dijalankan sebelum job prioritas 10 yang lebih dulu dibuat.
+    print("\n--- 2. Prioritas ---")
+    with env.transaction():
+        orders = [SaleOrderModel.create({'name': f'SO/PRIO/{i}', 'partner_email': 'b@example.com', 'state': 'draft'})
+                  for i in range(1, 4)]
+        normal = [order.with_delay(priority=10).action_confirm() for order in orders[:2]]
+        urgent = orders[2].with_delay(priority=1).action_confirm()
+    runner = JobRunner(pool, {'root': 1}, workers=1)
+    print(f"INFO: Urutan dibuat: {normal + [urgent]}, urutan dijalankan: {runner.run_until_empty()}")
+
+    # 3. Ribuan job di dua channel, dengan retry dan batas concurrency per channel.
+    print("\n--- 3. 1.000 Konfirmasi + 100 Email, Retry, dan Batas Channel ---")
+    with env.transaction():
+        for i in range(1000):
+            order = SaleOrderModel.create({
+                'name': f'SO/BULK/{i:04d}', 'state': 'draft',
+                'partner_email': None if i % 250 == 0 else f'customer{i}@example.com',
+            })
+            order.with_delay(channel='root.sale').action_confirm()
+            if i % 10 == 0:
+                order.with_delay(channel='root.mail', max_retries=3).action_send_confirmation(template='sale_confirmation')
+
+    start = time.perf_counter()
+    runner = JobRunner(pool, {'root.sale': 4, 'root.mail': 2}, workers=6)
+    runner.run_until_empty()
+    duration = time.perf_counter() - start
+    print(f"HASIL: {len(runner.processed)} job selesai dalam {duration:.2f} detik oleh 6 worker.")
+    print(f"INFO: Maksimum job berjalan bersamaan per channel: {runner.max_running} (batas {runner.channels})")
+    print_job_summary(env)
+
+    cr.execute("SELECT count(*) FROM sale_order WHERE name LIKE 'SO/BULK/%' AND state = 'sale'")
+    print(f"SUCCESS: {cr.fetchone()[0]} order terkonfirmasi oleh worker.")
+
+    # 4. SKIP LOCKED: dua runner (misalnya dua proses) berebut antrean yang sama, tanpa job ganda.
+    print("\n--- 4. Dua Runner Berebut Antrean (SKIP LOCKED) ---")
+    with env.transaction():
+        for order in SaleOrderModel.search([('name', 'like', 'SO/BULK/%')]):
+            order.with_delay(channel='root.sale').action_confirm()
+    runners = [JobRunner(pool, {'root.sale': 3}, workers=3) for _ in range(2)]
+    threads = [threading.Thread(target=runner.run_until_empty) for runner in runners]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    all_processed = runners[0].processed + runners[1].processed
+    assert len(all_processed) == len(set(all_processed)), "Ada job yang dijalankan dua kali!"
+    print(f"SUCCESS: Runner A {len(runners[0].processed)} job, runner B {len(runners[1].processed)} job, tanpa duplikat.")
+
+    pool.closeall()
+    conn.rollback()
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_job_queue_example()
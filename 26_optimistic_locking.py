@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import threading
+import time
+
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Optimistic concurrency control (opt-in): model dengan `_concurrency_check = True` mendapat kolom
+#    `version`. Setiap `write` menaikkan versi dan hanya berhasil jika versi di database masih sama
+#    dengan versi saat record dibaca: `UPDATE ... WHERE id = %s AND version = %s`.
+# 2. Jika versinya sudah berubah (record diubah transaksi lain), `write` melempar `ConcurrencyError`
+#    alih-alih diam-diam menimpa perubahan orang lain. Tidak ada `SELECT ... FOR UPDATE` tambahan.
+# 3. `Model.write_many(records, values)`: varian batch, satu statement untuk banyak record; jika ada
+#    satu saja yang versinya berubah, seluruh batch dibatalkan lewat SAVEPOINT (`env.savepoint()`), tanpa
+#    commit atau rollback transaksi pemanggil.
+
+class Database:
+    _connection = None
+    _pool = None
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+    @classmethod
+    def get_pool(cls, maxconn=8, **kwargs):
+        if cls._pool is None:
+            try:
+                cls._pool = psycopg2.pool.ThreadedConnectionPool(
+                    1, maxconn, dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432", **kwargs
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._pool
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class ConcurrencyError(Exception):
+    """Record sudah diubah (atau dihapus) oleh transaksi lain sejak terakhir dibaca."""
+    def __init__(self, message, record_ids):
+        super().__init__(message)
+        self.record_ids = record_ids
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Integer(Field): pass
+class Float(Field): pass
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+    _concurrency_check = False # True = tambahkan kolom `version` dan periksa di setiap write
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING *"
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        row = dict(zip([desc[0] for desc in cls.env.cr.description], cls.env.cr.fetchone()))
+        return cls(cls.env, row.pop('id'), row)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = [f"{name} = %s" for name in field_names]
+        params = [values[name] for name in field_names]
+        where = "id = %s"
+        params.append(self.id)
+
+        if self._concurrency_check:
+            set_clauses.append("version = version + 1")
+            where += " AND version = %s"
+            params.append(self.version)
+
+        query = f"UPDATE {self._table} SET {', '.join(set_clauses)} WHERE {where} RETURNING id"
+        if self._concurrency_check:
+            query += ", version"
+        self.env.cr.execute(query, params)
+        row = self.env.cr.fetchone()
+        if row is None and self._concurrency_check:
+            raise ConcurrencyError(
+                f"Record '{self._name}' ID {self.id} sudah diubah transaksi lain (versi {self.version} kedaluwarsa).",
+                [self.id],
+            )
+
+        for name in field_names:
+            setattr(self, name, values[name])
+        if self._concurrency_check:
+            self.version = row[1]
+        return True
+
+    @classmethod
+    def write_many(cls, records, values):
+        """Write yang sama untuk banyak record dalam satu statement, dengan pengecekan versi per record."""
+        if not records: return True
+        field_names = [name for name in cls._fields if name in values]
+        set_clauses = [f"{name} = %s" for name in field_names]
+        params = [values[name] for name in field_names]
+
+        if not cls._concurrency_check:
+            query = f"UPDATE {cls._table} SET {', '.join(set_clauses)} WHERE id = ANY(%s)"
+            cls.env.cr.execute(query, params + [[record.id for record in records]])
+        else:
+            # Pasangan (id, versi yang diharapkan) dikirim sebagai dua array lalu di-unnest.
+            set_clauses.append("version = t.version + 1")
+            query = f"""
+                UPDATE {cls._table} t SET {', '.join(set_clauses)}
+                FROM unnest(%s::integer[], %s::integer[]) AS expected(id, version)
+                WHERE t.id = expected.id AND t.version = expected.version
+                RETURNING t.id, t.version
+            """
+            params += [[record.id for record in records], [record.version for record in records]]
+            # SAVEPOINT: jika ada konflik, record yang sempat ter-update ikut dibatalkan, sementara
+            # write lain yang belum di-commit milik pemanggil tetap ada.
+            with cls.env.savepoint():
+                cls.env.cr.execute(query, params)
+                new_versions = dict(cls.env.cr.fetchall())
+                stale_ids = [record.id for record in records if record.id not in new_versions]
+                if stale_ids:
+                    raise ConcurrencyError(
+                        f"{len(stale_ids)} record '{cls._name}' sudah diubah transaksi lain: {stale_ids}", stale_ids
+                    )
+            for record in records:
+                record.version = new_versions[record.id]
+
+        for record in records:
+            for name in field_names:
+                setattr(record, name, values[name])
+        return True
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        cls.env.cr.execute(f"SELECT * FROM {cls._table} WHERE id = ANY(%s) ORDER BY id", (record_ids,))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Integer):
+                field_definitions.append(f"{name} INTEGER")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+        if cls._concurrency_check:
+            field_definitions.append("version INTEGER NOT NULL DEFAULT 1")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        with cls.env.transaction():
+            cls.env.cr.execute(query)
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._transaction_depth = 0 # 0 = tidak ada transaksi, 1 = transaksi luar, >1 = savepoint
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commit sekali di akhir blok terluar; blok bersarang menjadi SAVEPOINT."""
+        conn = self.cr.connection
+        if self._transaction_depth == 0:
+            self._transaction_depth = 1
+            try:
+                yield self
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._transaction_depth = 0
+            return
+
+        with self.savepoint():
+            yield self
+
+    @contextlib.contextmanager
+    def savepoint(self):
+        """SAVEPOINT di kedalaman mana pun, juga di luar `env.transaction()`: tidak pernah commit."""
+        savepoint = f"sp_{self._transaction_depth}"
+        self.cr.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield self
+            self.cr.execute(f"RELEASE SAVEPOINT {savepoint}")
+        except BaseException:
+            self.cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            raise
+        finally:
+            self._transaction_depth -= 1
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductTemplate(Model):
+    _name = 'product.template'
+    _table = 'product_template'
+    _concurrency_check = True
+    _fields = {
+        'name': Char(string='Product Name'),
+        'sale_price': Float(string='Sale Price'),
+        'qty_available': Integer(string='Quantity On Hand'),
+    }
+
+@registry.register
+class ProductTemplateUnchecked(Model):
+    """Model yang sama tanpa pengecekan versi, hanya untuk perbandingan."""
+    _name = 'product.template.unchecked'
+    _table = 'product_template_unchecked'
+    _fields = ProductTemplate._fields
+
+
+BENCH_SCHEMA = 'bench_optimistic'
+
+def stock_worker(pool, model_name, product_id, increments, stats):
+    """Menambah stok satu per satu dengan pola baca-ubah-tulis, mengulang jika terjadi konflik."""
+    conn = pool.getconn()
+    try:
+        env = Environment(conn.cursor())
+        for _ in range(increments):
+            while True:
+                try:
+                    with env.transaction():
+                        product = env[model_name].browse(product_id)
+                        product.write({'qty_available': product.qty_available + 1})
+                    break
+                except ConcurrencyError:
+                    stats['conflicts'] += 1 # Baca ulang versi terbaru lalu coba lagi
+    finally:
+        pool.putconn(conn)
+
+
+def run_concurrent_stock_test(env, pool, threads=8, increments=200):
+    """8 thread menambah stok produk yang SAMA: dengan dan tanpa pengecekan versi."""
+    expected = threads * increments
+    for model_name in ('product.template.unchecked', 'product.template'):
+        with env.transaction():
+            product = env[model_name].create({'name': 'Office Chair', 'sale_price': 70.0, 'qty_available': 0})
+        stats = {'conflicts': 0}
+        workers = [threading.Thread(target=stock_worker, args=(pool, model_name, product.id, increments, stats))
+                   for _ in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        duration = time.perf_counter() - start
+
+        with env.transaction():
+            final_qty = env[model_name].browse(product.id).qty_available
+        print(f"HASIL '{model_name}': stok akhir {final_qty} dari {expected} yang diharapkan, "
+              f"{expected - final_qty} update hilang, {stats['conflicts']} konflik di-retry, {duration:.2f} detik")
+
+
+def run_optimistic_locking_example():
+    """
+    Fungsi untuk menjalankan contoh optimistic concurrency control.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(cr)
+    env['product.template']._init_table()
+    env['product.template.unchecked']._init_table()
+    pool = Database.get_pool(options=f"-c search_path={BENCH_SCHEMA}")
+
+    # 1. Dua pengguna membuka produk yang sama, lalu sama-sama menyimpan.
+    print("\n--- 1. Dua Pengguna Mengedit Record yang Sama ---")
+    with env.transaction():
+        chair = env['product.template'].create({'name': 'Office Chair', 'sale_price': 70.0, 'qty_available': 10})
+    conn_a, conn_b = pool.getconn(), pool.getconn()
+    env_a, env_b = Environment(conn_a.cursor()), Environment(conn_b.cursor())
+    with env_a.transaction():
+        chair_a = env_a['product.template'].browse(chair.id)
+    with env_b.transaction():
+        chair_b = env_b['product.template'].browse(chair.id)
+    print(f"INFO: Pengguna A dan B sama-sama membaca versi {chair_a.version}.")
+
+    with env_a.transaction():
+        chair_a.write({'sale_price': 75.0})
+    print(f"SUCCESS: Pengguna A menyimpan harga 75.0 -> versi {chair_a.version}")
+    try:
+        with env_b.transaction():
+            chair_b.write({'sale_price': 65.0})
+    except ConcurrencyError as e:
+        print(f"ERROR: Pengguna B -> {e}")
+    with env_b.transaction():
+        chair_b = env_b['product.template'].browse(chair.id)
+        price_seen = chair_b.sale_price
+        chair_b.write({'sale_price': 72.0})
+    print(f"SUCCESS: Pengguna B membaca ulang (harga {price_seen}), lalu menyimpan 72.0 -> versi {chair_b.version}")
+
+    # 2. Write batch: satu statement, seluruh batch dibatalkan jika ada satu record yang kedaluwarsa.
+    print("\n--- 2. Write Batch dengan Pengecekan Versi ---")
+    with env_a.transaction():
+        desks = [env_a['product.template'].create({'name': f'Desk {i}', 'sale_price': 100.0, 'qty_available': 5})
+                 for i in range(1, 6)]
+    with env_b.transaction():
+        env_b['product.template'].browse(desks[2].id).write({'qty_available': 4})
+    try:
+        with env_a.transaction():
+            env_a['product.template'].write_many(desks, {'sale_price': 90.0})
+    except ConcurrencyError as e:
+        print(f"ERROR: {e}")
+    with env_a.transaction():
+        prices = {desk.sale_price for desk in env_a['product.template'].browse([d.id for d in desks])}
+        print(f"INFO: Harga di database setelah batch dibatalkan: {prices}")
+        desks = env_a['product.template'].browse([d.id for d in desks])
+        env_a['product.template'].write_many(desks, {'sale_price': 90.0})
+    print(f"SUCCESS: Setelah baca ulang, batch berhasil -> versi {[desk.version for desk in desks]}")
+
+    # write_many di luar env.transaction() tidak menyentuh write pemanggil yang belum di-commit.
+    desks[0].write({'qty_available': 9})
+    with env_b.transaction():
+        env_b['product.template'].browse(desks[1].id).write({'qty_available': 3})
+    try:
+        env_a['product.template'].write_many(desks[1:], {'sale_price': 80.0})
+    except ConcurrencyError as e:
+        print(f"ERROR: {e}")
+    assert env_a['product.template'].browse(desks[0].id).qty_available == 9, "write pemanggil ikut dibatalkan!"
+    env_a.cr.connection.rollback()
+    print("SUCCESS: Konflik write_many hanya membatalkan batch-nya; transaksi pemanggil tetap utuh.")
+    pool.putconn(conn_a)
+    pool.putconn(conn_b)
+
+    # 3. Update serentak pada satu baris.
+    print("\n--- 3. 8 Thread Menambah Stok Produk yang Sama ---")
+    run_concurrent_stock_test(env, pool)
+
+    pool.closeall()
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_optimistic_locking_example()
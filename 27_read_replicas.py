@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import itertools
+import time
+
+import psycopg2
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. `Database.configure(primary_dsn, replica_dsns)`: satu database utama (primary) untuk write dan
+#    beberapa read replica untuk read.
+# 2. Routing otomatis: `search`, `search_read`, `search_count`, dan `browse` dikirim ke replica secara
+#    round-robin. `create`, `write`, `unlink` selalu ke primary.
+# 3. Read-after-write: begitu sebuah transaksi melakukan write, semua read berikutnya di transaksi itu
+#    tetap ke primary, karena replica mungkin belum menerima perubahan tersebut. Transaksi primary
+#    harus diakhiri lewat `env.transaction()`, `env.commit()`, atau `env.rollback()` (bukan langsung
+#    `connection.commit()`), agar read berikutnya boleh kembali ke replica.
+# 4. Health tracking: replica yang gagal dihubungi ditandai "down" selama `cooldown` detik dan
+#    dilewati; jika semua replica down, read jatuh kembali ke primary.
+
+class ReplicaState:
+    """Status satu read replica: koneksi, kapan boleh dicoba lagi, dan jumlah kegagalan."""
+    def __init__(self, name, dsn):
+        self.name = name
+        self.dsn = dsn
+        self.connection = None
+        self.down_until = 0.0
+        self.failures = 0
+
+    @property
+    def healthy(self):
+        return time.monotonic() >= self.down_until
+
+class Database:
+    _primary_dsn = "dbname=postgres user=odoo password=odoo host=odoo-db port=5432"
+    _connection = None
+    _replicas = []
+    _round_robin = None
+    cooldown = 5.0
+
+    @classmethod
+    def configure(cls, primary_dsn, replica_dsns=(), cooldown=5.0):
+        for conn in [cls._connection] + [replica.connection for replica in cls._replicas]:
+            if conn is not None and not conn.closed:
+                conn.close()
+        cls._primary_dsn = primary_dsn
+        cls._connection = None
+        cls._replicas = [ReplicaState(f"replica-{i}", dsn) for i, dsn in enumerate(replica_dsns, 1)]
+        cls._round_robin = itertools.cycle(cls._replicas) if cls._replicas else None
+        cls.cooldown = cooldown
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(cls._primary_dsn)
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+    @classmethod
+    def mark_down(cls, replica, error):
+        replica.failures += 1
+        replica.down_until = time.monotonic() + cls.cooldown
+        if replica.connection is not None and not replica.connection.closed:
+            replica.connection.close()
+        replica.connection = None
+        print(f"WARNING: {replica.name} ditandai down selama {cls.cooldown:g} detik ({str(error).strip().splitlines()[0]})")
+
+    @classmethod
+    def get_read_connection(cls):
+        """Mengembalikan (replica, koneksi) berikutnya yang sehat, atau (None, koneksi primary)."""
+        for _ in range(len(cls._replicas)):
+            replica = next(cls._round_robin)
+            if not replica.healthy:
+                continue
+            if replica.connection is None:
+                try:
+                    replica.connection = psycopg2.connect(replica.dsn)
+                    replica.connection.autocommit = True # Replica hanya dibaca, tidak perlu transaksi
+                except psycopg2.OperationalError as e:
+                    cls.mark_down(replica, e)
+                    continue
+            return replica, replica.connection
+        return None, cls.get_connection()
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Float(Field): pass
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @staticmethod
+    def _where_clause(domain):
+        if not domain:
+            return "", []
+        return (" WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain),
+                [value for field, op, value in domain])
+
+    # ---------- Write: selalu ke primary ----------
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+        cr = cls.env.write_cursor('create')
+        cr.execute(query, [values[name] for name in field_names])
+        return cls(cls.env, cr.fetchone()[0], values)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        query = f"UPDATE {self._table} SET {set_clauses} WHERE id = %s"
+        self.env.write_cursor('write').execute(query, [values[name] for name in field_names] + [self.id])
+
+        for name in field_names:
+            setattr(self, name, values[name])
+        return True
+
+    def unlink(self):
+        self.env.write_cursor('unlink').execute(f"DELETE FROM {self._table} WHERE id = %s", (self.id,))
+        return True
+
+    # ---------- Read: ke replica, kecuali setelah write di transaksi yang sama ----------
+
+    @classmethod
+    def search(cls, domain):
+        where, params = cls._where_clause(domain)
+        rows, _ = cls.env.execute_read('search', f"SELECT id FROM {cls._table}{where} ORDER BY id", params)
+        return cls.browse([row[0] for row in rows])
+
+    @classmethod
+    def search_count(cls, domain):
+        where, params = cls._where_clause(domain)
+        rows, _ = cls.env.execute_read('search_count', f"SELECT count(*) FROM {cls._table}{where}", params)
+        return rows[0][0]
+
+    @classmethod
+    def search_read(cls, domain, fields):
+        where, params = cls._where_clause(domain)
+        query = f"SELECT id, {', '.join(fields)} FROM {cls._table}{where} ORDER BY id"
+        rows, colnames = cls.env.execute_read('search_read', query, params)
+        return [dict(zip(colnames, row)) for row in rows]
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        query = f"SELECT * FROM {cls._table} WHERE id = ANY(%s) ORDER BY id"
+        rows, colnames = cls.env.execute_read('browse', query, [record_ids])
+
+        results = []
+        for data in rows:
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        with cls.env.transaction():
+            cls.env.write_cursor('init').execute(query)
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor # Cursor primary
+        self.registry = registry
+        self.routing_log = [] # (operasi, tujuan), untuk melihat ke mana setiap query dikirim
+        self._transaction_depth = 0 # 0 = tidak ada transaksi, 1 = transaksi luar, >1 = savepoint
+        self._has_written = False # True setelah transaksi yang sedang berjalan melakukan write
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def write_cursor(self, operation):
+        self._has_written = True
+        self.routing_log.append((operation, 'primary'))
+        return self.cr
+
+    def execute_read(self, operation, query, params):
+        """Menjalankan read di replica jika aman, lalu mengembalikan (rows, nama kolom)."""
+        while not self._has_written:
+            replica, conn = Database.get_read_connection()
+            if replica is None:
+                break # Semua replica down
+            try:
+                with conn.cursor() as cr:
+                    cr.execute(query, params)
+                    self.routing_log.append((operation, replica.name))
+                    return cr.fetchall(), [desc[0] for desc in cr.description]
+            except psycopg2.OperationalError as e:
+                Database.mark_down(replica, e) # Koneksi putus di tengah jalan, coba replica berikutnya
+
+        self.routing_log.append((operation, 'primary'))
+        self.cr.execute(query, params)
+        return self.cr.fetchall(), [desc[0] for desc in self.cr.description]
+
+    def commit(self):
+        """Commit transaksi primary; transaksi berikutnya boleh membaca dari replica lagi."""
+        self.cr.connection.commit()
+        self._has_written = False
+
+    def rollback(self):
+        """Rollback transaksi primary; transaksi berikutnya boleh membaca dari replica lagi."""
+        self.cr.connection.rollback()
+        self._has_written = False
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commit sekali di akhir blok terluar; blok bersarang menjadi SAVEPOINT."""
+        if self._transaction_depth == 0:
+            self._transaction_depth = 1
+            try:
+                yield self
+                self.commit()
+            except BaseException:
+                self.rollback()
+                raise
+            finally:
+                self._transaction_depth = 0
+            return
+
+        savepoint = f"sp_{self._transaction_depth}"
+        self.cr.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield self
+            self.cr.execute(f"RELEASE SAVEPOINT {savepoint}")
+        except BaseException:
+            self.cr.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            raise
+        finally:
+            self._transaction_depth -= 1
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+    }
+
+
+BENCH_SCHEMA = 'bench_replica'
+
+def print_routing(env, title):
+    print(f"{title}:")
+    for operation, target in env.routing_log:
+        print(f"  - {operation:<12} -> {target}")
+    targets = [target for operation, target in env.routing_log]
+    env.routing_log.clear()
+    return targets
+
+
+def run_read_replicas_example():
+    """
+    Fungsi untuk menjalankan contoh routing read replica.
+    """
+    # Di lingkungan latihan hanya ada satu server PostgreSQL, jadi primary dan replica menunjuk ke
+    # server yang sama. Di produksi, replica_dsns berisi alamat server standby (streaming replication).
+    base_dsn = f"dbname=postgres user=odoo password=odoo host=odoo-db port=5432 options='-c search_path={BENCH_SCHEMA}'"
+    setup = psycopg2.connect(base_dsn)
+    setup.cursor().execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+    setup.commit()
+    setup.close()
+
+    Database.configure(
+        primary_dsn=f"{base_dsn} application_name=primary",
+        replica_dsns=[f"{base_dsn} application_name=replica-1", f"{base_dsn} application_name=replica-2"],
+    )
+    env = Environment(Database.get_connection().cursor())
+    ProductModel = env['product.product']
+    ProductModel._init_table()
+    with env.transaction():
+        for name, price in [('Laptop Pro 15', 2500.0), ('Mouse Wireless', 150.0), ('Monitor 27', 900.0)]:
+            ProductModel.create({'name': name, 'price': price})
+    env.routing_log.clear()
+
+    # 1. Read di luar transaksi write dibagi round-robin ke replica.
+    print("\n--- 1. Read ke Replica (Round-Robin) ---")
+    ProductModel.search_count([])
+    ProductModel.search_read([('price', '>', 500)], ['name', 'price'])
+    ProductModel.search([('name', 'like', 'M%')]) # search = 2 query: cari ID, lalu browse
+    print_routing(env, "INFO: Routing")
+
+    # 2. Setelah write di transaksi, read berikutnya tetap ke primary.
+    print("\n--- 2. Read-After-Write di Transaksi Tetap ke Primary ---")
+    with env.transaction():
+        ProductModel.search_count([]) # Belum ada write: replica
+        laptop = ProductModel.search([('name', '=', 'Laptop Pro 15')])[0]
+        laptop.write({'price': 2300.0})
+        print(f"INFO: Harga terbaca setelah write: {ProductModel.browse(laptop.id).price}")
+    ProductModel.search_count([]) # Transaksi selesai: kembali ke replica
+    targets = print_routing(env, "INFO: Routing")
+    assert targets[3:5] == ['primary', 'primary'] and targets[-1] != 'primary', "Routing read-after-write salah!"
+
+    # Write di luar env.transaction(): read tetap ke primary sampai env.commit() dipanggil.
+    laptop.write({'price': 2400.0})
+    ProductModel.search_count([]) # Belum di-commit: primary
+    env.commit()
+    ProductModel.search_count([]) # Sudah di-commit: kembali ke replica
+    targets = print_routing(env, "INFO: Routing write tanpa env.transaction() lalu env.commit()")
+    assert targets[1] == 'primary' and targets[2] != 'primary', "env.commit() tidak mengembalikan read ke replica!"
+
+    # 3. Replica down: dilewati selama cooldown, lalu dicoba lagi.
+    print("\n--- 3. Replica Down ---")
+    Database.configure(
+        primary_dsn=f"{base_dsn} application_name=primary",
+        replica_dsns=[f"{base_dsn} application_name=replica-1",
+                      "dbname=postgres user=odoo password=odoo host=127.0.0.1 port=1 connect_timeout=1"],
+        cooldown=0.5,
+    )
+    env = Environment(Database.get_connection().cursor())
+    for _ in range(4):
+        env['product.product'].search_count([])
+    print_routing(env, "INFO: Routing saat replica-2 down")
+    time.sleep(0.6)
+    env['product.product'].search_count([])
+    env['product.product'].search_count([])
+    print_routing(env, "INFO: Routing setelah cooldown (replica-2 dicoba lagi)")
+
+    # 4. Semua replica down: read jatuh kembali ke primary.
+    print("\n--- 4. Semua Replica Down ---")
+    Database.configure(
+        primary_dsn=f"{base_dsn} application_name=primary",
+        replica_dsns=["dbname=postgres user=odoo password=odoo host=127.0.0.1 port=1 connect_timeout=1"],
+    )
+    env = Environment(Database.get_connection().cursor())
+    print(f"SUCCESS: {env['product.product'].search_count([])} produk terbaca dari primary.")
+    print_routing(env, "INFO: Routing")
+
+    with env.transaction():
+        env.cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+
+if __name__ == "__main__":
+    run_read_replicas_example()
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import sys
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Instrumentasi query: `InstrumentedCursor` membungkus setiap `execute` dan melaporkannya ke
+#    `env.query_stats` milik environment: jumlah query, total waktu SQL, dan histogram waktu per
+#    template SQL (query sebelum parameter diisi).
+# 2. Slow-query log: query yang lebih lambat dari `slow_threshold_ms` dicatat bersama parameternya
+#    dan lokasi pemanggilnya (call site).
+# 3. `with env.assert_queries(max=2): ...` untuk test: gagal jika blok menjalankan lebih dari `max` query.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class QueryStats:
+    """Statistik query milik satu environment."""
+    HISTOGRAM_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, float('inf'))
+
+    def __init__(self, slow_threshold_ms=100.0):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.count = 0
+        self.total_ms = 0.0
+        self.templates = {} # template SQL -> {'count', 'total_ms', 'histogram'}
+        self.slow_queries = []
+        self._captures = [] # List aktif milik `assert_queries`
+
+    @staticmethod
+    def _call_site(frame, depth=4):
+        """Rantai pemanggil terdekat, misalnya 'run_example:120 > __getattribute__:85 > browse:130'."""
+        sites = []
+        while frame is not None and len(sites) < depth:
+            sites.append(f"{frame.f_code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return " > ".join(reversed(sites))
+
+    def record(self, query, params, duration_ms, frame):
+        template = " ".join(query.split())
+        self.count += 1
+        self.total_ms += duration_ms
+
+        stats = self.templates.setdefault(
+            template, {'count': 0, 'total_ms': 0.0, 'histogram': [0] * len(self.HISTOGRAM_BUCKETS_MS)}
+        )
+        stats['count'] += 1
+        stats['total_ms'] += duration_ms
+        bucket = next(i for i, upper in enumerate(self.HISTOGRAM_BUCKETS_MS) if duration_ms <= upper)
+        stats['histogram'][bucket] += 1
+
+        if duration_ms >= self.slow_threshold_ms:
+            self.slow_queries.append({
+                'template': template, 'params': params, 'duration_ms': duration_ms,
+                'call_site': self._call_site(frame),
+            })
+        for captured in self._captures:
+            captured.append((template, params))
+
+    def reset(self):
+        self.__init__(self.slow_threshold_ms)
+
+    def report(self, top=10):
+        print(f"QUERY: {self.count} query, total {self.total_ms:.2f} ms")
+        bucket_labels = [f"<={upper:g}ms" if upper != float('inf') else ">100ms" for upper in self.HISTOGRAM_BUCKETS_MS]
+        ranked = sorted(self.templates.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for template, stats in ranked[:top]:
+            histogram = ", ".join(f"{label}: {n}" for label, n in zip(bucket_labels, stats['histogram']) if n)
+            short = template if len(template) <= 80 else template[:77] + "..."
+            print(f"  - {stats['count']:>5}x {stats['total_ms']:8.2f} ms | {short}")
+            print(f"           histogram: {histogram}")
+
+class InstrumentedCursor(psycopg2.extras.DictCursor):
+    """Cursor yang mencatat setiap `execute` ke `stats` (diisi oleh Environment)."""
+    stats = None
+
+    def execute(self, query, vars=None):
+        if self.stats is None:
+            return super().execute(query, vars)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self.stats.record(query, vars, (time.perf_counter() - start) * 1000, sys._getframe(1))
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Integer(Field): pass
+
+class Many2many(Field):
+    """Field untuk relasi Many2many."""
+    def __init__(self, comodel_name, relation, column1, column2, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.relation = relation
+        self.column1 = column1
+        self.column2 = column2
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                if not isinstance(self._fields.get(key), Many2many):
+                    setattr(self, key, value)
+
+    def __getattribute__(self, name):
+        try:
+            _fields = super().__getattribute__('_fields')
+        except AttributeError:
+            _fields = None
+
+        if _fields and name in _fields and isinstance(_fields[name], Many2many):
+            field = _fields[name]
+            Comodel = self.env[field.comodel_name]
+            query = f"SELECT {field.column2} FROM {field.relation} WHERE {field.column1} = %s"
+            self.env.cr.execute(query, (self.id,))
+            comodel_ids = [row[0] for row in self.env.cr.fetchall()]
+            return Comodel.browse(comodel_ids)
+        return super().__getattribute__(name)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [k for k in values if not isinstance(cls._fields.get(k), Many2many)]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[k] for k in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+        return cls.browse(new_id)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        query = f"SELECT * FROM {cls._table} WHERE id IN %s"
+        cls.env.cr.execute(query, (tuple(record_ids),))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_main_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Integer):
+                field_definitions.append(f"{name} INTEGER")
+
+        query = f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})"
+        cls.env.cr.execute(query)
+        print(f"Table '{cls._table}' is ready.")
+
+    @classmethod
+    def _init_m2m_relations(cls):
+        for name, field in cls._fields.items():
+            if isinstance(field, Many2many):
+                comodel = cls.env[field.comodel_name]
+                cls.env.cr.execute(f"""
+                CREATE TABLE IF NOT EXISTS {field.relation} (
+                    {field.column1} INTEGER REFERENCES {cls._table}(id) ON DELETE CASCADE,
+                    {field.column2} INTEGER REFERENCES {comodel._table}(id) ON DELETE CASCADE,
+                    PRIMARY KEY ({field.column1}, {field.column2})
+                )""")
+                print(f"M2M relation table '{field.relation}' is ready.")
+        cls.env.cr.connection.commit()
+
+class Environment:
+    def __init__(self, cursor, slow_threshold_ms=100.0):
+        self.cr = cursor
+        self.registry = registry
+        self.query_stats = QueryStats(slow_threshold_ms)
+        if isinstance(cursor, InstrumentedCursor):
+            cursor.stats = self.query_stats
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    @contextlib.contextmanager
+    def assert_queries(self, max):
+        """Gagal (AssertionError) jika blok di dalamnya menjalankan lebih dari `max` query."""
+        captured = []
+        self.query_stats._captures.append(captured)
+        try:
+            yield captured
+        finally:
+            self.query_stats._captures.remove(captured)
+        if len(captured) > max:
+            listing = "\n".join(f"    {i}. {template} {params}" for i, (template, params) in enumerate(captured, 1))
+            raise AssertionError(f"Diharapkan maksimal {max} query, tetapi {len(captured)} query dijalankan:\n{listing}")
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class Student(Model):
+    _name = 'res.student'
+    _table = 'res_student'
+    _fields = {
+        'name': Char(string='Student Name'),
+        'course_ids': Many2many('res.course', 'res_student_course_rel', 'student_id', 'course_id', string='Courses'),
+    }
+
+
+@registry.register
+class Course(Model):
+    _name = 'res.course'
+    _table = 'res_course'
+    _fields = {
+        'name': Char(string='Course Name'),
+        'student_ids': Many2many('res.student', 'res_student_course_rel', 'course_id', 'student_id', string='Students'),
+    }
+
+
+BENCH_SCHEMA = 'bench_instrumentation'
+
+def run_query_instrumentation_example():
+    """
+    Fungsi untuk menjalankan contoh instrumentasi query.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=InstrumentedCursor)
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(cr, slow_threshold_ms=5.0)
+    env['res.student']._init_main_table()
+    env['res.course']._init_main_table()
+    env['res.student']._init_m2m_relations()
+
+    # 1. Skenario latihan 11: berapa query yang sebenarnya dijalankan?
+    print("\n--- 1. Skenario Latihan 11 (Many2many) ---")
+    env.query_stats.reset()
+    budi = env['res.student'].create({'name': 'Budi'})
+    ani = env['res.student'].create({'name': 'Ani'})
+    math = env['res.course'].create({'name': 'Matematika Dasar'})
+    phys = env['res.course'].create({'name': 'Fisika Dasar'})
+    for student, course in [(budi, math), (budi, phys), (ani, math)]:
+        cr.execute("INSERT INTO res_student_course_rel (student_id, course_id) VALUES (%s, %s)", (student.id, course.id))
+    conn.commit()
+    for student in env['res.student'].search([]):
+        print(f"Mahasiswa: {student.name} -> {[course.name for course in student.course_ids]}")
+    for course in env['res.course'].search([]):
+        print(f"Mata Kuliah: {course.name} -> {[s.name for s in course.student_ids]}")
+    env.query_stats.report()
+
+    # 2. Slow-query log dengan parameter dan call site.
+    print("\n--- 2. Slow-Query Log (ambang 5 ms) ---")
+    cr.execute("INSERT INTO res_course (name) SELECT 'Kursus ' || i FROM generate_series(1, 200000) i")
+    conn.commit()
+    env.query_stats.reset()
+    found = env['res.course'].search([('name', 'like', '%9999%')])
+    print(f"INFO: {len(found)} kursus ditemukan.")
+    for slow in env.query_stats.slow_queries:
+        print(f"WARNING: {slow['duration_ms']:.1f} ms | {slow['template']} | params={slow['params']}")
+        print(f"         dipanggil dari: {slow['call_site']}")
+
+    # 3. assert_queries untuk test.
+    print("\n--- 3. env.assert_queries(max=2) ---")
+    with env.assert_queries(max=2):
+        courses = budi.course_ids # 1 query tabel relasi + 1 browse
+    print(f"SUCCESS: Membaca course_ids Budi lolos ({len(courses)} kursus).")
+    try:
+        with env.assert_queries(max=2):
+            for student in env['res.student'].browse([budi.id, ani.id]):
+                [course.name for course in student.course_ids]
+    except AssertionError as e:
+        print(f"ERROR: {e}")
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_query_instrumentation_example()
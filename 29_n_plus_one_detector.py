@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import sys
+import time
+import traceback
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Detektor N+1 (mode debug): `NPlusOneDetector` mengamati setiap query dari `InstrumentedCursor`.
+#    Jika template SQL yang sama dijalankan berulang kali dalam satu request dengan parameter satu ID
+#    yang berbeda-beda (misalnya query tabel relasi Many2many per mahasiswa), detektor melaporkannya.
+# 2. Laporan berisi template SQL, jumlah pengulangan, contoh ID, field relasi yang memicunya
+#    (misalnya `res.student.course_ids`), dan call stack.
+# 3. Mode CI: `NPlusOneDetector(threshold=5, raise_error=True)` melempar `NPlusOneError` begitu
+#    ambang terlampaui, sehingga test gagal.
+# 4. Cursor sekarang punya daftar `listeners`; statistik query dari latihan sebelumnya dan detektor
+#    N+1 sama-sama hanya "mendengarkan" setiap execute.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class NPlusOneError(Exception):
+    """Template SQL yang sama dijalankan per ID melebihi ambang yang diizinkan."""
+    pass
+
+class QueryCounter:
+    """Versi ringkas `QueryStats` dari latihan sebelumnya: jumlah query dan total waktu."""
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+
+    def record(self, env, template, params, duration_ms, frame):
+        self.count += 1
+        self.total_ms += duration_ms
+
+class NPlusOneDetector:
+    """Mendeteksi template SQL yang dijalankan berulang dengan parameter satu ID."""
+    def __init__(self, threshold=5, raise_error=False, stack_depth=6):
+        self.threshold = threshold
+        self.raise_error = raise_error
+        self.stack_depth = stack_depth
+        self.reset()
+
+    def reset(self):
+        self._seen = {} # (template, field) -> daftar ID berbeda
+        self.reports = []
+
+    @staticmethod
+    def _single_id(params):
+        """ID tunggal dari parameter seperti (7,), [7], atau ((7,),) milik `IN %s`; selain itu None."""
+        if not isinstance(params, (list, tuple)) or len(params) != 1:
+            return None
+        value = params[0]
+        if isinstance(value, (list, tuple)) and len(value) == 1:
+            value = value[0]
+        return value if isinstance(value, int) else None
+
+    def record(self, env, template, params, duration_ms, frame):
+        record_id = self._single_id(params)
+        if record_id is None:
+            return
+        field = env.field_trail[-1] if env.field_trail else None
+        ids = self._seen.setdefault((template, field), [])
+        if record_id in ids:
+            return
+        ids.append(record_id)
+        if len(ids) != self.threshold + 1:
+            return
+
+        report = {
+            'template': template,
+            'field': field or "(tanpa field relasi, pemanggilan langsung)",
+            'ids': ids, # Terus bertambah setelah laporan dibuat
+            'stack': "".join(traceback.format_list(traceback.extract_stack(frame, limit=self.stack_depth))),
+        }
+        self.reports.append(report)
+        if self.raise_error:
+            raise NPlusOneError(
+                f"N+1 terdeteksi pada {report['field']}: '{template}' dijalankan lebih dari "
+                f"{self.threshold} kali dengan ID berbeda.\n{report['stack']}"
+            )
+
+    def print_report(self):
+        if not self.reports:
+            print("SUCCESS: Tidak ada pola N+1.")
+        for report in self.reports:
+            sample = ", ".join(map(str, report['ids'][:5]))
+            print(f"WARNING: N+1 pada {report['field']}: {len(report['ids'])}x dengan ID berbeda ({sample}, ...)")
+            print(f"         SQL: {report['template']}")
+            print("         Call stack:")
+            for line in report['stack'].rstrip().splitlines():
+                print(f"           {line}")
+
+class InstrumentedCursor(psycopg2.extras.DictCursor):
+    """Cursor yang meneruskan setiap `execute` ke semua `listeners` (diisi oleh Environment)."""
+    env = None
+    listeners = ()
+
+    def execute(self, query, vars=None):
+        if not self.listeners:
+            return super().execute(query, vars)
+        start = time.perf_counter()
+        result = super().execute(query, vars)
+        duration_ms = (time.perf_counter() - start) * 1000
+        template = " ".join(query.split())
+        frame = sys._getframe(1)
+        for listener in self.listeners:
+            listener.record(self.env, template, vars, duration_ms, frame)
+        return result
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Float(Field): pass
+
+class Many2one(Field):
+    def __init__(self, comodel_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+
+class One2many(Field):
+    def __init__(self, comodel_name, inverse_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.inverse_name = inverse_name
+
+class Many2many(Field):
+    def __init__(self, comodel_name, relation, column1, column2, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+        self.relation = relation
+        self.column1 = column1
+        self.column2 = column2
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                if not isinstance(self._fields.get(key), (One2many, Many2many)):
+                    setattr(self, key, value)
+
+    def __getattribute__(self, name):
+        try:
+            _fields = super().__getattribute__('_fields')
+        except AttributeError:
+            _fields = None
+
+        if _fields and name in _fields and isinstance(_fields[name], (One2many, Many2many)):
+            field = _fields[name]
+            env = super().__getattribute__('env')
+            Comodel = env[field.comodel_name]
+            # Catat field yang sedang dibaca agar detektor N+1 tahu siapa pemicunya.
+            with env.reading_field(f"{self._name}.{name}"):
+                if isinstance(field, One2many):
+                    return Comodel.search([(field.inverse_name, '=', self.id)])
+                query = f"SELECT {field.column2} FROM {field.relation} WHERE {field.column1} = %s"
+                env.cr.execute(query, (self.id,))
+                return Comodel.browse([row[0] for row in env.cr.fetchall()])
+        return super().__getattribute__(name)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [k for k in values if not isinstance(cls._fields.get(k), (One2many, Many2many))]
+        column_names = ', '.join(field_names)
+        field_placeholders = ', '.join(['%s'] * len(field_names))
+
+        query = f"INSERT INTO {cls._table} ({column_names}) VALUES ({field_placeholders}) RETURNING id"
+        conn = cls.env.cr.connection
+        cls.env.cr.execute(query, [values[k] for k in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        conn.commit()
+        return cls(cls.env, new_id, values)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query + " ORDER BY id", params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        query = f"SELECT * FROM {cls._table} WHERE id IN %s ORDER BY id"
+        cls.env.cr.execute(query, (tuple(record_ids),))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+            elif isinstance(field, Many2one):
+                comodel_table = field.comodel_name.replace('.', '_')
+                field_definitions.append(f"{name} INTEGER REFERENCES {comodel_table}(id)")
+
+        cls.env.cr.execute(f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})")
+        for name, field in cls._fields.items():
+            if isinstance(field, Many2many):
+                comodel = cls.env[field.comodel_name]
+                cls.env.cr.execute(f"""
+                CREATE TABLE IF NOT EXISTS {field.relation} (
+                    {field.column1} INTEGER REFERENCES {cls._table}(id) ON DELETE CASCADE,
+                    {field.column2} INTEGER REFERENCES {comodel._table}(id) ON DELETE CASCADE,
+                    PRIMARY KEY ({field.column1}, {field.column2})
+                )""")
+        cls.env.cr.connection.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor, n_plus_one=None):
+        self.cr = cursor
+        self.registry = registry
+        self.query_counter = QueryCounter()
+        self.n_plus_one = n_plus_one # NPlusOneDetector, hanya diisi di mode debug/CI
+        self.field_trail = [] # Field relasi yang sedang dibaca, dari luar ke dalam
+        if isinstance(cursor, InstrumentedCursor):
+            cursor.env = self
+            cursor.listeners = [self.query_counter] + ([n_plus_one] if n_plus_one else [])
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    @contextlib.contextmanager
+    def reading_field(self, field_label):
+        self.field_trail.append(field_label)
+        try:
+            yield
+        finally:
+            self.field_trail.pop()
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductCategory(Model):
+    _name = 'product.category'
+    _table = 'product_category'
+    _fields = {
+        'name': Char(string='Nama Kategori'),
+        'product_ids': One2many('product.product', 'category_id', string='Produk'),
+    }
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        'category_id': Many2one('product.category', string='Kategori Produk'),
+    }
+
+@registry.register
+class Course(Model):
+    _name = 'res.course'
+    _table = 'res_course'
+    _fields = {
+        'name': Char(string='Course Name'),
+    }
+
+@registry.register
+class Student(Model):
+    _name = 'res.student'
+    _table = 'res_student'
+    _fields = {
+        'name': Char(string='Student Name'),
+        'course_ids': Many2many('res.course', 'res_student_course_rel', 'student_id', 'course_id', string='Courses'),
+    }
+
+
+def category_overview(env):
+    """Halaman daftar kategori dan jumlah produknya (cara naif, seperti latihan 10)."""
+    return {category.name: len(category.product_ids) for category in env['product.category'].search([])}
+
+
+def category_overview_batched(env):
+    """Halaman yang sama: semua produk dibaca sekaligus, lalu dikelompokkan di Python."""
+    categories = env['product.category'].search([])
+    env.cr.execute("SELECT category_id, count(*) FROM product_product WHERE category_id = ANY(%s) GROUP BY 1",
+                   ([category.id for category in categories],))
+    counts = dict(env.cr.fetchall())
+    return {category.name: counts.get(category.id, 0) for category in categories}
+
+
+def student_schedule(env):
+    """Jadwal semua mahasiswa (cara naif, seperti latihan 11)."""
+    return {student.name: [course.name for course in student.course_ids] for student in env['res.student'].search([])}
+
+
+BENCH_SCHEMA = 'bench_n_plus_one'
+
+def run_n_plus_one_detector_example():
+    """
+    Fungsi untuk menjalankan contoh detektor N+1.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor))
+    for model_name in ('product.category', 'product.product', 'res.course', 'res.student'):
+        env[model_name]._init_table()
+
+    cr.execute("INSERT INTO product_category (name) SELECT 'Kategori ' || i FROM generate_series(1, 20) i")
+    cr.execute("INSERT INTO product_product (name, price, category_id) SELECT 'Produk ' || i, i, i % 20 + 1 FROM generate_series(1, 400) i")
+    cr.execute("INSERT INTO res_course (name) SELECT 'Kursus ' || i FROM generate_series(1, 10) i")
+    cr.execute("INSERT INTO res_student (name) SELECT 'Mahasiswa ' || i FROM generate_series(1, 30) i")
+    cr.execute("INSERT INTO res_student_course_rel SELECT s, c FROM generate_series(1, 30) s, generate_series(1, 10) c WHERE (s + c) % 3 = 0")
+    conn.commit()
+
+    # 1. Mode debug: pola N+1 dilaporkan, request tetap berjalan.
+    print("\n--- 1. Mode Debug: One2many dan Many2many ---")
+    detector = NPlusOneDetector(threshold=5)
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor), n_plus_one=detector)
+    category_overview(env)
+    student_schedule(env)
+    print(f"INFO: {env.query_counter.count} query untuk dua halaman.")
+    detector.print_report()
+
+    # 2. Setelah diperbaiki: jumlah query tetap, tidak ada laporan.
+    print("\n--- 2. Versi yang Diperbaiki ---")
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor), n_plus_one=NPlusOneDetector(threshold=5))
+    assert category_overview_batched(env) == category_overview(Environment(conn.cursor()))
+    print(f"INFO: {env.query_counter.count} query.")
+    env.n_plus_one.print_report()
+
+    # 3. Mode CI: test gagal jika ambang terlampaui.
+    print("\n--- 3. Mode CI (raise_error=True) ---")
+    for test in (category_overview_batched, student_schedule):
+        env = Environment(conn.cursor(cursor_factory=InstrumentedCursor),
+                          n_plus_one=NPlusOneDetector(threshold=5, raise_error=True))
+        try:
+            test(env)
+            print(f"SUCCESS: test {test.__name__} lolos.")
+        except NPlusOneError as e:
+            print(f"ERROR: test {test.__name__} GAGAL -> {str(e).splitlines()[0]}")
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_n_plus_one_detector_example()
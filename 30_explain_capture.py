@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+import json
+import random
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Penangkapan EXPLAIN (opt-in): `Environment(cursor, explain=PlanCapture(...))`. Setiap SELECT yang
+#    lebih lambat dari `threshold_ms`, atau yang terpilih oleh `sample_rate`, dijalankan ulang dengan
+#    `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` memakai parameter yang sama.
+# 2. Plan disimpan bersama template SQL, parameter, dan durasinya. Semua plan bisa dibaca lewat
+#    `env.query_plans()`.
+# 3. Setiap plan diperiksa otomatis:
+#    - Seq Scan pada tabel besar (lebih dari `large_table_rows` baris).
+#    - Estimasi baris yang meleset (perbandingan estimasi dan aktual >= `misestimate_ratio`).
+# 4. EXPLAIN ANALYZE benar-benar menjalankan query sekali lagi, jadi mode ini hanya untuk debugging.
+#    Query selain SELECT tidak pernah di-EXPLAIN.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class PlanCapture:
+    """Menangkap dan memeriksa execution plan untuk query yang lambat atau tersampel."""
+    def __init__(self, threshold_ms=50.0, sample_rate=0.0, large_table_rows=10000, misestimate_ratio=10.0, seed=None):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.large_table_rows = large_table_rows
+        self.misestimate_ratio = misestimate_ratio
+        self._random = random.Random(seed)
+        self._table_sizes = {} # nama tabel -> reltuples dari pg_class
+        self.plans = []
+
+    def record(self, cursor, query, params, duration_ms):
+        # Template (spasi dirapikan) hanya untuk mengelompokkan plan; EXPLAIN memakai query asli,
+        # karena merapikan spasi bisa mengubah literal string di dalam query.
+        template = " ".join(query.split())
+        if not template.upper().startswith("SELECT"):
+            return
+        reason = None
+        if duration_ms >= self.threshold_ms:
+            reason = 'slow'
+        elif self.sample_rate and self._random.random() < self.sample_rate:
+            reason = 'sampled'
+        if reason is None:
+            return
+
+        # Cursor terpisah (tanpa instrumentasi) agar EXPLAIN tidak ditangkap lagi dan tidak menimpa
+        # hasil query asli yang belum di-fetch. Savepoint menjaga transaksi jika EXPLAIN gagal.
+        with cursor.connection.cursor() as explain_cr:
+            explain_cr.execute("SAVEPOINT plan_capture")
+            try:
+                explain_cr.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params)
+                plan = explain_cr.fetchone()[0][0]
+                warnings = self._inspect(explain_cr, plan['Plan'])
+                explain_cr.execute("RELEASE SAVEPOINT plan_capture")
+            except psycopg2.Error as e:
+                explain_cr.execute("ROLLBACK TO SAVEPOINT plan_capture")
+                plan, warnings = None, [f"EXPLAIN gagal: {e}".strip()]
+
+        self.plans.append({
+            'template': template, 'params': params, 'duration_ms': duration_ms, 'reason': reason,
+            'plan': plan, 'warnings': warnings,
+        })
+
+    def _table_size(self, cr, table):
+        if table not in self._table_sizes:
+            cr.execute("SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+            row = cr.fetchone()
+            self._table_sizes[table] = row[0] if row else 0
+        return self._table_sizes[table]
+
+    def _inspect(self, cr, node):
+        """Menelusuri node plan secara rekursif dan mengembalikan daftar peringatan."""
+        warnings = []
+        loops = node.get('Actual Loops', 1)
+        actual = node.get('Actual Rows', 0)
+        estimated = node.get('Plan Rows', 0)
+
+        if node['Node Type'] == 'Seq Scan':
+            scanned = (actual + node.get('Rows Removed by Filter', 0)) * loops
+            table_rows = max(self._table_size(cr, node['Relation Name']), scanned)
+            if table_rows > self.large_table_rows:
+                warnings.append(
+                    f"Seq Scan pada tabel besar '{node['Relation Name']}' (~{int(table_rows)} baris)"
+                    + (f", filter: {node['Filter']}" if 'Filter' in node else "")
+                )
+        if loops and max(actual, estimated) / max(min(actual, estimated), 1) >= self.misestimate_ratio:
+            relation = f" pada '{node['Relation Name']}'" if 'Relation Name' in node else ""
+            warnings.append(f"Estimasi baris meleset di {node['Node Type']}{relation}: estimasi {estimated}, aktual {actual}")
+
+        for child in node.get('Plans', []):
+            warnings.extend(self._inspect(cr, child))
+        return warnings
+
+class InstrumentedCursor(psycopg2.extras.DictCursor):
+    """Cursor yang mengukur setiap `execute` dan meneruskannya ke `plan_capture` (diisi oleh Environment)."""
+    plan_capture = None
+
+    def execute(self, query, vars=None):
+        if self.plan_capture is None:
+            return super().execute(query, vars)
+        start = time.perf_counter()
+        result = super().execute(query, vars)
+        self.plan_capture.record(self, query, vars, (time.perf_counter() - start) * 1000)
+        return result
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Integer(Field): pass
+class Float(Field): pass
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        query = f"SELECT * FROM {cls._table} WHERE id = ANY(%s)"
+        cls.env.cr.execute(query, (record_ids,))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Integer):
+                field_definitions.append(f"{name} INTEGER")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+
+        cls.env.cr.execute(f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})")
+        cls.env.cr.connection.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor, explain=None):
+        self.cr = cursor
+        self.registry = registry
+        self.plan_capture = explain # PlanCapture, hanya diisi jika mode EXPLAIN diaktifkan
+        if isinstance(cursor, InstrumentedCursor):
+            cursor.plan_capture = explain
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def query_plans(self, template=None, flagged_only=False):
+        """Plan yang sudah ditangkap, bisa difilter per template SQL atau hanya yang punya peringatan."""
+        if self.plan_capture is None:
+            return []
+        return [
+            plan for plan in self.plan_capture.plans
+            if (template is None or plan['template'] == template) and (not flagged_only or plan['warnings'])
+        ]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class Product(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'default_code': Char(string='Kode Internal'),
+        'categ_id': Integer(string='Kategori'),
+        'brand_id': Integer(string='Merek'),
+        'price': Float(string='Harga'),
+    }
+
+
+def print_plans(plans):
+    for plan in plans:
+        root = plan['plan']['Plan'] if plan['plan'] else {}
+        print(f"INFO: [{plan['reason']}] {plan['duration_ms']:.1f} ms | {plan['template']} | params={plan['params']}")
+        if root:
+            print(f"      plan: {root['Node Type']}, eksekusi {plan['plan']['Execution Time']:.1f} ms, "
+                  f"shared hit/read: {root.get('Shared Hit Blocks', 0)}/{root.get('Shared Read Blocks', 0)}")
+        for warning in plan['warnings']:
+            print(f"WARNING: {warning}")
+
+
+BENCH_SCHEMA = 'bench_explain'
+
+def run_explain_capture_example():
+    """
+    Fungsi untuk menjalankan contoh penangkapan EXPLAIN.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor))
+    env['product.product']._init_table()
+    # categ_id dan brand_id sengaja berkorelasi penuh: planner mengira keduanya independen.
+    cr.execute("""
+        INSERT INTO product_product (name, default_code, categ_id, brand_id, price)
+        SELECT 'Produk ' || i, 'P' || lpad(i::text, 7, '0'), i % 100, i % 100, i
+        FROM generate_series(1, 300000) i
+    """)
+    cr.execute("ANALYZE product_product")
+    conn.commit()
+
+    # 1. Query lambat tanpa index: plan ditangkap dan Seq Scan ditandai.
+    print("\n--- 1. Query Lambat (ambang 5 ms) ---")
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor), explain=PlanCapture(threshold_ms=5.0))
+    Product = env['product.product']
+    found = Product.search([('default_code', '=', 'P0123456')])
+    print(f"INFO: {len(found)} produk ditemukan.")
+    print_plans(env.query_plans())
+    assert any("Seq Scan" in w for w in env.query_plans()[0]['warnings'])
+
+    # 2. Estimasi baris meleset karena kolom yang berkorelasi.
+    print("\n--- 2. Estimasi Baris Meleset ---")
+    env.plan_capture.plans.clear()
+    found = Product.search([('categ_id', '=', 7), ('brand_id', '=', 7)])
+    print(f"INFO: {len(found)} produk ditemukan.")
+    print_plans(env.query_plans(flagged_only=True))
+    assert any("Estimasi baris meleset" in w for plan in env.query_plans() for w in plan['warnings'])
+
+    # 3. Setelah index dibuat, query cepat tidak lagi ditangkap, kecuali lewat sampling.
+    print("\n--- 3. Setelah Index + Sampling ---")
+    cr.execute("CREATE INDEX product_product_default_code_idx ON product_product (default_code)")
+    conn.commit()
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor), explain=PlanCapture(threshold_ms=5.0))
+    env['product.product'].search([('default_code', '=', 'P0123456')])
+    print(f"INFO: Plan tertangkap tanpa sampling: {len(env.query_plans())}")
+    assert env.query_plans() == []
+
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor),
+                      explain=PlanCapture(threshold_ms=5.0, sample_rate=0.5, seed=42))
+    for i in range(10):
+        env['product.product'].search([('default_code', '=', f'P{i + 1:07d}')])
+    template = "SELECT id FROM product_product WHERE default_code = %s"
+    print(f"INFO: Sampling 50%: {len(env.query_plans(template))} dari 10 pencarian tertangkap.")
+    print_plans(env.query_plans(template)[:1])
+    assert not env.query_plans(flagged_only=True)
+    print("\nINFO: Cuplikan plan JSON:")
+    print(json.dumps(env.query_plans(template)[0]['plan']['Plan'], indent=2)[:400] + "\n  ...")
+
+    # EXPLAIN memakai query asli: literal dengan spasi ganda tidak ikut dirapikan.
+    cr.execute("INSERT INTO product_product (name) VALUES ('Set  Meja  Makan')")
+    env = Environment(conn.cursor(cursor_factory=InstrumentedCursor), explain=PlanCapture(sample_rate=1.0))
+    env.cr.execute("SELECT id FROM product_product WHERE name = 'Set  Meja  Makan'")
+    captured = env.query_plans()[0]
+    print(f"\nINFO: Template '{captured['template']}', baris aktual di plan: {captured['plan']['Plan']['Actual Rows']}")
+    assert env.cr.rowcount == captured['plan']['Plan']['Actual Rows'] == 1, "EXPLAIN tidak memakai query asli!"
+
+    conn.rollback()
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_explain_capture_example()
@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+import collections
+import cProfile
+import functools
+import io
+import pstats
+import random
+import threading
+import time
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Hook profiling: `profiling_hooks` adalah registry listener. Setiap listener menerima event
+#    `on_start`/`on_end` untuk `create`, `search`, `browse`, `write`, `unlink`, method compute,
+#    dan method constraint. Event berisi model, method, jumlah record, durasi, dan jumlah query.
+# 2. Business method (misalnya `action_confirm`) bisa ikut diprofile dengan dekorator
+#    `@profiling_hooks.profiled('action_confirm')`.
+# 3. Listener bawaan:
+#    - `CProfileListener`: menjalankan cProfile pada sebagian (sampel) panggilan tingkat atas.
+#    - `CollapsedStackListener`: mengumpulkan waktu per tumpukan panggilan ORM dalam format
+#      "collapsed stack" yang bisa dibaca flamegraph.pl atau speedscope.
+# 4. Tanpa listener, wrapper hanya melakukan satu pengecekan list kosong sebelum memanggil method
+#    aslinya, sehingga aman dipasang permanen di production.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class ValidationError(Exception):
+    pass
+
+class CountingCursor(psycopg2.extras.DictCursor):
+    """Cursor yang menghitung jumlah `execute`, dipakai hook untuk mengisi `query_count`."""
+    query_count = 0
+
+    def execute(self, query, vars=None):
+        self.query_count += 1
+        return super().execute(query, vars)
+
+class ProfileEvent:
+    """Satu panggilan ORM. Objek yang sama dikirim ke `on_start` lalu ke `on_end`."""
+    __slots__ = ('model', 'method', 'detail', 'record_count', 'depth', 'duration_ms', 'query_count')
+
+    def __init__(self, model, method, detail, record_count, depth):
+        self.model = model
+        self.method = method
+        self.detail = detail # Nama method compute/constraint, None untuk method ORM biasa
+        self.record_count = record_count # Jumlah record input; diperbarui dari hasil saat on_end
+        self.depth = depth # 0 untuk panggilan tingkat atas
+        self.duration_ms = None
+        self.query_count = None
+
+    @property
+    def label(self):
+        return f"{self.model}.{self.detail or self.method}"
+
+class HookRegistry:
+    """Registry listener profiling. Setiap listener punya method `on_start(event)` dan `on_end(event)`."""
+    def __init__(self):
+        self.listeners = []
+        self._local = threading.local() # Kedalaman panggilan per thread
+
+    def add(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def remove(self, listener):
+        self.listeners.remove(listener)
+
+    def profiled(self, method, detail_arg=None):
+        """Dekorator untuk method ORM. `detail_arg` adalah indeks argumen yang menjadi `event.detail`."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(target, *args, **kwargs):
+                if not self.listeners:
+                    return fn(target, *args, **kwargs)
+                detail = args[detail_arg] if detail_arg is not None else None
+                return self._dispatch(method, detail, fn, target, args, kwargs)
+            return wrapper
+        return decorator
+
+    def _dispatch(self, method, detail, fn, target, args, kwargs):
+        listeners = list(self.listeners)
+        depth = getattr(self._local, 'depth', 0)
+        if isinstance(target, Model):
+            record_count = 1
+        elif method == 'browse':
+            record_count = len(args[0]) if isinstance(args[0], list) else 1
+        else:
+            record_count = 1 if method == 'create' else None
+        event = ProfileEvent(target._name, method, detail, record_count, depth)
+        cr = target.env.cr
+        queries_before = getattr(cr, 'query_count', 0)
+
+        for listener in listeners:
+            listener.on_start(event)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        result = None
+        try:
+            result = fn(target, *args, **kwargs)
+            return result
+        finally:
+            event.duration_ms = (time.perf_counter() - start) * 1000
+            self._local.depth = depth
+            event.query_count = getattr(cr, 'query_count', 0) - queries_before
+            if isinstance(result, list):
+                event.record_count = len(result)
+            for listener in reversed(listeners):
+                listener.on_end(event)
+
+profiling_hooks = HookRegistry()
+
+class CProfileListener:
+    """Menjalankan cProfile untuk sebagian panggilan tingkat atas (sampling per panggilan)."""
+    def __init__(self, sample_rate=0.01, methods=None, seed=None):
+        self.sample_rate = sample_rate
+        self.methods = methods # Misalnya {'action_confirm'}; None berarti semua method
+        self._random = random.Random(seed)
+        self._local = threading.local() # cProfile hanya memprofile thread yang mengaktifkannya
+        self._lock = threading.Lock()
+        self.seen = 0
+        self.sampled = 0
+        self.stats = None
+
+    def on_start(self, event):
+        if event.depth or getattr(self._local, 'event', None) is not None:
+            return
+        if self.methods and event.method not in self.methods:
+            return
+        self.seen += 1
+        if self._random.random() >= self.sample_rate:
+            return
+        self._local.event = event
+        self._local.profiler = cProfile.Profile()
+        self._local.profiler.enable()
+
+    def on_end(self, event):
+        if getattr(self._local, 'event', None) is not event:
+            return
+        self._local.profiler.disable()
+        self._local.event = None
+        with self._lock:
+            self.sampled += 1
+            if self.stats is None:
+                self.stats = pstats.Stats(self._local.profiler, stream=io.StringIO())
+            else:
+                self.stats.add(self._local.profiler)
+
+    def format_stats(self, top=10, sort='cumulative'):
+        if self.stats is None:
+            return "(belum ada panggilan yang tersampel)"
+        self.stats.stream = io.StringIO()
+        self.stats.strip_dirs().sort_stats(sort).print_stats(top)
+        return self.stats.stream.getvalue()
+
+class CollapsedStackListener:
+    """Waktu per tumpukan panggilan ORM, misalnya 'sale.order.action_confirm;sale.order.write 1520'."""
+    def __init__(self):
+        self.samples = collections.Counter() # tumpukan -> self time dalam mikrodetik
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def on_start(self, event):
+        self._stack().append([event.label, 0.0]) # [label, total durasi anak]
+
+    def on_end(self, event):
+        stack = self._stack()
+        label, children_ms = stack.pop()
+        path = ";".join([frame[0] for frame in stack] + [label])
+        self.samples[path] += round((event.duration_ms - children_ms) * 1000)
+        if stack:
+            stack[-1][1] += event.duration_ms
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, micros in sorted(self.samples.items()):
+                f.write(f"{stack} {micros}\n")
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string="", compute=None):
+        self.string = string
+        self.compute = compute
+
+class Char(Field): pass
+class Float(Field): pass
+
+class Many2one(Field):
+    def __init__(self, comodel_name, string=""):
+        super().__init__(string)
+        self.comodel_name = comodel_name
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+    _constraints = [] # [('_check_xxx', ['field', ...])]
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        self._cache = {}
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    def __getattribute__(self, name):
+        _fields = super().__getattribute__('_fields')
+        if _fields and name in _fields and _fields[name].compute:
+            _cache = super().__getattribute__('_cache')
+            if name not in _cache:
+                self._run_compute(_fields[name].compute)
+            return _cache[name]
+        return super().__getattribute__(name)
+
+    @profiling_hooks.profiled('compute', detail_arg=0)
+    def _run_compute(self, method_name):
+        getattr(self, method_name)()
+
+    @profiling_hooks.profiled('constraint', detail_arg=0)
+    def _run_constraint(self, method_name):
+        getattr(self, method_name)()
+
+    def _execute_constraints(self, updated_fields):
+        for method_name, constrained_fields in self._constraints:
+            if any(field in updated_fields for field in constrained_fields):
+                self._run_constraint(method_name)
+
+    @classmethod
+    def _stored_fields(cls):
+        return [name for name, field in cls._fields.items() if not field.compute]
+
+    @classmethod
+    @profiling_hooks.profiled('create')
+    def create(cls, values):
+        field_names = [name for name in values if name in cls._stored_fields()]
+        query = (f"INSERT INTO {cls._table} ({', '.join(field_names)}) "
+                 f"VALUES ({', '.join(['%s'] * len(field_names))}) RETURNING id")
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        record = cls(cls.env, cls.env.cr.fetchone()[0], {name: values[name] for name in field_names})
+        record._execute_constraints(field_names)
+        return record
+
+    @classmethod
+    @profiling_hooks.profiled('search')
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query + " ORDER BY id", params)
+        return cls.browse([row[0] for row in cls.env.cr.fetchall()])
+
+    @classmethod
+    @profiling_hooks.profiled('browse')
+    def browse(cls, ids):
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+        if not record_ids:
+            return []
+
+        cls.env.cr.execute(f"SELECT * FROM {cls._table} WHERE id = ANY(%s) ORDER BY id", (record_ids,))
+        colnames = [desc[0] for desc in cls.env.cr.description]
+        results = []
+        for data in cls.env.cr.fetchall():
+            values = dict(zip(colnames, data))
+            results.append(cls(cls.env, values.pop('id'), values))
+
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @profiling_hooks.profiled('write')
+    def write(self, values):
+        set_clauses = ', '.join(f"{name} = %s" for name in values)
+        self.env.cr.execute(f"UPDATE {self._table} SET {set_clauses} WHERE id = %s", list(values.values()) + [self.id])
+        for name, value in values.items():
+            setattr(self, name, value)
+        self._cache.clear() # Nilai compute bisa bergantung pada field yang baru diubah
+        self._execute_constraints(values.keys())
+        return True
+
+    @profiling_hooks.profiled('unlink')
+    def unlink(self):
+        self.env.cr.execute(f"DELETE FROM {self._table} WHERE id = %s", (self.id,))
+        return True
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name in cls._stored_fields():
+            field = cls._fields[name]
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+            elif isinstance(field, Many2one):
+                comodel_table = cls.env[field.comodel_name]._table
+                field_definitions.append(f"{name} INTEGER REFERENCES {comodel_table}(id) ON DELETE CASCADE")
+        cls.env.cr.execute(f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})")
+        for name in cls._stored_fields():
+            if isinstance(cls._fields[name], Many2one):
+                cls.env.cr.execute(f"CREATE INDEX IF NOT EXISTS {cls._table}_{name}_idx ON {cls._table} ({name})")
+        cls.env.cr.connection.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class SaleOrder(Model):
+    _name = 'sale.order'
+    _table = 'sale_order'
+    _fields = {
+        'name': Char(string='Order Reference'),
+        'state': Char(string='Status'),
+        'amount_total': Float(string='Total', compute='_compute_amount_total'),
+    }
+
+    def _compute_amount_total(self):
+        lines = self.env['sale.order.line'].search([('order_id', '=', self.id)])
+        self._cache['amount_total'] = sum(line.price_subtotal for line in lines)
+
+    @profiling_hooks.profiled('action_confirm')
+    def action_confirm(self):
+        if self.state != 'draft':
+            return False
+        if not self.amount_total:
+            raise ValidationError(f"Order {self.name} tidak punya baris bernilai.")
+        self.write({'state': 'sale'})
+        self.env['stock.picking'].create({'origin': self.name, 'state': 'assigned'})
+        return True
+
+@registry.register
+class SaleOrderLine(Model):
+    _name = 'sale.order.line'
+    _table = 'sale_order_line'
+    _fields = {
+        'order_id': Many2one('sale.order', string='Order'),
+        'product_name': Char(string='Product'),
+        'quantity': Float(string='Quantity'),
+        'price_unit': Float(string='Unit Price'),
+        'price_subtotal': Float(string='Subtotal', compute='_compute_price_subtotal'),
+    }
+    _constraints = [
+        ('_check_quantity', ['quantity']),
+    ]
+
+    def _compute_price_subtotal(self):
+        self._cache['price_subtotal'] = self.quantity * self.price_unit
+
+    def _check_quantity(self):
+        if self.quantity <= 0:
+            raise ValidationError("Quantity harus lebih dari nol.")
+
+@registry.register
+class StockPicking(Model):
+    _name = 'stock.picking'
+    _table = 'stock_picking'
+    _fields = {
+        'origin': Char(string='Source Document'),
+        'state': Char(string='Status'),
+    }
+
+
+class PrintListener:
+    """Listener sederhana untuk latihan: mencetak setiap event dengan indentasi sesuai kedalaman."""
+    def on_start(self, event):
+        print(f"{'  ' * event.depth}> {event.label} (record: {event.record_count})")
+
+    def on_end(self, event):
+        print(f"{'  ' * event.depth}< {event.label} {event.duration_ms:.2f} ms, "
+              f"{event.query_count} query, {event.record_count} record")
+
+
+BENCH_SCHEMA = 'bench_profiling'
+
+def run_profiling_hooks_example():
+    """
+    Fungsi untuk menjalankan contoh hook profiling.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=CountingCursor)
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+    env = Environment(cr)
+    for model_name in ('sale.order', 'sale.order.line', 'stock.picking'):
+        env[model_name]._init_table()
+
+    SaleOrder, SaleOrderLine = env['sale.order'], env['sale.order.line']
+    orders = []
+    for i in range(1, 302):
+        order = SaleOrder.create({'name': f'SO{i:04d}', 'state': 'draft'})
+        for j in range(1, 4):
+            SaleOrderLine.create({'order_id': order.id, 'product_name': f'Produk {j}', 'quantity': j, 'price_unit': 10.0 * i})
+        orders.append(order)
+    conn.commit()
+
+    # 1. Semua event untuk satu action_confirm.
+    print("\n--- 1. Event Hook untuk Satu action_confirm ---")
+    listener = profiling_hooks.add(PrintListener())
+    orders[0].action_confirm()
+    picking = env['stock.picking'].search([('origin', '=', orders[0].name)])[0]
+    picking.unlink()
+    profiling_hooks.remove(listener)
+    conn.commit()
+
+    # 2. cProfile per panggilan dengan sampling 5%.
+    print("\n--- 2. CProfileListener (sampling 5% dari action_confirm) ---")
+    cprofile = profiling_hooks.add(CProfileListener(sample_rate=0.05, methods={'action_confirm'}, seed=7))
+    collapsed = profiling_hooks.add(CollapsedStackListener())
+    for order in orders[1:]:
+        order.action_confirm()
+    conn.commit()
+    profiling_hooks.remove(cprofile)
+    profiling_hooks.remove(collapsed)
+    print(f"INFO: {cprofile.sampled} dari {cprofile.seen} action_confirm diprofile.")
+    report = cprofile.format_stats(top=6)
+    print(report[report.index("   ncalls"):].rstrip())
+    assert 0 < cprofile.sampled < cprofile.seen
+
+    # 3. Collapsed stack untuk flame graph.
+    print("\n--- 3. CollapsedStackListener (format flamegraph.pl / speedscope) ---")
+    dump_path = '/tmp/action_confirm.collapsed'
+    collapsed.dump(dump_path)
+    for stack, micros in collapsed.samples.most_common(5):
+        print(f"INFO: {micros / 1000:8.1f} ms | {stack}")
+    print(f"SUCCESS: {len(collapsed.samples)} tumpukan ditulis ke {dump_path} (flamegraph.pl {dump_path} > flame.svg)")
+    assert all(stack.startswith('sale.order.action_confirm') for stack in collapsed.samples)
+
+    # 4. Overhead saat tidak ada listener.
+    print("\n--- 4. Overhead Tanpa Listener ---")
+    line = SaleOrderLine.browse(1)
+    raw_compute = Model._run_compute.__wrapped__
+    for label, call in (("tanpa wrapper", lambda: raw_compute(line, '_compute_price_subtotal')),
+                        ("wrapper, hook nonaktif", lambda: line._run_compute('_compute_price_subtotal'))):
+        start = time.perf_counter()
+        for _ in range(200000):
+            call()
+        print(f"INFO: {label:<24}: {(time.perf_counter() - start) / 200000 * 1e9:6.0f} ns/panggilan (compute tanpa query)")
+    ids = [order.id for order in orders[:50]]
+    for record_id in ids: # Pemanasan: cache plan dan buffer sama untuk kedua varian
+        SaleOrder.browse(record_id)
+    for label, browse in (("browse tanpa wrapper", lambda i: Model.browse.__wrapped__(SaleOrder, i)),
+                          ("browse, hook nonaktif", SaleOrder.browse)):
+        start = time.perf_counter()
+        for _ in range(20):
+            for record_id in ids:
+                browse(record_id)
+        print(f"INFO: {label:<24}: {(time.perf_counter() - start) / 1000 * 1e6:6.1f} us/panggilan")
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_profiling_hooks_example()
@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import http.server
+import threading
+import time
+import urllib.request
+
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Registry metrics (`metrics`) dengan Counter, Gauge, dan Histogram, tanpa library tambahan.
+# 2. `Environment` mencatat query per model/operasi, baris yang di-fetch, dan cache hit/miss.
+#    Angka dikumpulkan dulu di buffer milik environment (tanpa lock), lalu dikirim ke registry saat
+#    `env.commit()` atau `env.flush_metrics()`. Cache hit di `browse` cukup satu penjumlahan dict.
+# 3. `Database.checkout()` meminjam koneksi dari pool dan mencatat jumlah checkout, waktu tunggu,
+#    dan koneksi yang sedang dipakai. `env.commit()` mencatat latensi commit.
+# 4. `metrics.render()` menghasilkan format teks Prometheus (exposition format 0.0.4) dan
+#    `start_metrics_server(port)` menyajikannya di `/metrics` memakai `http.server` bawaan Python.
+
+class Counter:
+    """Nilai yang hanya bertambah, per kombinasi label."""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {} # tuple nilai label -> angka
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, labels=()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, labels=()):
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        for labels, value in sorted(self._values.items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+class Gauge(Counter):
+    """Nilai yang bisa naik turun, misalnya jumlah koneksi yang sedang dipakai."""
+    type = 'gauge'
+
+    def set(self, value, labels=()):
+        with self._lock:
+            self._values[labels] = value
+
+class Histogram:
+    """Distribusi durasi (detik) dengan bucket kumulatif seperti histogram Prometheus."""
+    type = 'histogram'
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float('inf'))
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {} # tuple nilai label -> [jumlah per bucket, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        with self._lock:
+            state = self._values.setdefault(labels, [[0] * len(self.buckets), 0.0, 0])
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        for labels, (bucket_counts, total, count) in sorted(self._values.items()):
+            label_dict = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**label_dict, 'le': '+Inf' if upper == float('inf') else repr(upper)}, cumulative
+            yield f"{self.name}_sum", label_dict, total
+            yield f"{self.name}_count", label_dict, count
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' sudah terdaftar.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+    def render(self):
+        """Semua metric dalam format teks Prometheus."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join(f'{key}="{self._escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+ORM_QUERIES = metrics.counter('orm_queries_total', 'Jumlah query SQL yang dijalankan ORM.', ('model', 'operation'))
+ORM_ROWS_FETCHED = metrics.counter('orm_rows_fetched_total', 'Jumlah baris yang diambil dari database.', ('model',))
+ORM_CACHE_REQUESTS = metrics.counter('orm_cache_requests_total', 'Pembacaan record lewat cache environment.', ('model', 'result'))
+DB_POOL_CHECKOUTS = metrics.counter('db_pool_checkouts_total', 'Jumlah peminjaman koneksi dari pool.')
+DB_POOL_WAIT = metrics.histogram('db_pool_checkout_wait_seconds', 'Waktu menunggu koneksi bebas dari pool.')
+DB_POOL_IN_USE = metrics.gauge('db_pool_connections_in_use', 'Koneksi pool yang sedang dipinjam.')
+DB_COMMIT_DURATION = metrics.histogram('db_commit_duration_seconds', 'Latensi COMMIT.')
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    registry = metrics
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Scrape Prometheus setiap beberapa detik tidak perlu dicetak
+
+def start_metrics_server(port=8000, host='0.0.0.0'):
+    """Menyajikan `/metrics` di thread daemon. Port 0 berarti port bebas dipilih otomatis."""
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class Database:
+    _connection = None
+    _pool = None
+    _slots = None # Semaphore: thread menunggu di sini jika semua koneksi sedang dipinjam
+
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+    @classmethod
+    def get_pool(cls, maxconn=8, **connect_kwargs):
+        if cls._pool is None:
+            try:
+                cls._pool = psycopg2.pool.ThreadedConnectionPool(
+                    1, maxconn, dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432",
+                    **connect_kwargs
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+            cls._slots = threading.BoundedSemaphore(maxconn)
+        return cls._pool
+
+    @classmethod
+    @contextlib.contextmanager
+    def checkout(cls):
+        """Meminjam koneksi dari pool (menunggu jika penuh) sambil mencatat metrics pool."""
+        pool = cls.get_pool()
+        start = time.perf_counter()
+        cls._slots.acquire()
+        conn = pool.getconn()
+        DB_POOL_WAIT.observe(time.perf_counter() - start)
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_IN_USE.inc(1)
+        try:
+            yield conn
+        finally:
+            pool.putconn(conn)
+            DB_POOL_IN_USE.inc(-1)
+            cls._slots.release()
+
+    @classmethod
+    def close_pool(cls):
+        if cls._pool is not None:
+            cls._pool.closeall()
+            cls._pool = cls._slots = None
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Integer(Field): pass
+
+class Model:
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def create(cls, values):
+        field_names = [name for name in cls._fields if name in values]
+        query = (f"INSERT INTO {cls._table} ({', '.join(field_names)}) "
+                 f"VALUES ({', '.join(['%s'] * len(field_names))}) RETURNING *")
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        row = dict(cls.env.cr.fetchone())
+        cls.env.count(ORM_QUERIES, (cls._name, 'create'))
+
+        new_id = row.pop('id')
+        cls.env.cache[(cls._name, new_id)] = row
+        return cls(cls.env, new_id, row)
+
+    def write(self, values):
+        field_names = [name for name in self._fields if name in values]
+        set_clauses = ', '.join(f"{name} = %s" for name in field_names)
+        self.env.cr.execute(f"UPDATE {self._table} SET {set_clauses} WHERE id = %s",
+                            [values[name] for name in field_names] + [self.id])
+        self.env.count(ORM_QUERIES, (self._name, 'write'))
+
+        cached = self.env.cache.setdefault((self._name, self.id), {})
+        for name in field_names:
+            cached[name] = values[name]
+            setattr(self, name, values[name])
+        return True
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query, params)
+        record_ids = [row[0] for row in cls.env.cr.fetchall()]
+        cls.env.count(ORM_QUERIES, (cls._name, 'search'))
+        cls.env.count(ORM_ROWS_FETCHED, (cls._name,), len(record_ids))
+        return cls.browse(record_ids)
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        env = cls.env
+        cache = env.cache
+        model_name = cls._name
+        missing = [record_id for record_id in record_ids if (model_name, record_id) not in cache]
+        if missing:
+            env.cr.execute(f"SELECT * FROM {cls._table} WHERE id IN %s", (tuple(missing),))
+            rows = env.cr.fetchall()
+            for row in rows:
+                values = dict(row)
+                cache[(model_name, values.pop('id'))] = values
+            env.count(ORM_QUERIES, (model_name, 'browse'))
+            env.count(ORM_ROWS_FETCHED, (model_name,), len(rows))
+            env.count(ORM_CACHE_REQUESTS, (model_name, 'miss'), len(missing))
+        # Jalur panas: cache hit hanya satu penjumlahan di dict per model, tanpa tuple label.
+        cache_hits = env._cache_hits
+        if cache_hits is not None:
+            cache_hits[model_name] = cache_hits.get(model_name, 0) + len(record_ids) - len(missing)
+
+        results = [cls(env, record_id, cache[(model_name, record_id)])
+                   for record_id in record_ids if (model_name, record_id) in cache]
+        if is_single_id: return results[0] if results else None
+        return results
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Integer):
+                field_definitions.append(f"{name} INTEGER")
+
+        cls.env.cr.execute(f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})")
+        cls.env.commit()
+        print(f"Table '{cls._table}' is ready.")
+
+class Environment:
+    def __init__(self, cursor, collect_metrics=True):
+        self.cr = cursor
+        self.registry = registry
+        self.cache = {} # (nama model, id) -> dict nilai field, khusus untuk environment ini
+        self._metric_buffer = {} if collect_metrics else None # (metric, label) -> jumlah belum dikirim
+        self._cache_hits = {} if collect_metrics else None # nama model -> cache hit belum dikirim
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def count(self, counter, labels, amount=1):
+        """Menambah counter di buffer environment; tanpa lock karena satu environment = satu thread."""
+        buffer = self._metric_buffer
+        if buffer is not None:
+            key = (counter, labels)
+            buffer[key] = buffer.get(key, 0) + amount
+
+    def flush_metrics(self):
+        if self._metric_buffer:
+            for (counter, labels), amount in self._metric_buffer.items():
+                counter.inc(amount, labels)
+            self._metric_buffer.clear()
+        if self._cache_hits:
+            for model_name, hits in self._cache_hits.items():
+                ORM_CACHE_REQUESTS.inc(hits, (model_name, 'hit'))
+            self._cache_hits.clear()
+
+    def commit(self):
+        start = time.perf_counter()
+        self.cr.connection.commit()
+        DB_COMMIT_DURATION.observe(time.perf_counter() - start)
+        self.flush_metrics()
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class Partner(Model):
+    _name = 'res.partner'
+    _table = 'res_partner'
+    _fields = {
+        'name': Char(string='Name'),
+        'worker_id': Integer(string='Worker'),
+        'score': Integer(string='Score'),
+    }
+
+
+def request_worker(worker_id, requests, errors):
+    """Setiap request meminjam koneksi, membuat dan membaca partner, lalu commit."""
+    try:
+        for i in range(requests):
+            with Database.checkout() as conn:
+                env = Environment(conn.cursor(cursor_factory=psycopg2.extras.DictCursor))
+                Partner = env['res.partner']
+                partner = Partner.create({'name': f'W{worker_id}-{i}', 'worker_id': worker_id, 'score': 0})
+                partner.write({'score': i})
+                for _ in range(5):
+                    Partner.browse(partner.id) # Dari cache environment
+                Partner.search([('worker_id', '=', worker_id)])
+                env.commit()
+                env.cr.close()
+    except Exception as e:
+        errors.append(f"Worker {worker_id}: {type(e).__name__}: {e}")
+
+
+def print_metric_lines(text, prefixes):
+    for line in text.splitlines():
+        if line.startswith(prefixes):
+            print(f"  {line}")
+
+
+BENCH_SCHEMA = 'bench_metrics'
+
+def run_prometheus_metrics_example():
+    """
+    Fungsi untuk menjalankan contoh metrics Prometheus.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+    conn.commit()
+    Database.get_pool(maxconn=4, options=f"-c search_path={BENCH_SCHEMA}")
+    with Database.checkout() as pool_conn:
+        Environment(pool_conn.cursor(cursor_factory=psycopg2.extras.DictCursor))['res.partner']._init_table()
+
+    # 1. Beban kerja: 8 thread berebut 4 koneksi pool.
+    print("\n--- 1. Beban Kerja: 8 Thread, Pool 4 Koneksi ---")
+    errors = []
+    workers = [threading.Thread(target=request_worker, args=(worker_id, 25, errors)) for worker_id in range(1, 9)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert not errors, errors
+    print(f"INFO: {DB_POOL_CHECKOUTS.get()} checkout, rata-rata tunggu "
+          f"{DB_POOL_WAIT._values[()][1] / DB_POOL_WAIT._values[()][2] * 1000:.2f} ms.")
+    hits = ORM_CACHE_REQUESTS.get(('res.partner', 'hit'))
+    misses = ORM_CACHE_REQUESTS.get(('res.partner', 'miss'))
+    print(f"INFO: Cache hit ratio res.partner: {hits / (hits + misses):.1%} ({hits} hit, {misses} miss)")
+    assert ORM_QUERIES.get(('res.partner', 'create')) == 200
+
+    # 2. Format teks Prometheus.
+    print("\n--- 2. metrics.render() ---")
+    print_metric_lines(metrics.render(), ('# TYPE', 'orm_', 'db_pool_checkouts', 'db_pool_connections', 'db_commit_duration_seconds_count'))
+
+    # 3. Endpoint HTTP untuk di-scrape Prometheus.
+    print("\n--- 3. Endpoint HTTP /metrics ---")
+    server = start_metrics_server(port=0, host='127.0.0.1')
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    with urllib.request.urlopen(url) as response:
+        body = response.read().decode('utf-8')
+        print(f"INFO: GET {url} -> {response.status}, {response.headers['Content-Type']}")
+    print_metric_lines(body, ('db_commit_duration_seconds_bucket{le="0.005"}', 'db_commit_duration_seconds_sum'))
+    assert 'orm_queries_total{model="res.partner",operation="browse"}' in body
+    server.shutdown()
+
+    # 4. Overhead di jalur panas browse (record sudah di cache, tanpa query).
+    print("\n--- 4. Overhead browse (Cache Hit) ---")
+    with Database.checkout() as pool_conn:
+        best = {False: float('inf'), True: float('inf')}
+        for _ in range(5): # Bergantian dan ambil yang tercepat agar noise mesin tidak dominan
+            for collect in (True, False):
+                env = Environment(pool_conn.cursor(cursor_factory=psycopg2.extras.DictCursor), collect_metrics=collect)
+                Partner = env['res.partner']
+                Partner.browse(list(range(1, 101)))
+                start = time.perf_counter()
+                for _ in range(200):
+                    for record_id in range(1, 101):
+                        Partner.browse(record_id)
+                best[collect] = min(best[collect], (time.perf_counter() - start) / 20000 * 1e9)
+                env.flush_metrics()
+        print(f"INFO: metrics nonaktif: {best[False]:6.0f} ns/browse")
+        print(f"INFO: metrics aktif   : {best[True]:6.0f} ns/browse (+{best[True] / best[False] - 1:.1%})")
+        pool_conn.rollback()
+
+    Database.close_pool()
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_prometheus_metrics_example()
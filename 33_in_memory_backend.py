@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+import bisect
+import itertools
+import operator
+import re
+import time
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Backend in-memory tanpa database, pengganti list `_data` dari latihan 05. API-nya sama dengan ORM
+#    PostgreSQL: `env['model'].create/search/browse`, `record.write/unlink`.
+# 2. Primary index berupa dict `id -> nilai`, sehingga `browse` tidak lagi memindai list.
+# 3. ID berasal dari counter yang hanya naik (seperti SEQUENCE PostgreSQL). ID lama tidak dipakai
+#    ulang setelah record dihapus, berbeda dengan `len(cls._data) + 1` di latihan 05.
+# 4. Index sekunder opsional per field, dideklarasikan seperti di latihan 17:
+#    - `index='hash'`: dict nilai -> set ID, untuk operator `=` dan `in`.
+#    - `index='sorted'` (atau `index=True`): list terurut + `bisect`, untuk `=`, `<`, `<=`, `>`, `>=`.
+#    Leaf domain yang tidak bisa dilayani index difilter dari kandidat hasil index (atau dari
+#    semua record jika tidak ada index yang cocok).
+# 5. Setiap `Environment` punya storage sendiri, sehingga setiap unit test bisa mulai dari data kosong.
+
+class HashIndex:
+    operators = {'=', 'in'}
+
+    def __init__(self):
+        self._ids_by_value = {}
+
+    def add(self, value, record_id):
+        self._ids_by_value.setdefault(value, set()).add(record_id)
+
+    def remove(self, value, record_id):
+        ids = self._ids_by_value[value]
+        ids.discard(record_id)
+        if not ids:
+            del self._ids_by_value[value]
+
+    def lookup(self, conditions):
+        """ID yang memenuhi semua kondisi `(op, value)` pada field ini."""
+        results = []
+        for op, value in conditions:
+            if op == '=':
+                results.append(self._ids_by_value.get(value, set()))
+            else:
+                results.append(set().union(*(self._ids_by_value.get(item, ()) for item in value)))
+        return results[0].intersection(*results[1:])
+
+class SortedIndex:
+    operators = {'=', '<', '<=', '>', '>='}
+
+    def __init__(self):
+        self._keys = [] # Nilai terurut
+        self._ids = [] # ID pada posisi yang sama dengan `_keys`
+        self._nulls = set() # None tidak bisa dibandingkan, disimpan terpisah
+
+    def add(self, value, record_id):
+        if value is None:
+            self._nulls.add(record_id)
+            return
+        position = bisect.bisect_right(self._keys, value)
+        self._keys.insert(position, value)
+        self._ids.insert(position, record_id)
+
+    def remove(self, value, record_id):
+        if value is None:
+            self._nulls.discard(record_id)
+            return
+        start = bisect.bisect_left(self._keys, value)
+        end = bisect.bisect_right(self._keys, value)
+        position = self._ids.index(record_id, start, end)
+        del self._keys[position]
+        del self._ids[position]
+
+    def _bounds(self, op, value):
+        """Rentang posisi [start, end) di `_keys` untuk satu kondisi."""
+        if op == '=':
+            return bisect.bisect_left(self._keys, value), bisect.bisect_right(self._keys, value)
+        if op == '<':
+            return 0, bisect.bisect_left(self._keys, value)
+        if op == '<=':
+            return 0, bisect.bisect_right(self._keys, value)
+        if op == '>':
+            return bisect.bisect_right(self._keys, value), len(self._keys)
+        return bisect.bisect_left(self._keys, value), len(self._keys) # '>='
+
+    def lookup(self, conditions):
+        """
+        ID yang memenuhi semua kondisi `(op, value)` pada field ini. Beberapa kondisi (misalnya
+        `>= 10` dan `< 12`) digabung menjadi satu irisan rentang, bukan dua set setengah tabel.
+        """
+        start, end = 0, len(self._keys)
+        for op, value in conditions:
+            if value is None:
+                return set(self._nulls) if op == '=' and len(conditions) == 1 else set()
+            lower, upper = self._bounds(op, value)
+            start, end = max(start, lower), min(end, upper)
+        return set(self._ids[start:end]) if start < end else set()
+
+INDEX_TYPES = {'hash': HashIndex, 'sorted': SortedIndex}
+
+def _like(pattern, case_sensitive=True):
+    """Mengubah pola SQL LIKE ('%' dan '_') menjadi regex."""
+    regex = "".join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(regex, 0 if case_sensitive else re.IGNORECASE).fullmatch
+
+# Seperti SQL, NULL (None) tidak pernah lolos perbandingan urutan atau LIKE.
+NULL_SAFE_OPERATORS = {'=', '!=', 'in', 'not in'}
+OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, items: value in items,
+    'not in': lambda value, items: value not in items,
+    'like': lambda value, pattern: _like(pattern)(value) is not None,
+    'ilike': lambda value, pattern: _like(pattern, case_sensitive=False)(value) is not None,
+}
+
+class ModelStore:
+    """Data satu model: primary index, counter ID, dan index sekunder."""
+    def __init__(self, model_class):
+        self.rows = {} # id -> dict nilai field
+        self.sequence = itertools.count(1)
+        self.indexes = {
+            name: INDEX_TYPES['sorted' if field.index is True else field.index]()
+            for name, field in model_class._fields.items() if field.index
+        }
+
+    def insert(self, values):
+        record_id = next(self.sequence)
+        added = []
+        try:
+            for name, index in self.indexes.items():
+                index.add(values.get(name), record_id)
+                added.append((name, index))
+        except Exception:
+            # Nilai ditolak index (mis. tidak bisa dibandingkan): batalkan entri yang sudah masuk.
+            for name, index in added:
+                index.remove(values.get(name), record_id)
+            raise
+        # Row baru terlihat oleh search/browse setelah semua index berhasil diperbarui.
+        self.rows[record_id] = values
+        return record_id
+
+    def update(self, record_id, values):
+        row = self.rows[record_id]
+        changed = []
+        try:
+            for name, value in values.items():
+                index = self.indexes.get(name)
+                if index is None:
+                    continue
+                index.remove(row.get(name), record_id)
+                try:
+                    index.add(value, record_id)
+                except Exception:
+                    index.add(row.get(name), record_id)
+                    raise
+                changed.append((index, row.get(name), value))
+        except Exception:
+            # Sama seperti `insert`: kembalikan entri index field sebelumnya, row belum disentuh.
+            for index, old, new in reversed(changed):
+                index.remove(new, record_id)
+                index.add(old, record_id)
+            raise
+        row.update(values)
+
+    def delete(self, record_id):
+        row = self.rows.pop(record_id)
+        for name, index in self.indexes.items():
+            index.remove(row.get(name), record_id)
+
+    def select(self, domain):
+        """ID (terurut) yang memenuhi semua leaf domain."""
+        indexed_conditions, remaining = {}, []
+        for field, op, value in domain:
+            index = self.indexes.get(field)
+            if index is not None and op in index.operators:
+                indexed_conditions.setdefault(field, []).append((op, value))
+            else:
+                remaining.append((field, OPERATORS[op], op in NULL_SAFE_OPERATORS, value))
+        indexed = [self.indexes[field].lookup(conditions) for field, conditions in indexed_conditions.items()]
+
+        if indexed:
+            indexed.sort(key=len) # Mulai dari kandidat paling sedikit
+            candidates = indexed[0].intersection(*indexed[1:])
+        else:
+            candidates = self.rows.keys()
+
+        def matches(row):
+            for field, compare, null_safe, value in remaining:
+                current = row.get(field)
+                if current is None and not null_safe:
+                    return False
+                if not compare(current, value):
+                    return False
+            return True
+
+        rows = self.rows
+        return sorted(record_id for record_id in candidates if matches(rows[record_id]))
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string="", index=False):
+        if index not in (False, None, True) and index not in INDEX_TYPES:
+            raise ValueError(f"Tipe index '{index}' tidak dikenal. Gunakan True atau salah satu dari {list(INDEX_TYPES)}.")
+        self.string = string
+        self.index = index
+
+class Char(Field): pass
+class Integer(Field): pass
+class Float(Field): pass
+
+class Model:
+    _name = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _store(cls):
+        return cls.env.storage(cls)
+
+    @classmethod
+    def _check_fields(cls, values):
+        unknown = [name for name in values if name not in cls._fields]
+        if unknown:
+            raise ValueError(f"Field {unknown} tidak ada di model '{cls._name}'.")
+
+    @classmethod
+    def create(cls, values):
+        cls._check_fields(values)
+        row = {name: values.get(name) for name in cls._fields}
+        record_id = cls._store().insert(row)
+        return cls(cls.env, record_id, row)
+
+    @classmethod
+    def search(cls, domain):
+        return cls.browse(cls._store().select(domain or []))
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        rows = cls._store().rows
+        # Salinan nilai: mengubah atribut record tanpa `write` tidak boleh mengubah storage.
+        results = [cls(cls.env, record_id, dict(rows[record_id])) for record_id in record_ids if record_id in rows]
+        if is_single_id: return results[0] if results else None
+        return results
+
+    def write(self, values):
+        self._check_fields(values)
+        self._store().update(self.id, values)
+        for name, value in values.items():
+            setattr(self, name, value)
+        return True
+
+    def unlink(self):
+        self._store().delete(self.id)
+        return True
+
+class Environment:
+    def __init__(self):
+        self.registry = registry
+        self._stores = {} # nama model -> ModelStore, khusus untuk environment ini
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def storage(self, model_class):
+        if model_class._name not in self._stores:
+            self._stores[model_class._name] = ModelStore(model_class)
+        return self._stores[model_class._name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductTemplate(Model):
+    _name = 'product.template'
+    _fields = {
+        'name': Char(string='Nama Produk', index='hash'),
+        'categ': Char(string='Kategori', index='hash'),
+        'quantity_on_hand': Integer(string='Stok'),
+        'list_price': Float(string='Harga Jual', index='sorted'),
+    }
+
+@registry.register
+class ProductTemplateNoIndex(Model):
+    """Model yang sama tanpa index sekunder, untuk perbandingan."""
+    _name = 'product.template.noindex'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'categ': Char(string='Kategori'),
+        'quantity_on_hand': Integer(string='Stok'),
+        'list_price': Float(string='Harga Jual'),
+    }
+
+
+class LegacyListModel:
+    """Cara latihan 05: list `_data`, ID dari `len(_data) + 1`, pencarian dengan memindai list."""
+    def __init__(self):
+        self._data = []
+
+    def create(self, values):
+        record = {'id': len(self._data) + 1, **values}
+        self._data.append(record)
+        return record
+
+    def browse(self, record_id):
+        return next((record for record in self._data if record['id'] == record_id), None)
+
+    def search(self, domain):
+        return [record for record in self._data
+                if all(OPERATORS[op](record.get(field), value) for field, op, value in domain)]
+
+    def unlink(self, record_id):
+        self._data.remove(self.browse(record_id))
+
+
+def timed(label, fn, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    per_call = (time.perf_counter() - start) / repeat * 1e6
+    print(f"INFO: {label:<24}: {per_call:10.1f} us/panggilan")
+    return per_call
+
+
+def run_in_memory_backend_example():
+    """
+    Fungsi untuk menjalankan contoh backend in-memory.
+    """
+    # 1. Bug ID di latihan 05 setelah record dihapus.
+    print("\n--- 1. ID Setelah Unlink: Latihan 05 vs Backend Baru ---")
+    legacy = LegacyListModel()
+    for name in ('Kursi', 'Meja', 'Lampu'):
+        legacy.create({'name': name})
+    legacy.unlink(2)
+    lemari = legacy.create({'name': 'Lemari'})
+    duplicates = [record['name'] for record in legacy._data if record['id'] == lemari['id']]
+    print(f"ERROR: Latihan 05 memberi ID {lemari['id']} ke 'Lemari', bentrok dengan {duplicates}.")
+
+    env = Environment()
+    Product = env['product.template']
+    for name in ('Kursi', 'Meja', 'Lampu'):
+        Product.create({'name': name, 'categ': 'Furnitur', 'quantity_on_hand': 5, 'list_price': 100.0})
+    Product.browse(2).unlink()
+    lemari = Product.create({'name': 'Lemari', 'categ': 'Furnitur', 'quantity_on_hand': 1, 'list_price': 900.0})
+    print(f"SUCCESS: Backend baru memberi ID {lemari.id}; ID yang ada: {[p.id for p in Product.search([])]}")
+    assert [p.id for p in Product.search([])] == [1, 3, 4]
+
+    # 2. API sama dengan ORM PostgreSQL.
+    print("\n--- 2. create/search/browse/write/unlink ---")
+    Product.browse(1).write({'list_price': 150.0})
+    print(f"HASIL: search harga >= 150: {[p.name for p in Product.search([('list_price', '>=', 150.0)])]}")
+    print(f"HASIL: search nama ilike 'l%': {[p.name for p in Product.search([('name', 'ilike', 'l%')])]}")
+    try:
+        Product.create({'name': 'Rak', 'warna': 'Putih'})
+    except ValueError as e:
+        print(f"ERROR: {e}")
+    try:
+        Product.create({'name': 'Rak', 'categ': 'Furnitur', 'list_price': 'murah'})
+    except TypeError as e:
+        print(f"ERROR: Harga 'murah' ditolak index sorted ({e})")
+    assert [p.id for p in Product.search([])] == [1, 3, 4] and Product.search([('name', '=', 'Rak')]) == []
+    print("INFO: create yang gagal tidak meninggalkan record maupun entri index.")
+    kursi = Product.browse(1)
+    try:
+        kursi.write({'categ': 'Kantor', 'list_price': 'murah'})
+    except TypeError as e:
+        print(f"ERROR: write harga 'murah' ditolak index sorted ({e})")
+    assert [p.id for p in Product.search([('list_price', '=', 150.0)])] == [1]
+    assert [p.id for p in Product.search([('categ', '=', 'Furnitur')])] == [1, 3, 4]
+    assert Product.browse(1).categ == 'Furnitur' and Product.search([('categ', '=', 'Kantor')]) == []
+    print("INFO: write yang gagal tidak mengubah row maupun index.")
+    fresh = Environment()
+    print(f"INFO: Environment baru (misalnya test berikutnya) mulai kosong: {fresh['product.template'].search([])}")
+
+    # 3. Performa pada 100.000 record.
+    print("\n--- 3. Performa pada 100.000 Record ---")
+    env = Environment()
+    Indexed, Unindexed = env['product.template'], env['product.template.noindex']
+    legacy = LegacyListModel()
+    start = time.perf_counter()
+    for i in range(100000):
+        values = {'name': f'Produk {i}', 'categ': f'Kategori {i % 50}', 'quantity_on_hand': i % 30, 'list_price': float(i % 5000)}
+        Indexed.create(values)
+        Unindexed.create(values)
+        legacy.create(values)
+    print(f"INFO: 3 x 100.000 create dalam {time.perf_counter() - start:.2f} detik.")
+
+    comparisons = [
+        ("browse(id) (primary index dict)", lambda i: Indexed.browse(i * 997 % 100000 + 1),
+         lambda i: Unindexed.browse(i * 997 % 100000 + 1), lambda i: legacy.browse(i * 997 % 100000 + 1)),
+        ("search name = (hash)", lambda i: Indexed.search([('name', '=', f'Produk {i * 997 % 100000}')]),
+         lambda i: Unindexed.search([('name', '=', f'Produk {i * 997 % 100000}')]),
+         lambda i: legacy.search([('name', '=', f'Produk {i * 997 % 100000}')])),
+        ("search harga 10..12 & kategori (sorted+hash)",
+         lambda i: Indexed.search([('list_price', '>=', 10.0 + i), ('list_price', '<', 12.0 + i), ('categ', '=', f'Kategori {(10 + i) % 50}')]),
+         lambda i: Unindexed.search([('list_price', '>=', 10.0 + i), ('list_price', '<', 12.0 + i), ('categ', '=', f'Kategori {(10 + i) % 50}')]),
+         lambda i: legacy.search([('list_price', '>=', 10.0 + i), ('list_price', '<', 12.0 + i), ('categ', '=', f'Kategori {(10 + i) % 50}')])),
+    ]
+    as_ids = lambda result: [r['id'] if isinstance(r, dict) else r.id for r in (result if isinstance(result, list) else [result])]
+    for label, indexed_fn, unindexed_fn, legacy_fn in comparisons:
+        print(f"\n{label}:")
+        for i in range(5):
+            assert as_ids(indexed_fn(i)) == as_ids(unindexed_fn(i)) == as_ids(legacy_fn(i))
+        fast = timed("index (backend baru)", indexed_fn, 200)
+        timed("tanpa index (scan dict)", unindexed_fn, 20)
+        slowest = timed("list latihan 05", legacy_fn, 20)
+        print(f"HASIL: {slowest / fast:,.0f}x lebih cepat dari latihan 05.")
+
+    Indexed.browse(500).write({'list_price': 99999.0})
+    assert [p.id for p in Indexed.search([('list_price', '>', 5000.0)])] == [500]
+    Indexed.browse(500).unlink()
+    assert Indexed.search([('list_price', '>', 5000.0)]) == []
+    print("\nSUCCESS: Index sekunder tetap konsisten setelah write dan unlink.")
+
+if __name__ == "__main__":
+    run_in_memory_backend_example()
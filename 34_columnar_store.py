@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+import itertools
+import operator
+import re
+import time
+
+import numpy as np
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Backend in-memory kolumnar: setiap field disimpan sebagai satu array NumPy, bukan dict per
+#    record seperti latihan 33.
+#    - Float -> float64, Integer -> int64, masing-masing dengan array `valid` untuk None (NULL).
+#    - Char -> dictionary encoding: array kode int32 + daftar nilai unik (kode -1 berarti None).
+# 2. Domain diterjemahkan menjadi mask boolean yang dihitung sekaligus untuk seluruh kolom
+#    (vectorized), lalu semua mask digabung dengan `&`. Untuk Char, operator dievaluasi pada
+#    daftar nilai unik (kecil), lalu kode yang cocok dicari di array kode.
+# 3. ID monoton dan record tidak pernah dipindah, sehingga posisi record = `id - 1` (primary index
+#    tanpa dict). `unlink` hanya menandai `alive = False`.
+# 4. `Model.bulk_create({'field': array, ...})` memuat banyak record sekaligus dari array (seperti
+#    COPY), untuk data analitik berukuran jutaan baris.
+# 5. API create/search/browse/write/unlink sama dengan latihan 33.
+
+def _like(pattern, case_sensitive=True):
+    """Mengubah pola SQL LIKE ('%' dan '_') menjadi regex."""
+    regex = "".join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(regex, 0 if case_sensitive else re.IGNORECASE).fullmatch
+
+# Seperti SQL, NULL (None) tidak pernah lolos perbandingan urutan atau LIKE.
+NULL_SAFE_OPERATORS = {'=', '!=', 'in', 'not in'}
+OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda value, items: value in items,
+    'not in': lambda value, items: value not in items,
+    'like': lambda value, pattern: _like(pattern)(value) is not None,
+    'ilike': lambda value, pattern: _like(pattern, case_sensitive=False)(value) is not None,
+}
+
+class Column:
+    """Dasar kolom: mask untuk baris non-NULL dihitung subclass, aturan NULL diterapkan di sini."""
+    def mask(self, op, value, n):
+        matches = self.value_mask(op, value, n)
+        if op in NULL_SAFE_OPERATORS and OPERATORS[op](None, value):
+            return matches | ~self.not_null_mask(n)
+        return matches & self.not_null_mask(n)
+
+class NumericColumn(Column):
+    NUMPY_OPERATORS = {'=': np.equal, '!=': np.not_equal, '<': np.less, '<=': np.less_equal,
+                       '>': np.greater, '>=': np.greater_equal}
+
+    def __init__(self, dtype, capacity):
+        self.dtype = dtype
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.valid = np.zeros(capacity, dtype=bool)
+
+    def resize(self, capacity):
+        for name in ('data', 'valid'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def convert(self, value):
+        """Nilai Python -> skalar numpy kolom ini; gagal di sini sebelum ada array yang diubah."""
+        return None if value is None else self.data.dtype.type(value)
+
+    def set(self, position, value):
+        # `value` sudah melalui `convert`, jadi penulisan berikut tidak bisa gagal di tengah jalan.
+        self.data[position] = 0 if value is None else value
+        self.valid[position] = value is not None
+
+    def set_many(self, start, values):
+        self.data[start:start + len(values)] = values
+        self.valid[start:start + len(values)] = True
+
+    def get(self, position):
+        return self.data[position].item() if self.valid[position] else None
+
+    def not_null_mask(self, n):
+        return self.valid[:n]
+
+    def value_mask(self, op, value, n):
+        data = self.data[:n]
+        if op in ('in', 'not in'):
+            return np.isin(data, [item for item in value if item is not None], invert=(op == 'not in'))
+        if op in ('like', 'ilike'):
+            raise ValueError(f"Operator '{op}' tidak bisa dipakai pada field angka.")
+        if value is None:
+            return np.full(n, op == '!=')
+        return self.NUMPY_OPERATORS[op](data, value)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.valid.nbytes
+
+class DictionaryColumn(Column):
+    """Char dengan dictionary encoding: setiap nilai unik disimpan sekali, baris hanya menyimpan kodenya."""
+    def __init__(self, capacity):
+        self.codes = np.full(capacity, -1, dtype=np.int32)
+        self.values = [] # kode -> nilai
+        self.code_by_value = {} # nilai -> kode
+
+    def resize(self, capacity):
+        new = np.full(capacity, -1, dtype=np.int32)
+        new[:len(self.codes)] = self.codes
+        self.codes = new
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        code = self.code_by_value.get(value)
+        if code is None:
+            code = self.code_by_value[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def convert(self, value):
+        hash(value) # Nilai harus bisa menjadi kunci `code_by_value`
+        return value
+
+    def set(self, position, value):
+        self.codes[position] = self.encode(value)
+
+    def set_many(self, start, values):
+        encode = self.encode
+        self.codes[start:start + len(values)] = np.fromiter(map(encode, values), dtype=np.int32, count=len(values))
+
+    def get(self, position):
+        code = self.codes[position]
+        return self.values[code] if code >= 0 else None
+
+    def not_null_mask(self, n):
+        return self.codes[:n] >= 0
+
+    def value_mask(self, op, value, n):
+        codes = self.codes[:n]
+        if op == '=':
+            code = self.code_by_value.get(value)
+            return codes == code if code is not None else np.zeros(n, dtype=bool)
+        if value is None and op not in ('!=', 'in', 'not in'):
+            return np.zeros(n, dtype=bool)
+        # Operator dievaluasi pada daftar nilai unik (kecil), bukan pada setiap baris. Hasilnya tabel
+        # boolean per kode; slot terakhir (indeks -1) untuk NULL, yang diatur oleh `Column.mask`.
+        compare = OPERATORS[op]
+        lookup = np.zeros(len(self.values) + 1, dtype=bool)
+        lookup[:-1] = [compare(candidate, value) for candidate in self.values]
+        return lookup[codes]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes
+
+class ColumnStore:
+    """Data satu model dalam bentuk kolom. Posisi record di setiap array = id - 1."""
+    def __init__(self, model_class, capacity=1024):
+        self.capacity = capacity
+        self.count = 0 # Jumlah posisi yang sudah terpakai (termasuk record yang sudah dihapus)
+        self.sequence = itertools.count(1)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.columns = {}
+        for name, field in model_class._fields.items():
+            if isinstance(field, Char):
+                self.columns[name] = DictionaryColumn(capacity)
+            else:
+                self.columns[name] = NumericColumn(np.float64 if isinstance(field, Float) else np.int64, capacity)
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        self.capacity = max(needed, self.capacity * 2)
+        alive = np.zeros(self.capacity, dtype=bool)
+        alive[:len(self.alive)] = self.alive
+        self.alive = alive
+        for column in self.columns.values():
+            column.resize(self.capacity)
+
+    def _convert(self, values):
+        """Memvalidasi semua nilai dulu, agar create/write yang gagal tidak mengubah kolom apa pun."""
+        return {name: self.columns[name].convert(value) for name, value in values.items()}
+
+    def insert(self, values):
+        values = self._convert({name: values.get(name) for name in self.columns})
+        self._reserve(1)
+        record_id = next(self.sequence)
+        position = record_id - 1
+        for name, column in self.columns.items():
+            column.set(position, values[name])
+        self.alive[position] = True
+        self.count = record_id
+        return record_id
+
+    def insert_many(self, columns):
+        size = len(next(iter(columns.values())))
+        self._reserve(size)
+        start = self.count
+        for name, values in columns.items():
+            self.columns[name].set_many(start, values)
+        self.alive[start:start + size] = True
+        first_id = next(self.sequence)
+        self.sequence = itertools.count(first_id + size)
+        self.count = start + size
+        return range(first_id, first_id + size)
+
+    def read(self, record_id):
+        position = record_id - 1
+        if not (0 <= position < self.count and self.alive[position]):
+            return None
+        return {name: column.get(position) for name, column in self.columns.items()}
+
+    def update(self, record_id, values):
+        for name, value in self._convert(values).items():
+            self.columns[name].set(record_id - 1, value)
+
+    def delete(self, record_id):
+        self.alive[record_id - 1] = False
+
+    def compile(self, domain):
+        """Memeriksa domain sekali dan mengembalikan fungsi yang menghitung mask untuk `n` baris pertama."""
+        leaves = []
+        for field, op, value in domain:
+            if field not in self.columns:
+                raise ValueError(f"Field '{field}' tidak ada di model.")
+            if op not in OPERATORS:
+                raise ValueError(f"Operator '{op}' tidak dikenal.")
+            leaves.append((self.columns[field], op, value))
+
+        def evaluate(n):
+            mask = self.alive[:n].copy()
+            for column, op, value in leaves:
+                np.logical_and(mask, column.mask(op, value, n), out=mask)
+            return mask
+        return evaluate
+
+    def select(self, domain):
+        mask = self.compile(domain)(self.count)
+        return (np.flatnonzero(mask) + 1).tolist()
+
+    @property
+    def nbytes(self):
+        return self.alive.nbytes + sum(column.nbytes for column in self.columns.values())
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string=""):
+        self.string = string
+
+class Char(Field): pass
+class Integer(Field): pass
+class Float(Field): pass
+
+class Model:
+    _name = None
+    _fields = None
+
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    @classmethod
+    def _store(cls):
+        return cls.env.storage(cls)
+
+    @classmethod
+    def _check_fields(cls, values):
+        unknown = [name for name in values if name not in cls._fields]
+        if unknown:
+            raise ValueError(f"Field {unknown} tidak ada di model '{cls._name}'.")
+
+    @classmethod
+    def create(cls, values):
+        cls._check_fields(values)
+        record_id = cls._store().insert(values)
+        return cls(cls.env, record_id, {name: values.get(name) for name in cls._fields})
+
+    @classmethod
+    def bulk_create(cls, columns):
+        """Memuat banyak record dari array per field (semua array sama panjang). Mengembalikan range ID."""
+        cls._check_fields(columns)
+        return cls._store().insert_many(columns)
+
+    @classmethod
+    def search(cls, domain):
+        return cls.browse(cls._store().select(domain or []))
+
+    @classmethod
+    def search_count(cls, domain):
+        return int(np.count_nonzero(cls._store().compile(domain or [])(cls._store().count)))
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        store = cls._store()
+        results = []
+        for record_id in record_ids:
+            values = store.read(record_id)
+            if values is not None:
+                results.append(cls(cls.env, record_id, values))
+        if is_single_id: return results[0] if results else None
+        return results
+
+    def write(self, values):
+        self._check_fields(values)
+        self._store().update(self.id, values)
+        for name, value in values.items():
+            setattr(self, name, value)
+        return True
+
+    def unlink(self):
+        self._store().delete(self.id)
+        return True
+
+class Environment:
+    def __init__(self):
+        self.registry = registry
+        self._stores = {} # nama model -> ColumnStore, khusus untuk environment ini
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+        return self._models[model_name]
+
+    def storage(self, model_class):
+        if model_class._name not in self._stores:
+            self._stores[model_class._name] = ColumnStore(model_class)
+        return self._stores[model_class._name]
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductProduct(Model):
+    _name = 'product.product'
+    _fields = {
+        'category': Char(string='Kategori'),
+        'brand': Char(string='Merek'),
+        'price': Float(string='Harga'),
+        'qty_available': Integer(string='Stok'),
+    }
+
+
+CATEGORIES = ['Electronics', 'Books', 'Furniture', 'Toys', 'Garden', 'Sports', 'Food', 'Beauty', 'Music', 'Office']
+
+def generate_columns(size, seed=42):
+    """Data sintetis: harga berdistribusi eksponensial (banyak barang murah, sedikit yang mahal)."""
+    rng = np.random.default_rng(seed)
+    brands = np.array([f'Brand {i:03d}' for i in range(1000)], dtype=object)
+    return {
+        'category': np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), size)],
+        'brand': brands[rng.integers(0, len(brands), size)],
+        'price': np.round(rng.exponential(100.0, size), 2),
+        'qty_available': rng.integers(0, 500, size),
+    }
+
+
+def run_columnar_store_example():
+    """
+    Fungsi untuk menjalankan contoh backend kolumnar.
+    """
+    # 1. API sama dengan latihan 33.
+    print("\n--- 1. create/search/browse/write/unlink ---")
+    env = Environment()
+    Product = env['product.product']
+    laptop = Product.create({'category': 'Electronics', 'brand': 'Brand 001', 'price': 1500.0, 'qty_available': 3})
+    Product.create({'category': 'Books', 'brand': 'Brand 002', 'price': 12.5, 'qty_available': 40})
+    Product.create({'category': 'Electronics', 'brand': None, 'price': 850.0, 'qty_available': None})
+    laptop.write({'price': 1450.0})
+    print(f"HASIL: Electronics > 1000: {[(p.id, p.price) for p in Product.search([('price', '>', 1000), ('category', '=', 'Electronics')])]}")
+    print(f"HASIL: brand != 'Brand 001' (NULL ikut, seperti latihan 33): {[p.id for p in Product.search([('brand', '!=', 'Brand 001')])]}")
+    print(f"HASIL: qty_available < 10 (NULL tidak ikut): {[p.id for p in Product.search([('qty_available', '<', 10)])]}")
+    Product.browse(2).unlink()
+
+    # Nilai yang ditolak kolom tidak boleh mengubah kolom lain, NULL, atau menghabiskan ID.
+    for action in (lambda: Product.browse(3).write({'brand': 'Brand 003', 'qty_available': 'banyak'}),
+                   lambda: Product.create({'category': 'Toys', 'price': 'murah'})):
+        try:
+            action()
+        except ValueError as e:
+            print(f"ERROR: Ditolak: {e}")
+    assert Product.browse(3).brand is None and Product.browse(3).qty_available is None
+    assert Product.search_count([('qty_available', '=', None)]) == 1
+    print(f"HASIL: Setelah unlink ID 2: {[p.id for p in Product.search([])]}, record baru mendapat ID "
+          f"{Product.create({'category': 'Toys', 'price': 5.0}).id}")
+    assert Product.search([('category', '=', 'Toys')])[0].id == 4
+
+    # 2. Dibandingkan dengan record berupa dict (latihan 33, tanpa index) pada 1 juta baris.
+    print("\n--- 2. Dict per Record vs Kolumnar (1.000.000 Baris) ---")
+    columns = generate_columns(1_000_000)
+    env = Environment()
+    Product = env['product.product']
+    Product.bulk_create(columns)
+    rows = {record_id: {name: columns[name][record_id - 1] for name in columns} for record_id in range(1, 1_000_001)}
+    domain = [('price', '>', 500), ('category', '=', 'Electronics')]
+
+    start = time.perf_counter()
+    row_ids = [record_id for record_id, row in rows.items() if row['price'] > 500 and row['category'] == 'Electronics']
+    row_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    column_ids = Product._store().select(domain)
+    column_ms = (time.perf_counter() - start) * 1000
+    assert row_ids == column_ids
+    print(f"INFO: dict per record: {row_ms:8.1f} ms | kolumnar: {column_ms:6.1f} ms | {len(column_ids)} record | {row_ms / column_ms:.0f}x")
+    del rows
+
+    # 3. 10 juta baris.
+    print("\n--- 3. Kolumnar pada 10.000.000 Baris ---")
+    env = Environment()
+    Product = env['product.product']
+    start = time.perf_counter()
+    Product.bulk_create(generate_columns(10_000_000))
+    store = Product._store()
+    print(f"INFO: bulk_create 10 juta baris dalam {time.perf_counter() - start:.1f} detik, "
+          f"memori kolom {store.nbytes / 1024 ** 2:.0f} MB "
+          f"(category: {len(store.columns['category'].values)} nilai unik, brand: {len(store.columns['brand'].values)}).")
+
+    domain = [('price', '>', 1000), ('category', '=', 'Electronics')]
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        found = Product.search(domain)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"HASIL: search({domain}) -> {len(found)} record dalam {min(timings):.1f} ms (terbaik dari 5).")
+    assert all(p.price > 1000 and p.category == 'Electronics' for p in found)
+
+    for label, other_domain in (("brand ilike '%99'", [('brand', 'ilike', '%99')]),
+                                ("category in (...) & qty < 5", [('category', 'in', ['Books', 'Toys']), ('qty_available', '<', 5)])):
+        start = time.perf_counter()
+        total = Product.search_count(other_domain)
+        print(f"HASIL: search_count {label}: {total} record dalam {(time.perf_counter() - start) * 1000:.1f} ms.")
+
+if __name__ == "__main__":
+    run_columnar_store_example()
@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+import array
+import collections
+import gc
+import sys
+import time
+import tracemalloc
+
+import psycopg2
+import psycopg2.extras
+
+# =================================================================================================
+# SIMULASI ODOO ORM FRAMEWORK (BAGIAN INI JANGAN DIUBAH)
+# =================================================================================================
+# Framework diperbarui untuk mendukung:
+# 1. Record ringan: instance model hanya menyimpan `id` di `__slots__`, tanpa `__dict__`.
+#    - `env` sudah dibawa oleh class model terikat (`env['product.product']`), jadi tidak perlu
+#      disimpan ulang di setiap record.
+#    - `MetaModel` memberi `__slots__ = ()` ke setiap subclass (termasuk subclass terikat
+#      environment), karena satu class tanpa `__slots__` di rantai pewarisan sudah cukup untuk
+#      memunculkan `__dict__` lagi.
+# 2. Nilai field disimpan di cache milik environment, satu `RecordCache` per model:
+#    - `positions`: id -> posisi, dipakai bersama oleh semua kolom.
+#    - Satu kolom per field tersimpan: `array('d')` untuk Float, `array('q')` untuk Integer (angka
+#      disimpan mentah 8 byte, bukan objek float/int), list untuk Char. NULL dicatat di set `nulls`.
+#    - Nilai computed field di dict terpisah, id -> nilai.
+#    Record dengan ID yang sama dari dua search berbeda berbagi nilai yang sama.
+# 3. Field adalah descriptor (latihan 13): `__get__` membaca cache, mengambil baris dari database
+#    jika belum ada, atau menjalankan method compute. Assignment ke field tersimpan = `write()`.
+#    `create` dan `write` mengonversi nilai lewat `Field.convert` SEBELUM query dijalankan, agar nilai
+#    yang ditolak kolom `array` (misal 2.5 untuk Integer) gagal tanpa mengubah database.
+# 4. `search` mengambil ID dan semua kolom tersimpan dalam satu query dan langsung mengisi cache;
+#    `browse` hanya membaca ID yang belum ada di cache.
+
+class Database:
+    _connection = None
+    @classmethod
+    def get_connection(cls):
+        if cls._connection is None:
+            try:
+                cls._connection = psycopg2.connect(
+                    dbname="postgres", user="odoo", password="odoo", host="odoo-db", port="5432"
+                )
+            except psycopg2.OperationalError as e:
+                print(f"Gagal terhubung ke database: {e}")
+                exit()
+        return cls._connection
+
+class Registry(dict):
+    def register(self, cls):
+        self[cls._name] = cls
+        return cls
+
+registry = Registry()
+
+class Field:
+    def __init__(self, string="", compute=None):
+        self.string = string
+        self.compute = compute # Nama method compute, misal: '_compute_total'
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    typecode = None # Kode `array.array` untuk kolom cache; None berarti list biasa
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self # Diakses dari class: kembalikan objek field-nya
+        cache = record.env.cache[record._name]
+        if self.compute:
+            values = cache.computed[self]
+            if record.id not in values:
+                getattr(record, self.compute)() # Method compute mengisi cache lewat __set__
+            return values[record.id]
+        try:
+            return cache.get(self, record.id)
+        except KeyError:
+            type(record)._fetch([record.id])
+        try:
+            return cache.get(self, record.id)
+        except KeyError:
+            raise ValueError(f"Record {record!r} tidak ditemukan.") from None
+
+    def __set__(self, record, value):
+        if self.compute:
+            record.env.cache[record._name].computed[self][record.id] = value
+        else:
+            record.write({self.name: value})
+
+    def convert(self, value):
+        """Nilai dari `create`/`write` -> nilai yang disimpan di kolom cache."""
+        return value
+
+class Char(Field): pass
+
+class Float(Field):
+    typecode = 'd'
+
+    def convert(self, value):
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Field '{self.name}' membutuhkan angka, bukan {value!r}.") from None
+
+class Integer(Field):
+    typecode = 'q'
+
+    def convert(self, value):
+        if value is None:
+            return None
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            number = None
+        if number is None or isinstance(value, bool) or (not isinstance(value, str) and number != value):
+            raise ValueError(f"Field '{self.name}' membutuhkan bilangan bulat, bukan {value!r}.")
+        return number
+
+class RecordCache:
+    """Nilai field satu model di satu environment, disimpan per kolom."""
+    def __init__(self, fields):
+        self.fields = fields # Field tersimpan, urutannya sama dengan kolom SELECT
+        self.positions = {} # id -> posisi di setiap kolom
+        self.columns = {field: array.array(field.typecode) if field.typecode else [] for field in fields}
+        self.nulls = {field: set() for field in fields}
+        self.computed = collections.defaultdict(dict) # field computed -> {id: nilai}
+        self.size = 0 # Panjang setiap kolom
+
+    def get(self, field, record_id):
+        position = self.positions[record_id]
+        if position in self.nulls[field]:
+            return None
+        return self.columns[field][position]
+
+    def set(self, field, record_id, value):
+        position = self.positions[record_id]
+        nulls = self.nulls[field]
+        if value is None:
+            nulls.add(position)
+            value = 0 if field.typecode else None
+        else:
+            nulls.discard(position)
+        self.columns[field][position] = value
+
+    def store(self, rows):
+        """Menyimpan baris `(id, nilai field...)` dan mengembalikan daftar ID-nya."""
+        if not rows:
+            return []
+        columns = list(zip(*rows))
+        record_ids = list(columns[0])
+        if not self.positions.keys().isdisjoint(record_ids):
+            # Sebagian ID sudah ada di cache: perbarui per baris.
+            for record_id, *values in rows:
+                if record_id not in self.positions:
+                    self._append([record_id], [[value] for value in values])
+                for field, value in zip(self.fields, values):
+                    self.set(field, record_id, value)
+            return record_ids
+        self._append(record_ids, columns[1:])
+        return record_ids
+
+    def _append(self, record_ids, columns):
+        """ID baru: setiap kolom diperpanjang sekaligus, bukan per nilai."""
+        self.positions.update(zip(record_ids, range(self.size, self.size + len(record_ids))))
+        for field, values in zip(self.fields, columns):
+            if field.typecode and None in values:
+                self.nulls[field].update(self.size + i for i, value in enumerate(values) if value is None)
+                values = [0 if value is None else value for value in values]
+            self.columns[field].extend(values)
+        self.size += len(record_ids)
+
+    def discard_computed(self, record_id):
+        """Nilai computed dihitung ulang pada akses berikutnya (misalnya setelah write)."""
+        for values in self.computed.values():
+            values.pop(record_id, None)
+
+    def discard(self, record_id):
+        self.positions.pop(record_id, None) # Slot kolom dibiarkan kosong
+        self.discard_computed(record_id)
+
+class MetaModel(type):
+    def __new__(mcs, name, bases, attrs):
+        attrs.setdefault('__slots__', ())
+        return super().__new__(mcs, name, bases, attrs)
+
+class Model(metaclass=MetaModel):
+    __slots__ = ('id',)
+    _name = None
+    _table = None
+    _fields = None
+
+    def __init__(self, record_id):
+        self.id = record_id
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Field dideklarasikan di dict `_fields`; pasang masing-masing sebagai descriptor di class.
+        for name, field in (cls.__dict__.get('_fields') or {}).items():
+            setattr(cls, name, field)
+            field.__set_name__(cls, name)
+
+    def __repr__(self):
+        return f"{self._name}({self.id})"
+
+    @classmethod
+    def _stored_fields(cls):
+        return [name for name, field in cls._fields.items() if not field.compute]
+
+    @classmethod
+    def _fetch(cls, ids):
+        query = f"SELECT id, {', '.join(cls._stored_fields())} FROM {cls._table} WHERE id = ANY(%s)"
+        cls.env.cr.execute(query, (list(ids),))
+        return cls.env.cache[cls._name].store(cls.env.cr.fetchall())
+
+    @classmethod
+    def _convert(cls, values):
+        return {name: cls._fields[name].convert(value) for name, value in values.items() if not cls._fields[name].compute}
+
+    @classmethod
+    def create(cls, values):
+        values = cls._convert(values)
+        field_names = list(values)
+        query = (f"INSERT INTO {cls._table} ({', '.join(field_names)}) "
+                 f"VALUES ({', '.join(['%s'] * len(field_names))}) RETURNING id")
+        cls.env.cr.execute(query, [values[name] for name in field_names])
+        new_id = cls.env.cr.fetchone()[0]
+        cls.env.cr.connection.commit()
+        cls.env.cache[cls._name].store([(new_id, *(values.get(name) for name in cls._stored_fields()))])
+        return cls(new_id)
+
+    @classmethod
+    def search(cls, domain):
+        query = f"SELECT id, {', '.join(cls._stored_fields())} FROM {cls._table}"
+        params = []
+        if domain:
+            query += " WHERE " + " AND ".join(f"{field} {op} %s" for field, op, value in domain)
+            params = [value for field, op, value in domain]
+        cls.env.cr.execute(query + " ORDER BY id", params)
+        return [cls(record_id) for record_id in cls.env.cache[cls._name].store(cls.env.cr.fetchall())]
+
+    @classmethod
+    def browse(cls, ids):
+        if not ids: return []
+        is_single_id = not isinstance(ids, list)
+        record_ids = [ids] if is_single_id else ids
+
+        # Hanya ID yang belum ada di cache yang dibaca dari database.
+        known = cls.env.cache[cls._name].positions
+        missing = [record_id for record_id in record_ids if record_id not in known]
+        if missing:
+            cls._fetch(missing)
+        results = [cls(record_id) for record_id in record_ids if record_id in known]
+        if is_single_id: return results[0] if results else None
+        return results
+
+    def write(self, values):
+        values = self._convert(values)
+        query = f"UPDATE {self._table} SET {', '.join(f'{name} = %s' for name in values)} WHERE id = %s"
+        self.env.cr.execute(query, [*values.values(), self.id])
+        self.env.cr.connection.commit()
+        cache = self.env.cache[self._name]
+        if self.id in cache.positions: # Belum di cache: nilai baru dibaca dari database saat diakses
+            for name, value in values.items():
+                cache.set(self._fields[name], self.id, value)
+        cache.discard_computed(self.id)
+        return True
+
+    def unlink(self):
+        self.env.cr.execute(f"DELETE FROM {self._table} WHERE id = %s", (self.id,))
+        self.env.cr.connection.commit()
+        self.env.cache[self._name].discard(self.id)
+        return True
+
+    @classmethod
+    def _init_table(cls):
+        field_definitions = ["id SERIAL PRIMARY KEY"]
+        for name, field in cls._fields.items():
+            if field.compute:
+                continue
+            if isinstance(field, Char):
+                field_definitions.append(f"{name} VARCHAR(255)")
+            elif isinstance(field, Float):
+                field_definitions.append(f"{name} DOUBLE PRECISION")
+            elif isinstance(field, Integer):
+                field_definitions.append(f"{name} INTEGER")
+        cls.env.cr.execute(f"CREATE TABLE IF NOT EXISTS {cls._table} ({', '.join(field_definitions)})")
+        cls.env.cr.connection.commit()
+
+class Environment:
+    def __init__(self, cursor):
+        self.cr = cursor
+        self.registry = registry
+        self.cache = {} # nama model -> RecordCache
+        self._models = {} # Cache model terikat (bound model) milik environment ini
+
+    def __getitem__(self, model_name):
+        ModelClass = self.registry.get(model_name)
+        if not ModelClass:
+            raise KeyError(f"Model '{model_name}' not found in registry.")
+        if model_name not in self._models:
+            self._models[model_name] = type(ModelClass.__name__, (ModelClass,), {'env': self})
+            self.cache[model_name] = RecordCache([ModelClass._fields[name] for name in ModelClass._stored_fields()])
+        return self._models[model_name]
+
+    def invalidate_cache(self):
+        for model_name, cache in self.cache.items():
+            self.cache[model_name] = RecordCache(cache.fields)
+
+# =================================================================================================
+# CONTOH IMPLEMENTASI MODEL (BAGIAN INI YANG ANDA UBAH)
+# =================================================================================================
+
+@registry.register
+class ProductProduct(Model):
+    _name = 'product.product'
+    _table = 'product_product'
+    _fields = {
+        'name': Char(string='Nama Produk'),
+        'price': Float(string='Harga'),
+        'qty_available': Integer(string='Stok'),
+        'stock_value': Float(string='Nilai Stok', compute='_compute_stock_value'),
+    }
+
+    def _compute_stock_value(self):
+        self.stock_value = self.price * self.qty_available
+
+
+class LegacyRecord:
+    """Record gaya latihan 06-14: `env`, `id`, dan setiap kolom di `__dict__` instance."""
+    def __init__(self, env, record_id=None, values=None):
+        self.env = env
+        self.id = record_id
+        if values:
+            for key, value in values.items():
+                setattr(self, key, value)
+
+def legacy_records(colnames, rows):
+    results = []
+    for data in rows:
+        values = dict(zip(colnames, data))
+        record_id = values.pop('id')
+        results.append(LegacyRecord(None, record_id, values))
+    return results
+
+def legacy_search(cr):
+    cr.execute("SELECT * FROM product_product ORDER BY id")
+    return legacy_records([desc[0] for desc in cr.description], cr.fetchall())
+
+def traced(fn):
+    """Menjalankan `fn()` di bawah tracemalloc; mengembalikan (hasil, byte yang masih terpakai, puncak)."""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+BENCH_SCHEMA = 'bench_slotted_records'
+ROWS = 1_000_000
+
+def run_slotted_records_example():
+    """
+    Fungsi untuk menjalankan contoh record dengan __slots__ dan cache nilai per field.
+    """
+    conn = Database.get_connection()
+    cr = conn.cursor()
+    cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}; SET search_path TO {BENCH_SCHEMA}")
+    conn.commit()
+
+    # 1. Perilaku record dan cache.
+    print("\n--- 1. Record dengan __slots__ dan Cache Environment ---")
+    env = Environment(conn.cursor())
+    Product = env['product.product']
+    Product._init_table()
+    laptop = Product.create({'name': 'Laptop', 'price': 1500.0, 'qty_available': 4})
+    print(f"HASIL: {laptop!r}: name={laptop.name}, stock_value={laptop.stock_value}")
+    print(f"INFO: hasattr(record, '__dict__') = {hasattr(laptop, '__dict__')}, sys.getsizeof(record) = {sys.getsizeof(laptop)} byte")
+    try:
+        laptop.colour = 'red'
+    except AttributeError as e:
+        print(f"SUCCESS: Atribut sembarang ditolak: {e}")
+
+    same_laptop = Product.search([('name', '=', 'Laptop')])[0]
+    laptop.price = 1200.0 # Assignment ke field tersimpan = write()
+    print(f"HASIL: Setelah laptop.price = 1200.0, record lain dengan ID sama membaca price={same_laptop.price}, "
+          f"stock_value={same_laptop.stock_value} (computed dihitung ulang)")
+
+    other_env = Environment(conn.cursor())
+    print(f"HASIL: Environment lain membaca dari database: {other_env['product.product'].browse(laptop.id).price}")
+
+    laptop.price = '1100.50' # Dikonversi ke float sebelum UPDATE
+    try:
+        laptop.qty_available = 2.5
+    except ValueError as e:
+        print(f"SUCCESS: {e}")
+    other_env.invalidate_cache()
+    assert laptop.price == other_env['product.product'].browse(laptop.id).price == 1100.5
+    assert laptop.qty_available == other_env['product.product'].browse(laptop.id).qty_available == 4
+    env.invalidate_cache()
+    laptop.write({'price': 1000.0}) # ID tidak ada di cache: hanya database yang diperbarui
+    print(f"HASIL: write setelah invalidate_cache(), price dibaca ulang dari database: {laptop.price}")
+    laptop.unlink()
+    try:
+        same_laptop.name
+    except ValueError as e:
+        print(f"SUCCESS: {e}")
+
+    # 2. tracemalloc: search() 1 juta baris, record gaya lama vs record ringan.
+    print(f"\n--- 2. Memori untuk {ROWS:,} Record (tracemalloc) ---".replace(',', '.'))
+    cr.execute("TRUNCATE product_product RESTART IDENTITY")
+    cr.execute("INSERT INTO product_product (name, price, qty_available) "
+               "SELECT 'Produk ' || i, i %% 1000, i %% 50 FROM generate_series(1, %s) i", (ROWS,))
+    conn.commit()
+
+    start = time.perf_counter()
+    legacy, legacy_bytes, legacy_peak = traced(lambda: legacy_search(conn.cursor()))
+    legacy_s = time.perf_counter() - start
+    legacy_sample = [(r.id, r.name, r.price, r.qty_available) for r in legacy[:1000]]
+    del legacy
+
+    env = Environment(conn.cursor())
+    Product = env['product.product']
+    start = time.perf_counter()
+    records, slotted_bytes, slotted_peak = traced(lambda: Product.search([]))
+    slotted_s = time.perf_counter() - start
+    assert [(r.id, r.name, r.price, r.qty_available) for r in records[:1000]] == legacy_sample
+    ids = [record.id for record in records]
+    del records
+
+    # Objek record saja: baris sudah diambil di luar pengukuran, jadi objek nilai tidak ikut terhitung.
+    cr.execute("SELECT * FROM product_product ORDER BY id")
+    colnames, rows = [desc[0] for desc in cr.description], cr.fetchall()
+    _, legacy_objects_bytes, _ = traced(lambda: legacy_records(colnames, rows))
+    _, slotted_objects_bytes, _ = traced(lambda: [Product(record_id) for record_id in ids])
+    del rows
+
+    # Browse ulang ID yang sama (misalnya laporan kedua dalam request yang sama): nilai sudah di cache.
+    start = time.perf_counter()
+    again, again_bytes, _ = traced(lambda: Product.browse(ids))
+    again_s = time.perf_counter() - start
+    assert len(again) == ROWS
+    del again
+
+    print("INFO: Total = objek record + nilai field (di __dict__ atau di cache environment).")
+    print(f"HASIL: Record gaya lama (__dict__): total {legacy_bytes / ROWS:4.0f} byte/record, objek record {legacy_objects_bytes / ROWS:4.0f} byte, "
+          f"puncak {legacy_peak / 1024 ** 2:4.0f} MB, {legacy_s:.1f} detik")
+    print(f"HASIL: __slots__ + cache env:       total {slotted_bytes / ROWS:4.0f} byte/record, objek record {slotted_objects_bytes / ROWS:4.0f} byte, "
+          f"puncak {slotted_peak / 1024 ** 2:4.0f} MB, {slotted_s:.1f} detik")
+    print(f"HASIL: browse ulang ID yang sudah di cache: {again_bytes / ROWS:.0f} byte/record, {again_s:.1f} detik, "
+          f"tanpa query (gaya lama membaca ulang semua baris: {legacy_bytes / ROWS:.0f} byte/record lagi)")
+
+    cr.execute(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    cr.close()
+
+if __name__ == "__main__":
+    run_slotted_records_example()
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark ORM untuk file latihan 06-14.
+
+Setiap latihan dimuat langsung dari file-nya (nama file diawali angka, jadi tidak bisa di-`import`
+biasa), lalu operasi ORM-nya diukur terhadap PostgreSQL lokal (service `db` di docker-compose) pada
+tabel berisi 1k/100k/1M baris. Hasilnya ditulis sebagai JSON agar bisa dibandingkan antar commit.
+
+Cara pakai:
+    python -m benchmarks run --sizes 1000,100000 --output hasil.json
+    python -m benchmarks compare hasil_lama.json hasil_baru.json
+"""
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import random
+
+from .cases import cases
+from .runner import BenchContext, connect, environment_metadata, load_lesson, reset_schema, BENCH_SCHEMA
+
+def run(args):
+    sizes = [int(size) for size in args.sizes.split(',')]
+    lessons = [lesson for lesson in cases if not args.lessons or lesson.split('_')[0] in args.lessons.split(',')]
+    conn = connect(args.host, args.port)
+    report = {'meta': environment_metadata(conn, sizes, args.ops), 'results': []}
+
+    for rows in sizes:
+        for lesson in lessons:
+            reset_schema(conn)
+            ctx = BenchContext(lesson, load_lesson(lesson, conn), conn, rows, args.ops, random.Random(args.seed))
+            cases[lesson](ctx)
+            for result in ctx.results:
+                print(f"{rows:>8} | {lesson[:32]:<32} | {result['case']:<22} | {result['ops']:>5} ops | "
+                      f"{result['mean_us']:>10.1f} us/op | p95 {result['p95_us']:>10.1f} us")
+            report['results'].extend(ctx.results)
+
+    with conn.cursor() as cr:
+        cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSUCCESS: {len(report['results'])} hasil ditulis ke {args.output} (commit {report['meta']['commit']}).")
+
+def compare(args):
+    """Membandingkan rata-rata waktu per operasi dari dua file hasil, dengan kunci (latihan, kasus, baris)."""
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    key = lambda result: (result['lesson'], result['case'], result['rows'])
+    previous = {key(result): result for result in baseline['results']}
+
+    print(f"Baseline {baseline['meta']['commit']} -> kandidat {candidate['meta']['commit']}")
+    regressions = 0
+    for result in candidate['results']:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        ratio = result['mean_us'] / old['mean_us'] if old['mean_us'] else float('inf')
+        label = "REGRESI" if ratio >= 1 + args.tolerance else "lebih cepat" if ratio <= 1 - args.tolerance else ""
+        regressions += label == "REGRESI"
+        print(f"{result['rows']:>8} | {result['lesson'][:32]:<32} | {result['case']:<22} | "
+              f"{old['mean_us']:>10.1f} -> {result['mean_us']:>10.1f} us/op ({ratio:5.2f}x) {label}")
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark ORM untuk latihan 06-14.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Jalankan benchmark dan tulis hasil JSON.")
+    run_parser.add_argument('--sizes', default='1000,100000,1000000', help="Jumlah baris per tabel, dipisah koma.")
+    run_parser.add_argument('--ops', type=int, default=200, help="Jumlah operasi per kasus (kasus full scan dibatasi).")
+    run_parser.add_argument('--lessons', default='', help="Nomor latihan, misalnya '06,10,11'. Default: semua.")
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--host', default='odoo-db')
+    run_parser.add_argument('--port', default='5432')
+
+    compare_parser = subparsers.add_parser('compare', help="Bandingkan dua file hasil JSON.")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--tolerance', type=float, default=0.2, help="Selisih relatif yang dianggap regresi.")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        raise SystemExit(compare(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+import operator
+
+import psycopg2.extras
+
+# Operasi yang memindai seluruh tabel (domain pada kolom tanpa index, One2many tanpa index di
+# kolom inverse) dibatasi jumlahnya agar ukuran 1M baris tetap selesai dalam hitungan menit.
+SCAN_OPS = 20
+BATCH_SIZE = 100
+# Satu operasi micro-benchmark akses atribut = sekian kali baca atribut, agar durasinya jauh di atas
+# resolusi `time.perf_counter()`.
+ATTRIBUTE_READS = 1000
+
+class CaseRegistry(dict):
+    """Mendaftarkan fungsi benchmark per file latihan, mirip `Registry` pada latihan."""
+    def register(self, lesson):
+        def decorator(fn):
+            self[lesson] = fn
+            return fn
+        return decorator
+
+cases = CaseRegistry()
+
+def _init_models(ctx):
+    """Latihan 06-10: model menyiapkan tabelnya sendiri lewat `_init_model()`."""
+    with ctx.quiet():
+        for model_cls in ctx.module.registry.values():
+            model_cls._init_model()
+    return ctx.module.registry
+
+def _seed_products(ctx, with_category_id=False):
+    """`ctx.rows` produk; untuk latihan relasi, setiap 100 produk berbagi satu kategori."""
+    if with_category_id:
+        categories = max(ctx.rows // 100, 1)
+        ctx.sql("INSERT INTO product_category (name) SELECT 'Kategori ' || i FROM generate_series(1, %s) i", (categories,))
+        ctx.sql("""
+            INSERT INTO product_product (name, price, category_id)
+            SELECT 'Produk ' || i, i %% 1000, i %% %s + 1 FROM generate_series(1, %s) i
+        """, (categories, ctx.rows))
+        ctx.sql("ANALYZE product_category; ANALYZE product_product")
+        return categories
+    ctx.sql("""
+        INSERT INTO product_product (name, price, category)
+        SELECT 'Produk ' || i, i %% 1000, 'Kategori ' || i %% 100 FROM generate_series(1, %s) i
+    """, (ctx.rows,))
+    ctx.sql("ANALYZE product_product")
+
+def _distinct_ids(ctx, count):
+    return ctx.rng.sample(range(1, ctx.rows + 1), min(count, ctx.rows))
+
+def _measure_attribute_access(ctx, model, records, names):
+    """Micro-benchmark akses atribut (id, env, field tersimpan, method) pada record hasil browse."""
+    for name in names:
+        def read(record, get=operator.attrgetter(name)):
+            for _ in range(ATTRIBUTE_READS):
+                get(record)
+        ctx.measure(f'getattr_{name}_x{ATTRIBUTE_READS}', model, read, records)
+
+
+@cases.register('06_reading_and_searching_records.py')
+def bench_reading_and_searching(ctx):
+    Product = _init_models(ctx)['product.product']
+    _seed_products(ctx)
+
+    ctx.measure('browse', Product._name, Product.browse, ctx.random_ids(ctx.ops))
+    ctx.measure('browse_100', Product._name, Product.browse,
+                [ctx.random_ids(100) for _ in range(max(ctx.ops // 10, 1))])
+    ctx.measure('search_name', Product._name, lambda i: Product.search([('name', '=', f'Produk {i}')]),
+                ctx.random_ids(SCAN_OPS))
+    ctx.measure('search_domain', Product._name,
+                lambda i: Product.search([('category', '=', f'Kategori {i % 100}'), ('price', '<', 100)]),
+                ctx.random_ids(SCAN_OPS))
+    ctx.measure('create', Product._name,
+                lambda i: Product.create({'name': f'Baru {i}', 'price': 10.0, 'category': 'Baru'}), range(ctx.ops))
+
+    # Latihan 06-14 belum punya API create banyak record sekaligus; kasus ini mengukur INSERT
+    # multi-baris ke tabel yang sama sebagai pembanding untuk `create` per record di atas.
+    def create_batch(batch):
+        with ctx.conn.cursor() as cr:
+            psycopg2.extras.execute_values(
+                cr, f"INSERT INTO {Product._table} (name, price, category) VALUES %s",
+                [(f'Batch {batch}-{i}', 10.0, 'Batch') for i in range(BATCH_SIZE)],
+            )
+        ctx.conn.commit()
+    ctx.measure(f'create_batch_{BATCH_SIZE}', Product._name, create_batch, range(max(ctx.ops // 10, 1)))
+
+
+@cases.register('07_updating_records.py')
+def bench_updating(ctx):
+    Product = _init_models(ctx)['product.product']
+    _seed_products(ctx)
+    records = Product.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('write', Product._name, lambda record: record.write({'price': record.price + 1}), records)
+
+
+@cases.register('08_deleting_records.py')
+def bench_deleting(ctx):
+    Product = _init_models(ctx)['product.product']
+    _seed_products(ctx)
+    records = Product.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('unlink', Product._name, lambda record: record.unlink(), records)
+
+
+@cases.register('09_relational_fields_many2one.py')
+def bench_many2one(ctx):
+    registry = _init_models(ctx)
+    Category, Product = registry['product.category'], registry['product.product']
+    categories = _seed_products(ctx, with_category_id=True)
+
+    ctx.measure('create', Product._name,
+                lambda i: Product.create({'name': f'Baru {i}', 'price': 10.0, 'category_id': i % categories + 1}),
+                range(ctx.ops))
+    products = Product.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('many2one_traversal', Product._name, lambda product: Category.browse(product.category_id)[0].name, products)
+    ctx.measure('search_many2one', Product._name, lambda c: Product.search([('category_id', '=', c)]),
+                ctx.random_ids(SCAN_OPS, categories))
+
+
+@cases.register('10_relational_fields_one2many.py')
+def bench_one2many(ctx):
+    registry = _init_models(ctx)
+    Category = registry['product.category']
+    categories = _seed_products(ctx, with_category_id=True)
+
+    records = Category.browse(ctx.rng.sample(range(1, categories + 1), min(SCAN_OPS, categories)))
+    ctx.measure('one2many_traversal', Category._name, lambda category: len(category.product_ids), records)
+    Product = registry['product.product']
+    _measure_attribute_access(ctx, Product._name, Product.browse(_distinct_ids(ctx, ctx.ops)), ('id', 'env', 'name', 'browse'))
+
+
+@cases.register('11_relational_fields_many2many.py')
+def bench_many2many(ctx):
+    env = ctx.module.Environment(ctx.conn.cursor())
+    Student, Course = env['res.student'], env['res.course']
+    with ctx.quiet():
+        Student._init_main_table()
+        Course._init_main_table()
+        Student._init_m2m_relations()
+    courses = 50
+    ctx.sql("INSERT INTO res_course (name) SELECT 'Kursus ' || i FROM generate_series(1, %s) i", (courses,))
+    ctx.sql("INSERT INTO res_student (name) SELECT 'Mahasiswa ' || i FROM generate_series(1, %s) i", (ctx.rows,))
+    ctx.sql("""
+        INSERT INTO res_student_course_rel (student_id, course_id)
+        SELECT s, c FROM generate_series(1, %s) s, LATERAL (VALUES (s %% %s + 1), ((s + 7) %% %s + 1)) v(c)
+    """, (ctx.rows, courses, courses))
+    ctx.sql("ANALYZE res_student; ANALYZE res_student_course_rel")
+
+    ctx.measure('browse', Student._name, Student.browse, ctx.random_ids(ctx.ops))
+    students = Student.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('many2many_traversal', Student._name, lambda student: len(student.course_ids), students)
+    _measure_attribute_access(ctx, Student._name, students, ('id', 'env', 'name', 'browse'))
+    ctx.measure('create', Student._name, lambda i: Student.create({'name': f'Baru {i}'}), range(ctx.ops))
+
+
+@cases.register('12_business_methods.py')
+def bench_business_methods(ctx):
+    env = ctx.module.Environment(ctx.conn.cursor())
+    SaleOrder = env['sale.order']
+    with ctx.quiet():
+        SaleOrder._init_table()
+    ctx.sql("INSERT INTO sale_order (name, state) SELECT 'SO/' || i, 'draft' FROM generate_series(1, %s) i", (ctx.rows,))
+    ctx.sql("ANALYZE sale_order")
+
+    orders = SaleOrder.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('action_confirm', SaleOrder._name, lambda order: order.action_confirm(), orders)
+    ctx.measure('search_state', SaleOrder._name, lambda _: len(SaleOrder.search([('state', '=', 'sale')])), range(SCAN_OPS))
+
+
+@cases.register('13_computed_fields.py')
+def bench_computed_fields(ctx):
+    env = ctx.module.Environment(ctx.conn.cursor())
+    Line = env['sale.order.line']
+    with ctx.quiet():
+        Line._init_table()
+    ctx.sql("""
+        INSERT INTO sale_order_line (product_name, quantity, price_unit)
+        SELECT 'Produk ' || i, i %% 10 + 1, i %% 1000 FROM generate_series(1, %s) i
+    """, (ctx.rows,))
+    ctx.sql("ANALYZE sale_order_line")
+
+    ctx.measure('browse', Line._name, Line.browse, ctx.random_ids(ctx.ops))
+    lines = Line.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('compute_first_access', Line._name, lambda line: line.price_subtotal, lines)
+    ctx.measure('compute_cached_access', Line._name, lambda line: line.price_subtotal, lines)
+    _measure_attribute_access(ctx, Line._name, lines, ('id', 'env', 'product_name', 'price_subtotal', 'browse'))
+
+
+@cases.register('14_constraints.py')
+def bench_constraints(ctx):
+    env = ctx.module.Environment(ctx.conn.cursor())
+    Template = env['product.template']
+    with ctx.quiet():
+        Template._init_table()
+    ctx.sql("""
+        INSERT INTO product_template (name, cost_price, sale_price)
+        SELECT 'Produk ' || i, i %% 1000, i %% 1000 + 50 FROM generate_series(1, %s) i
+    """, (ctx.rows,))
+    ctx.sql("ANALYZE product_template")
+
+    ctx.measure('create_constrained', Template._name,
+                lambda i: Template.create({'name': f'Baru {i}', 'cost_price': 100.0, 'sale_price': 150.0}), range(ctx.ops))
+    ctx.measure('create_violation', Template._name,
+                lambda i: Template.create({'name': f'Rugi {i}', 'cost_price': 100.0, 'sale_price': 50.0}), range(ctx.ops))
+    templates = Template.browse(_distinct_ids(ctx, ctx.ops))
+    ctx.measure('write_constrained', Template._name,
+                lambda template: template.write({'sale_price': template.sale_price + 1}), templates)
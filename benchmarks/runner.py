@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import datetime
+import importlib.util
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+import psycopg2
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_SCHEMA = 'bench_suite'
+
+class BenchContext:
+    """Status satu kombinasi (latihan, jumlah baris): modul latihan, koneksi, dan hasil pengukuran."""
+    def __init__(self, lesson, module, conn, rows, ops, rng):
+        self.lesson = lesson
+        self.module = module
+        self.conn = conn
+        self.rows = rows
+        self.ops = ops
+        self.rng = rng
+        self.results = []
+
+    def sql(self, query, params=None):
+        """Menjalankan SQL setup (seed data, ANALYZE) di luar pengukuran."""
+        with self.conn.cursor() as cr:
+            cr.execute(query, params)
+        self.conn.commit()
+
+    def random_ids(self, count, upper=None):
+        return [self.rng.randint(1, upper or self.rows) for _ in range(count)]
+
+    @contextlib.contextmanager
+    def quiet(self):
+        """Membuang output `print()` dari kode latihan (create/write/unlink di latihan mencetak pesan)."""
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+
+    def measure(self, name, model, fn, inputs):
+        """Memanggil `fn(item)` untuk setiap item di `inputs` dan mencatat durasi tiap panggilan."""
+        durations = []
+        with self.quiet():
+            for item in inputs:
+                start = time.perf_counter()
+                fn(item)
+                durations.append(time.perf_counter() - start)
+        total = sum(durations)
+        ordered = sorted(durations)
+        self.results.append({
+            'lesson': self.lesson,
+            'model': model,
+            'case': name,
+            'rows': self.rows,
+            'ops': len(durations),
+            'total_s': round(total, 6),
+            'ops_per_s': round(len(durations) / total, 1) if total else None,
+            'mean_us': round(statistics.mean(durations) * 1e6, 1),
+            'p50_us': round(ordered[len(ordered) // 2] * 1e6, 1),
+            'p95_us': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6, 1),
+        })
+        return self.results[-1]
+
+def connect(host, port, schema=BENCH_SCHEMA):
+    """Koneksi dengan kredensial yang sama seperti file latihan, tetapi `search_path` ke schema benchmark."""
+    return psycopg2.connect(
+        dbname="postgres", user="odoo", password="odoo", host=host, port=port,
+        options=f"-c search_path={schema}",
+    )
+
+def load_lesson(filename, conn):
+    """
+    Memuat file latihan sebagai modul baru (registry dan class model selalu segar), lalu
+    menyuntikkan koneksi benchmark ke `Database._connection` milik modul tersebut.
+    """
+    path = os.path.join(REPO_ROOT, filename)
+    module_name = "lesson_" + os.path.splitext(filename)[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.Database._connection = conn
+    return module
+
+def reset_schema(conn):
+    with conn.cursor() as cr:
+        cr.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+    conn.commit()
+
+def environment_metadata(conn, sizes, ops):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    with conn.cursor() as cr:
+        cr.execute("SHOW server_version")
+        server_version = cr.fetchone()[0]
+    return {
+        'commit': commit,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'postgres': server_version,
+        'sizes': sizes,
+        'ops': ops,
+    }